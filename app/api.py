@@ -0,0 +1,634 @@
+import json
+import math
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.deletion import Collector
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+
+from .autocomplete import DEFAULT_LIMIT, MAX_LIMIT, search_names
+from .cache import bump_version
+from .counters import batched_counts, record_created, record_regrouped
+from .filters import (
+    filter_clients,
+    filter_medis,
+    filter_products,
+    filter_providers,
+    filter_vets,
+)
+from .models import (
+    Client,
+    Medi,
+    Product,
+    ProductType,
+    Provider,
+    Vet,
+    validate_client,
+    validate_medicine,
+    validate_product,
+    validate_provider,
+    validate_vet,
+)
+from .pagination import paginate
+from .tracking import CONFLICT_MESSAGE, UPDATE_WRITES, ConflictError, parse_version
+from .writer import run_write
+
+# Operaciones aceptadas por una sola solicitud a /api/batch/
+MAX_BATCH_OPERATIONS = 5000
+BATCH_OPERATIONS = ("create", "update", "delete")
+
+INVALID_VERSION = "La versión debe ser un número entero"
+DUPLICATE_ROW = "La fila ya aparece en otra operación del lote"
+
+# Sin espacios: las respuestas de la API son para máquinas
+COMPACT_JSON = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+class Resource:
+    """Una entidad expuesta por la API.
+
+    Attributes:
+        model (Model): El modelo de la entidad.
+        fields (tuple): Los campos que se pueden leer y pedir con ?fields=.
+        writable (tuple): Los campos que se pueden enviar al crear o actualizar.
+        validate (callable): La validación existente del modelo (validate_*).
+        update (str): El método del modelo que aplica los datos (update_*).
+        filter (callable): El filtro de la página del repositorio, si existe.
+        related (dict): Los campos que son claves de otra tabla y se leen y
+            escriben por el nombre de la fila referenciada, con su modelo.
+        numeric (tuple): Los campos escribibles que además de texto aceptan un número.
+    """
+
+    def __init__(
+        self, model, fields, writable, validate, update, filter=None, related=None, numeric=(),
+    ):
+        self.model = model
+        self.fields = fields
+        self.writable = writable
+        self.validate = validate
+        self.update = update
+        self.filter = filter
+        self.related = related or {}
+        self.numeric = numeric
+
+    def columns(self, fields):
+        """Las columnas a leer para fields: los campos relacionados por su nombre."""
+        return [f"{field}__name" if field in self.related else field for field in fields]
+
+    def rename(self, row, fields):
+        """La fila leída con columns() con las claves de fields."""
+        if not self.related:
+            return row
+        return {field: row[column] for field, column in zip(fields, self.columns(fields))}
+
+
+RESOURCES = {
+    "clients": Resource(
+        Client,
+        ("id", "name", "phone", "email", "address", "updated_at", "version"),
+        ("name", "phone", "email", "address"),
+        validate_client,
+        "update_client",
+        filter_clients,
+        numeric=("phone",),
+    ),
+    "products": Resource(
+        Product,
+        ("id", "name", "type", "price", "updated_at", "version"),
+        ("name", "type", "price"),
+        validate_product,
+        "update_product",
+        filter_products,
+        related={"type": ProductType},
+        numeric=("price",),
+    ),
+    "vets": Resource(
+        Vet,
+        ("id", "name", "email", "phone", "specialty", "updated_at", "version"),
+        ("name", "email", "phone", "specialty"),
+        validate_vet,
+        "update_vet",
+        filter_vets,
+        numeric=("phone",),
+    ),
+    "medis": Resource(
+        Medi,
+        ("id", "name", "description", "dose", "updated_at", "version"),
+        ("name", "description", "dose"),
+        validate_medicine,
+        "update_medi",
+        filter_medis,
+        numeric=("dose",),
+    ),
+    "providers": Resource(
+        Provider,
+        ("id", "name", "email", "address", "updated_at", "version"),
+        ("name", "email", "address"),
+        validate_provider,
+        "update_provider",
+        filter_providers,
+    ),
+}
+
+
+def api_response(data, status=200):
+    """JsonResponse compacta con el codificador de Django (fechas, decimales)."""
+    return JsonResponse(
+        data, status=status, encoder=DjangoJSONEncoder, json_dumps_params=COMPACT_JSON,
+    )
+
+
+def error_response(status, errors):
+    """Respuesta de error con el mismo formato de errores que los formularios."""
+    return api_response({"errors": errors}, status=status)
+
+
+def selected_fields(resource, request):
+    """
+    Campos pedidos con ?fields=a,b,c; el id se incluye siempre.
+
+    Returns:
+        tuple: Los campos a devolver, o None si alguno no existe.
+    """
+    requested = request.GET.get("fields", "")
+    if requested == "":
+        return resource.fields
+
+    fields = [field.strip() for field in requested.split(",") if field.strip()]
+    if any(field not in resource.fields for field in fields):
+        return None
+
+    return ("id",) + tuple(field for field in fields if field != "id")
+
+
+def parse_body(request):
+    """Decodifica el cuerpo JSON de la solicitud; None si no es un objeto válido."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
+def field_value(resource, instance, field):
+    """El valor de field en instance; los campos relacionados por su nombre (o None)."""
+    if field in resource.related:
+        if getattr(instance, f"{field}_id") is None:
+            return None
+        return getattr(instance, field).name
+    return getattr(instance, field)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def check_types(resource, data):
+    """
+    Verifica que cada campo enviado sea un texto, o un número en los campos numéricos.
+
+    validate_* espera los valores de un formulario: con otro tipo (un número en
+    el nombre, una lista, un null) fallaría la validación o se guardaría su repr.
+
+    Returns:
+        dict: Los errores por campo, vacío si todos los tipos son válidos.
+    """
+    errors = {}
+    for field, value in data.items():
+        if field not in resource.writable or isinstance(value, str):
+            continue
+        if field in resource.numeric:
+            if not _is_number(value):
+                errors[field] = "Se espera un número o un texto"
+        else:
+            errors[field] = "Se espera un texto"
+    return errors
+
+
+def merge_data(resource, instance, data):
+    """Los campos escribibles de instance (vacíos si es nueva) con data encima."""
+    merged = {}
+    for field in resource.writable:
+        value = field_value(resource, instance, field)
+        merged[field] = value if value is not None else ""
+    merged.update(
+        {field: value for field, value in data.items() if field in resource.writable},
+    )
+    return merged
+
+
+def apply_data(resource, instance, data):
+    """
+    Valida y guarda data sobre instance usando la validación y el update_* del modelo.
+
+    Los datos enviados se combinan con los valores actuales de la instancia (o
+    vacíos si es nueva) y se validan con validate_*; si no hay errores se
+    aplican con el método update_* del modelo, que guarda la instancia.
+
+    Returns:
+        dict: Los errores de validación, vacío si se guardó.
+
+    Raises:
+        ConflictError: Si data trae una versión que ya no es la de la fila.
+    """
+    errors = check_types(resource, data)
+    try:
+        version = parse_version(data.get("version"))
+    except ValueError:
+        errors["version"] = INVALID_VERSION
+    if errors:
+        return errors
+
+    merged = merge_data(resource, instance, data)
+
+    errors = resource.validate(merged)
+    if errors:
+        return errors
+
+    # La versión que vio el cliente: si la fila cambió después, ConflictError
+    if version is not None:
+        merged["version"] = version
+
+    result = getattr(instance, resource.update)(merged)
+    if result is not None:
+        saved, errors = result
+        if not saved:
+            return errors
+
+    return {}
+
+
+def serialize(resource, instance, fields):
+    """Diccionario con los campos pedidos de instance."""
+    return {field: field_value(resource, instance, field) for field in fields}
+
+
+@csrf_exempt
+def collection(request, entity):
+    """
+    Lista o crea filas de una entidad.
+
+    GET acepta ?fields=, los filtros de la página del repositorio y la
+    paginación por cursor (?after=, ?before=, ?page_size=). POST crea una fila
+    a partir de un objeto JSON.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        entity (str): La entidad (clients, products, vets, medis, providers).
+
+    Returns:
+        JsonResponse: La página de resultados o la fila creada.
+    """
+    resource = RESOURCES.get(entity)
+    if resource is None:
+        return error_response(404, {"entity": "Entidad desconocida"})
+
+    if request.method == "POST":
+        data = parse_body(request)
+        if data is None:
+            return error_response(400, {"body": "El cuerpo debe ser un objeto JSON"})
+
+        instance = resource.model()
+        errors = run_write(apply_data, resource, instance, data)
+        if errors:
+            return error_response(400, errors)
+
+        return api_response(serialize(resource, instance, resource.fields), status=201)
+
+    if request.method != "GET":
+        return error_response(405, {"method": "Método no permitido"})
+
+    fields = selected_fields(resource, request)
+    if fields is None:
+        return error_response(400, {"fields": "Campo desconocido"})
+
+    queryset = resource.model.objects.all()
+    if resource.filter is not None:
+        queryset = resource.filter(queryset, request.GET)
+
+    page = paginate(queryset.values(*resource.columns(fields)), request)
+    return api_response(
+        {
+            "results": [resource.rename(row, fields) for row in page.items],
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+        },
+    )
+
+
+@csrf_exempt
+def item(request, entity, id):
+    """
+    Lee, actualiza o borra una fila de una entidad.
+
+    GET acepta ?fields= y solo lee esas columnas. PUT y PATCH aplican los
+    campos enviados sobre los actuales; si incluyen "version" y la fila ya
+    cambió responden 409 sin escribir. DELETE borra la fila.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        entity (str): La entidad (clients, products, vets, medis, providers).
+        id (int): El id de la fila.
+
+    Returns:
+        JsonResponse: La fila, o una respuesta vacía con 204 al borrar.
+    """
+    resource = RESOURCES.get(entity)
+    if resource is None:
+        return error_response(404, {"entity": "Entidad desconocida"})
+
+    if request.method == "GET":
+        fields = selected_fields(resource, request)
+        if fields is None:
+            return error_response(400, {"fields": "Campo desconocido"})
+
+        row = resource.model.objects.filter(pk=id).values(*resource.columns(fields)).first()
+        if row is None:
+            return error_response(404, {"id": "No existe"})
+        return api_response(resource.rename(row, fields))
+
+    if request.method in ("PUT", "PATCH"):
+        data = parse_body(request)
+        if data is None:
+            return error_response(400, {"body": "El cuerpo debe ser un objeto JSON"})
+
+        instance = resource.model.objects.select_related(*resource.related).filter(pk=id).first()
+        if instance is None:
+            return error_response(404, {"id": "No existe"})
+
+        try:
+            errors = run_write(apply_data, resource, instance, data)
+        except ConflictError:
+            return error_response(409, {"version": CONFLICT_MESSAGE})
+        if errors:
+            return error_response(400, errors)
+
+        return api_response(serialize(resource, instance, resource.fields))
+
+    if request.method == "DELETE":
+        deleted, _ = run_write(resource.model.objects.filter(pk=id).delete)
+        if not deleted:
+            return error_response(404, {"id": "No existe"})
+        return HttpResponse(status=204)
+
+    return error_response(405, {"method": "Método no permitido"})
+
+
+def check_operation(operation):
+    """
+    Valida la forma de una operación del lote (no sus datos).
+
+    Returns:
+        dict: Los errores, vacío si la operación está bien formada.
+    """
+    if not isinstance(operation, dict):
+        return {"operation": "Cada operación debe ser un objeto JSON"}
+
+    errors = {}
+    if operation.get("entity") not in RESOURCES:
+        errors["entity"] = "Entidad desconocida"
+    if operation.get("op") not in BATCH_OPERATIONS:
+        errors["op"] = "Operación desconocida (create, update o delete)"
+    if operation.get("op") in ("update", "delete") and (
+        not isinstance(operation.get("id"), int) or isinstance(operation.get("id"), bool)
+    ):
+        errors["id"] = "Falta el id"
+    if operation.get("op") in ("create", "update") and not isinstance(operation.get("data"), dict):
+        errors["data"] = "Faltan los datos"
+    return errors
+
+
+def resolve_related(related):
+    """
+    Asigna los ids de las filas referenciadas por nombre en un lote.
+
+    Args:
+        related (dict): Por modelo referenciado, ternas (instancia, campo, nombre).
+    """
+    for model, pending in related.items():
+        ids = model.objects.ids_for(name for _, _, name in pending)
+        for instance, field, name in pending:
+            setattr(instance, f"{field}_id", ids[name])
+
+
+def apply_batch(creates, updates, deletes, results, related=None):
+    """
+    Aplica las operaciones ya validadas de un lote en una sola transacción.
+
+    Args:
+        creates (dict): Por entidad, pares (posición, instancia nueva).
+        updates (dict): Por entidad, las instancias modificadas por id.
+        deletes (dict): Por entidad, las instancias a borrar por id.
+        results (list): Los resultados por operación; se completan los ids creados.
+        related (dict, optional): Los nombres a resolver (ver resolve_related).
+
+    Raises:
+        ConflictError: Si alguna fila a editar o borrar cambió de versión.
+    """
+    now = timezone.now()
+    # Los contadores del tablero se ajustan con un UPDATE por entidad al final
+    with transaction.atomic(), batched_counts():
+        # Los tipos nuevos se crean dentro de la transacción del lote
+        resolve_related(related or {})
+
+        # Las filas leídas antes de encolar el lote deben seguir en la misma
+        # versión; si otra escritura las cambió se cancela todo el lote
+        for entity in set(updates) | set(deletes):
+            expected = {
+                pk: instance.version
+                for rows in (updates.get(entity, {}), deletes.get(entity, {}))
+                for pk, instance in rows.items()
+            }
+            current = dict(
+                RESOURCES[entity].model.objects.filter(pk__in=list(expected))
+                .values_list("pk", "version"),
+            )
+            if current != expected:
+                raise ConflictError()
+
+        for entity, pending in creates.items():
+            resource = RESOURCES[entity]
+            instances = [instance for _, instance in pending]
+            resource.model.objects.bulk_create(instances)
+            record_created(resource.model, instances)
+            for index, instance in pending:
+                results[index] = {"status": 201, "id": instance.pk}
+
+        # Un solo UPDATE por entidad con las columnas que cambiaron en alguna
+        # fila; las filas sin cambios no se escriben
+        for entity, instances in updates.items():
+            resource = RESOURCES[entity]
+            changes = [(instance, instance.changed_fields()) for instance in instances.values()]
+            dirty = [instance for instance, fields in changes if fields]
+            fields = sorted({field for _, changed in changes for field in changed})
+
+            label = resource.model._meta.model_name
+            UPDATE_WRITES.labels(label, "skipped").inc(len(changes) - len(dirty))
+            if not dirty:
+                continue
+
+            record_regrouped(resource.model, dirty)
+
+            # bulk_update no aplica auto_now
+            for instance in dirty:
+                instance.updated_at = now
+                instance.version += 1
+            resource.model.objects.bulk_update(dirty, fields + ["updated_at", "version"])
+            UPDATE_WRITES.labels(label, "partial").inc(len(dirty))
+
+        # Las filas ya leídas se borran con un solo DELETE ... WHERE id IN sin
+        # volver a consultarlas; el Collector envía igual post_delete
+        if deletes:
+            collector = Collector(using="default")
+            for instances in deletes.values():
+                collector.collect(list(instances.values()))
+            collector.delete()
+
+
+@csrf_exempt
+def batch(request):
+    """
+    Aplica un lote de altas, ediciones y borrados en una sola transacción.
+
+    El cuerpo es {"operations": [{"op": "create", "entity": "clients", "data":
+    {...}}, {"op": "update", "entity": "products", "id": 1, "data": {...}},
+    {"op": "delete", "entity": "vets", "id": 2, "version": 3}, ...]}. Cada
+    operación se valida con validate_* igual que en los formularios; si alguna
+    falla no se aplica ninguna. "version" es opcional (número o texto) y hace
+    que la operación falle con 409 si la fila cambió. Cada fila puede aparecer
+    en una sola operación. Si todas son válidas se aplican por
+    entidad con un bulk_create, un bulk_update y un DELETE ... WHERE id IN.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        JsonResponse: {"results": [...]} con el resultado de cada operación en
+        el mismo orden; 400 si alguna operación es inválida y 409 si alguna
+        fila cambió de versión.
+    """
+    if request.method != "POST":
+        return error_response(405, {"method": "Método no permitido"})
+
+    body = parse_body(request)
+    operations = body.get("operations") if body is not None else None
+    if not isinstance(operations, list):
+        return error_response(400, {"operations": "Se espera una lista de operaciones"})
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return error_response(
+            400, {"operations": f"Máximo {MAX_BATCH_OPERATIONS} operaciones por lote"},
+        )
+
+    results = [check_operation(operation) for operation in operations]
+    results = [{"status": 400, "errors": errors} if errors else None for errors in results]
+
+    # Una sola lectura por entidad de las filas a editar o borrar. Cada fila
+    # puede aparecer en una sola operación: con dos, una pisaría a la otra
+    ids = {}
+    for index, operation in enumerate(operations):
+        if results[index] is None and operation["op"] != "create":
+            entity_ids = ids.setdefault(operation["entity"], set())
+            if operation["id"] in entity_ids:
+                results[index] = {"status": 400, "errors": {"id": DUPLICATE_ROW}}
+            entity_ids.add(operation["id"])
+    existing = {
+        entity: RESOURCES[entity].model.objects.select_related(*RESOURCES[entity].related)
+        .in_bulk(list(entity_ids))
+        for entity, entity_ids in ids.items()
+    }
+
+    creates, updates, deletes, related = {}, {}, {}, {}
+    for index, operation in enumerate(operations):
+        if results[index] is not None:
+            continue
+
+        entity = operation["entity"]
+        resource = RESOURCES[entity]
+        if operation["op"] == "create":
+            instance = resource.model()
+        else:
+            instance = existing[entity].get(operation["id"])
+            if instance is None:
+                results[index] = {"status": 404, "errors": {"id": "No existe"}}
+                continue
+
+        try:
+            version = parse_version(operation.get("version"))
+        except ValueError:
+            results[index] = {"status": 400, "errors": {"version": INVALID_VERSION}}
+            continue
+        if version is not None and version != instance.version:
+            results[index] = {"status": 409, "errors": {"version": CONFLICT_MESSAGE}}
+            continue
+
+        if operation["op"] == "delete":
+            deletes.setdefault(entity, {})[instance.pk] = instance
+            results[index] = {"status": 204, "id": instance.pk}
+            continue
+
+        merged = merge_data(resource, instance, operation["data"])
+        errors = check_types(resource, operation["data"]) or resource.validate(merged)
+        if errors:
+            results[index] = {"status": 400, "errors": errors}
+            continue
+
+        for field in resource.writable:
+            if field not in resource.related:
+                setattr(instance, field, merged[field])
+            elif merged[field] != field_value(resource, instance, field):
+                # Se resuelve a un id junto con los demás nombres del lote
+                related.setdefault(resource.related[field], []).append(
+                    (instance, field, merged[field]),
+                )
+
+        if operation["op"] == "create":
+            creates.setdefault(entity, []).append((index, instance))
+        else:
+            updates.setdefault(entity, {})[instance.pk] = instance
+            results[index] = {"status": 200, "id": instance.pk}
+
+    failed = {result["status"] for result in results if result is not None and result["status"] >= 400}
+    if failed:
+        return api_response({"results": results}, status=409 if failed == {409} else 400)
+
+    try:
+        run_write(apply_batch, creates, updates, deletes, results, related)
+    except ConflictError:
+        return error_response(409, {"version": CONFLICT_MESSAGE})
+
+    # bulk_create y bulk_update no envían post_save: se invalidan las páginas a mano
+    for entity in set(creates) | set(updates):
+        bump_version(RESOURCES[entity].model)
+
+    return api_response({"results": results})
+
+
+def autocomplete(request, entity):
+    """
+    Nombres que empiezan con ?prefix= para el autocompletado de los formularios.
+
+    Se sirve desde el índice en memoria de app/autocomplete.py, sin consultas
+    SQL una vez armado.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        entity (str): La entidad (clients, providers, products).
+
+    Returns:
+        JsonResponse: {"results": [{"id", "name"}, ...]} en orden alfabético.
+    """
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        return error_response(400, {"limit": f"Debe estar entre 1 y {MAX_LIMIT}"})
+
+    results = search_names(entity, request.GET.get("prefix", ""), limit)
+    if results is None:
+        return error_response(404, {"entity": "Entidad sin autocompletado"})
+
+    return api_response({"results": results})
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+        from .db import apply_sqlite_pragmas
+        from .search import ensure_triggers
+
+        connection_created.connect(apply_sqlite_pragmas)
+        post_migrate.connect(ensure_triggers, sender=self)
+        signals.connect()
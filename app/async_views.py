@@ -0,0 +1,456 @@
+"""
+Versiones async de las vistas de repositorio, formulario, borrado y exportación.
+
+Con ASYNC_VIEWS=True (por defecto bajo SERVER_MODE=asgi) app/urls.py usa estas
+vistas en lugar de las de app/views.py. Las lecturas usan el ORM async
+(iteración async, aget) y las altas, ediciones y borrados llaman a los mismos
+save_*/update_* de los modelos, que validan los datos, a través del escritor
+único (ver app/writer.py). Así un solo proceso uvicorn atiende muchas
+conexiones lentas a la vez sin ocupar un hilo por cada una mientras espera.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render, reverse
+from django.views.decorators.http import condition
+
+from .cache import cached_page
+from .conditional import set_last_modified, table_etag
+from .counters import choices_with_counts
+from .exports import ASYNC_STREAMERS, CONTENT_TYPES
+from .facets import product_type_facets
+from .filters import (
+    filter_clients,
+    filter_medis,
+    filter_products,
+    filter_providers,
+    filter_vets,
+    repository_ordering,
+)
+from .models import Client, Medi, Product, Provider, Vet
+from .pagination import apaginate
+from .tracking import CONFLICT_MESSAGE, ConflictError
+from .writer import arun_write
+
+
+async def export(request, entity, format):
+    """
+    Exporta todas las filas de una entidad en CSV o NDJSON como un stream async.
+
+    Bajo ASGI un iterador sync se juntaría entero en memoria antes de enviarse;
+    con uno async cada bloque sale en cuanto se lee de la base.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP, con los filtros del repositorio.
+        entity (str): La entidad a exportar (clients, products, vets, medis, providers).
+        format (str): El formato de salida, "csv" o "ndjson".
+
+    Returns:
+        StreamingHttpResponse: La respuesta con el archivo exportado.
+    """
+    if format not in ASYNC_STREAMERS:
+        raise Http404("Formato de exportación no soportado")
+
+    response = StreamingHttpResponse(
+        ASYNC_STREAMERS[format](entity, request.GET), content_type=CONTENT_TYPES[format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{entity}.{format}"'
+    return response
+
+
+@condition(etag_func=table_etag(Client))
+@cached_page(Client)
+async def clients_repository(request):
+    """
+    Renderiza la página del repositorio de clientes.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de clientes.
+    """
+    page = await apaginate(
+        filter_clients(Client.objects.all(), request.GET), request, repository_ordering(request.GET),
+    )
+    return render(
+        request, "clients/repository.html", {"clients": page.items, "page": page},
+    )
+
+
+@condition(etag_func=table_etag(Client))
+async def clients_form(request, id=None):
+    """
+    Maneja el formulario de clientes para agregar o actualizar un cliente.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int, optional): El ID del cliente a actualizar. Si es None, se creará un nuevo cliente.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    if request.method == "POST":
+        client_id = request.POST.get("id", "")
+
+        if client_id == "":
+            saved, errors = await arun_write(Client.save_client, request.POST)
+        else:
+            client = await aget_object_or_404(Client, pk=client_id)
+            try:
+                saved, errors = await arun_write(client.update_client, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("clients_repo"))
+
+        return render(
+            request, "clients/form.html", {"errors": errors, "client": request.POST},
+            status=409 if "version" in errors else 200,
+        )
+
+    client = None
+    if id is not None:
+        client = await aget_object_or_404(Client, pk=id)
+
+    response = render(request, "clients/form.html", {"client": client})
+    return set_last_modified(response, client)
+
+
+async def clients_delete(request):
+    """
+    Maneja la eliminación de un cliente.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP que redirige al repositorio de clientes.
+    """
+    deleted, _ = await arun_write(Client.objects.filter(pk=int(request.POST.get("client_id"))).delete)
+    if not deleted:
+        raise Http404("No existe el cliente")
+
+    return redirect(reverse("clients_repo"))
+
+
+@condition(etag_func=table_etag(Product))
+@cached_page(Product)
+async def products_repository(request):
+    """
+    Renderiza la página del repositorio de productos.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de productos.
+    """
+    products = filter_products(Product.objects.select_related("type"), request.GET)
+    page = await apaginate(products, request)
+    # Las facetas leen la caché y, si cambió la tabla, cuentan en la base
+    type_facets = await sync_to_async(product_type_facets)()
+    return render(
+        request,
+        "products/repository.html",
+        {"products": page.items, "page": page, "type_facets": type_facets},
+    )
+
+
+@condition(etag_func=table_etag(Product))
+async def products_form(request, id=None):
+    """
+    Maneja el formulario de productos para agregar o actualizar un producto.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int, optional): El ID del producto a actualizar. Si es None, se creará un nuevo producto.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    if request.method == "POST":
+        product_id = request.POST.get("id", "")
+
+        if product_id == "":
+            saved, errors = await arun_write(Product.save_product, request.POST)
+        else:
+            product = await aget_object_or_404(Product, pk=product_id)
+            try:
+                saved, errors = await arun_write(product.update_product, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("products_repo"))
+
+        return render(
+            request, "products/form.html", {"errors": errors, "product": request.POST},
+            status=409 if "version" in errors else 200,
+        )
+
+    product = None
+    if id is not None:
+        product = await aget_object_or_404(Product.objects.select_related("type"), pk=id)
+
+    response = render(request, "products/form.html", {"product": product})
+    return set_last_modified(response, product)
+
+
+async def products_delete(request):
+    """
+    Maneja la eliminación de un producto.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP que redirige al repositorio de productos.
+    """
+    deleted, _ = await arun_write(Product.objects.filter(pk=int(request.POST.get("product_id"))).delete)
+    if not deleted:
+        raise Http404("No existe el producto")
+
+    return redirect(reverse("products_repo"))
+
+
+@condition(etag_func=table_etag(Vet))
+@cached_page(Vet)
+async def vets_repository(request):
+    """
+    Renderiza la página del repositorio de veterinarios.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de veterinarios.
+    """
+    page = await apaginate(
+        filter_vets(Vet.objects.all(), request.GET), request, repository_ordering(request.GET),
+    )
+    specialties = await sync_to_async(choices_with_counts)(Vet)
+    return render(
+        request,
+        "vets/repository.html",
+        {"vets": page.items, "page": page, "specialties": specialties},
+    )
+
+
+@condition(etag_func=table_etag(Vet))
+async def vets_form(request, id=None):
+    """
+    Maneja el formulario de veterinarios para agregar o actualizar un veterinario.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int, optional): El ID del veterinario a actualizar. Si es None, se creará un nuevo veterinario.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    specialties = Vet.VetSpecialties.choices
+    if request.method == "POST":
+        vet_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if vet_id == "":
+            saved, errors = await arun_write(Vet.save_vet, request.POST)
+        else:
+            vet = await aget_object_or_404(Vet, pk=vet_id)
+            try:
+                await arun_write(vet.update_vet, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("vets_repo"))
+
+        return render(
+            request, "vets/form.html", {"errors": errors, "vet": request.POST, "specialties": specialties},
+            status=409 if "version" in errors else 200,
+        )
+
+    vet = None
+    if id is not None:
+        vet = await aget_object_or_404(Vet, pk=id)
+
+    response = render(request, "vets/form.html", {"vet": vet, "specialties": specialties})
+    return set_last_modified(response, vet)
+
+
+async def vets_delete(request):
+    """
+    Maneja la eliminación de un veterinario.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP que redirige al repositorio de veterinarios.
+    """
+    deleted, _ = await arun_write(Vet.objects.filter(pk=int(request.POST.get("vet_id"))).delete)
+    if not deleted:
+        raise Http404("No existe el veterinario")
+
+    return redirect(reverse("vets_repo"))
+
+
+@condition(etag_func=table_etag(Medi))
+@cached_page(Medi)
+async def medis_repository(request):
+    """
+    Renderiza la página del repositorio de medicinas.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de medicinas.
+    """
+    page = await apaginate(
+        filter_medis(Medi.objects.all(), request.GET), request, repository_ordering(request.GET),
+    )
+    return render(
+        request, "medicine/repository.html", {"medis": page.items, "page": page},
+    )
+
+
+@condition(etag_func=table_etag(Medi))
+async def medis_form(request, id=None):
+    """
+    Maneja el formulario de medicinas para agregar o actualizar una medicina.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int, optional): El ID de la medicina a actualizar. Si es None, se creará una nueva medicina.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    if request.method == "POST":
+        medi_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if medi_id == "":
+            saved, errors = await arun_write(Medi.save_medi, request.POST)
+        else:
+            medi = await aget_object_or_404(Medi, pk=medi_id)
+            try:
+                await arun_write(medi.update_medi, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("medi_repo"))
+
+        return render(
+            request, "medicine/form.html", {"errors": errors, "medi": request.POST},
+            status=409 if "version" in errors else 200,
+        )
+
+    medi = None
+    if id is not None:
+        medi = await aget_object_or_404(Medi, pk=id)
+
+    response = render(request, "medicine/form.html", {"medi": medi})
+    return set_last_modified(response, medi)
+
+
+async def medis_delete(request):
+    """
+    Maneja la eliminación de una medicina.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP que redirige al repositorio de medicinas.
+    """
+    deleted, _ = await arun_write(Medi.objects.filter(pk=int(request.POST.get("medi_id"))).delete)
+    if not deleted:
+        raise Http404("No existe la medicina")
+
+    return redirect(reverse("medi_repo"))
+
+
+@condition(etag_func=table_etag(Provider))
+@cached_page(Provider)
+async def provider_repository(request):
+    """
+    Renderiza la página del repositorio de proveedores.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de proveedores.
+    """
+    page = await apaginate(
+        filter_providers(Provider.objects.all(), request.GET), request, repository_ordering(request.GET),
+    )
+    return render(
+        request, "provider/repository.html", {"provider": page.items, "page": page},
+    )
+
+
+@condition(etag_func=table_etag(Provider))
+async def provider_form(request, id=None):
+    """
+    Maneja el formulario de proveedores para agregar o actualizar un proveedor.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int, optional): El ID del proveedor a actualizar. Si es None, se creará un nuevo proveedor.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    if request.method == "POST":
+        provider_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if provider_id == "":
+            saved, errors = await arun_write(Provider.save_provider, request.POST)
+        else:
+            provider = await aget_object_or_404(Provider, pk=provider_id)
+            try:
+                await arun_write(provider.update_provider, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("provider_repo"))
+
+        return render(
+            request, "provider/form.html", {"errors": errors, "provider": request.POST},
+            status=409 if "version" in errors else 200,
+        )
+
+    provider = None
+    if id is not None:
+        provider = await aget_object_or_404(Provider, pk=id)
+
+    response = render(request, "provider/form.html", {"provider": provider})
+    return set_last_modified(response, provider)
+
+
+async def provider_delete(request):
+    """
+    Maneja la eliminación de un proveedor.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP que redirige al repositorio de proveedores.
+    """
+    deleted, _ = await arun_write(Provider.objects.filter(pk=int(request.POST.get("prov_id"))).delete)
+    if not deleted:
+        raise Http404("No existe el proveedor")
+
+    return redirect(reverse("provider_repo"))
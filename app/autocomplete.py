@@ -0,0 +1,174 @@
+"""
+Índice de prefijos en memoria para autocompletar nombres en los formularios.
+
+Cada proceso guarda, por entidad, una lista ordenada de (clave, id, nombre)
+donde la clave es el nombre sin acentos ni mayúsculas (ver app/text.py). Una
+búsqueda es un bisect hasta el primer nombre que empieza con el prefijo y un
+recorrido de a lo sumo limit elementos: no hay consulta SQL y tarda
+microsegundos.
+
+El índice se arma con una sola consulta la primera vez que se pide y recuerda
+la versión de la tabla (ver app/cache.py) con la que se armó. Las señales de
+guardado y borrado lo actualizan en el lugar al confirmarse la transacción,
+siempre que la versión avance de a uno desde la que conoce; si otro proceso
+escribió en el medio, o hubo un bulk_create o un rollback, la versión no
+coincide y el índice se vuelve a armar en la próxima búsqueda.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.db import transaction
+from prometheus_client import Histogram
+
+from .cache import get_version
+from .models import Client, Product, Provider
+from .text import fold
+
+AUTOCOMPLETE_LOOKUPS = Histogram(
+    "vetsoft_autocomplete_lookup_seconds",
+    "Tiempo de cada búsqueda en el índice de autocompletado",
+    ["entity"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.05),
+)
+
+# Entidad de la URL: modelo cuyo campo name se indexa
+ENTITIES = {
+    "clients": Client,
+    "providers": Provider,
+    "products": Product,
+}
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+class PrefixIndex:
+    """Lista ordenada de los nombres de un modelo para búsquedas por prefijo.
+
+    Attributes:
+        model (Model): El modelo indexado.
+        version (int): La versión de la tabla que refleja el índice, o None si
+            todavía no se armó.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version = None
+        self.entries = []
+        self.by_id = {}
+        self.lock = threading.Lock()
+
+    def build(self):
+        """Arma el índice desde la base con una sola consulta."""
+        version = get_version(self.model)
+        rows = self.model.objects.values_list("id", "name")
+        entries = sorted((fold(name), id, name) for id, name in rows)
+        self.entries = entries
+        self.by_id = {entry[1]: entry for entry in entries}
+        self.version = version
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        """
+        Nombres que empiezan con prefix, sin distinguir acentos ni mayúsculas.
+
+        Args:
+            prefix (str): Lo que escribió el usuario.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            list: Diccionarios {"id", "name"} en orden alfabético.
+        """
+        key = fold(prefix)
+        with self.lock:
+            if self.version != get_version(self.model):
+                self.build()
+
+            entries = self.entries
+            start = bisect_left(entries, (key,))
+            results = []
+            for entry_key, id, name in entries[start:start + limit]:
+                if not entry_key.startswith(key):
+                    break
+                results.append({"id": id, "name": name})
+        return results
+
+    def _remove(self, id):
+        entry = self.by_id.pop(id, None)
+        if entry is not None:
+            del self.entries[bisect_left(self.entries, entry)]
+
+    def apply(self, id, name, version, deleted=False):
+        """
+        Aplica un alta, edición o borrado ya confirmado.
+
+        Args:
+            id (int): La fila que cambió.
+            name (str): Su nombre actual (ignorado si se borró).
+            version (int): La versión de la tabla después del cambio.
+            deleted (bool): Si la fila se borró.
+        """
+        with self.lock:
+            if self.version is None or self.version != version - 1:
+                # Hubo otros cambios que el índice no vio: se rearma al buscar
+                self.version = None
+                return
+
+            self._remove(id)
+            if not deleted:
+                entry = (fold(name), id, name)
+                insort(self.entries, entry)
+                self.by_id[id] = entry
+            self.version = version
+
+
+_indexes = {model: PrefixIndex(model) for model in ENTITIES.values()}
+
+
+def search_names(entity, prefix, limit=DEFAULT_LIMIT):
+    """
+    Busca en el índice de la entidad y registra el tiempo de la búsqueda.
+
+    Returns:
+        list: Los resultados, o None si la entidad no tiene autocompletado.
+    """
+    model = ENTITIES.get(entity)
+    if model is None:
+        return None
+
+    start = time.perf_counter()
+    results = _indexes[model].search(prefix, limit)
+    AUTOCOMPLETE_LOOKUPS.labels(entity).observe(time.perf_counter() - start)
+    return results
+
+
+def reset_indexes():
+    """Descarta los índices armados; se vuelven a armar en la próxima búsqueda."""
+    for index in _indexes.values():
+        with index.lock:
+            index.version = None
+            index.entries = []
+            index.by_id = {}
+
+
+def _schedule(sender, instance, deleted):
+    index = _indexes.get(sender)
+    if index is None or index.version is None:
+        return
+
+    # Se conecta después de invalidate_pages, cuyo on_commit corre antes que
+    # este: la versión leída al confirmar ya incluye el cambio. El id se copia
+    # ahora porque el borrado lo pone en None.
+    id, name = instance.pk, instance.name
+    transaction.on_commit(lambda: index.apply(id, name, get_version(sender), deleted))
+
+
+def index_saved(sender, instance, **kwargs):
+    """Actualiza el índice con el alta o edición cuando se confirme."""
+    _schedule(sender, instance, deleted=False)
+
+
+def index_deleted(sender, instance, **kwargs):
+    """Quita la fila borrada del índice cuando se confirme."""
+    _schedule(sender, instance, deleted=True)
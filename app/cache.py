@@ -0,0 +1,133 @@
+import hashlib
+import re
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from prometheus_client import Counter
+
+PAGE_CACHE_HITS = Counter(
+    "vetsoft_page_cache_hits_total",
+    "Páginas servidas desde la caché",
+    ["view"],
+)
+PAGE_CACHE_MISSES = Counter(
+    "vetsoft_page_cache_misses_total",
+    "Páginas renderizadas por no estar en la caché",
+    ["view"],
+)
+
+# El token CSRF es propio de cada usuario: en la caché se guarda un marcador y se
+# reemplaza por el token del usuario al servir la página.
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_PLACEHOLDER = "__csrf_token__"
+
+
+def get_cache():
+    """La caché configurada para versiones y páginas."""
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f"table_version:{model._meta.label_lower}"
+
+
+def get_version(model):
+    """
+    Versión actual de la tabla de model.
+
+    Si la clave no existe (caché nueva o clave desalojada) se inicializa con la
+    hora en nanosegundos, así nunca coincide con una versión anterior.
+    """
+    return get_cache().get_or_set(_version_key(model), time.time_ns, timeout=None)
+
+
+def bump_version(model):
+    """Invalida todas las páginas cacheadas de model cambiando su versión."""
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), time.time_ns(), timeout=None)
+
+
+def page_key(view_name, models, request):
+    """Clave de la página: vista, versión de cada tabla y URL completa."""
+    versions = ":".join(str(get_version(model)) for model in models)
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"page:{view_name}:{versions}:{digest}"
+
+
+def _hit_response(view_name, content, request):
+    PAGE_CACHE_HITS.labels(view_name).inc()
+    response = HttpResponse(content.replace(CSRF_PLACEHOLDER, get_token(request)))
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def _cacheable_content(response):
+    # El HTML a guardar con el token CSRF reemplazado por el marcador, o None
+    if response.status_code != 200 or response.streaming:
+        return None
+    return CSRF_INPUT_RE.sub(rf"\g<1>{CSRF_PLACEHOLDER}\g<2>", response.content.decode())
+
+
+def cached_page(*models):
+    """
+    Cachea el HTML de una vista GET hasta que cambie alguna de las tablas.
+
+    Las páginas se invalidan al cambiar la versión de cualquiera de los modelos,
+    que suben las señales post_save/post_delete al confirmarse la transacción
+    (ver app/signals.py). Funciona igual sobre vistas síncronas y asíncronas.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if not settings.PAGE_CACHE_ENABLED or request.method != "GET":
+                    return await view(request, *args, **kwargs)
+
+                cache = get_cache()
+                key = page_key(view.__name__, models, request)
+                content = await cache.aget(key)
+                if content is not None:
+                    return _hit_response(view.__name__, content, request)
+
+                PAGE_CACHE_MISSES.labels(view.__name__).inc()
+                response = await view(request, *args, **kwargs)
+                content = _cacheable_content(response)
+                if content is not None:
+                    await cache.aset(key, content, timeout=settings.PAGE_CACHE_TIMEOUT)
+                response["X-Page-Cache"] = "miss"
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.PAGE_CACHE_ENABLED or request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = page_key(view.__name__, models, request)
+            content = cache.get(key)
+            if content is not None:
+                return _hit_response(view.__name__, content, request)
+
+            PAGE_CACHE_MISSES.labels(view.__name__).inc()
+            response = view(request, *args, **kwargs)
+            content = _cacheable_content(response)
+            if content is not None:
+                cache.set(key, content, timeout=settings.PAGE_CACHE_TIMEOUT)
+            response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapper
+
+    return decorator
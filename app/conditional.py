@@ -0,0 +1,28 @@
+import hashlib
+
+from django.utils.http import http_date
+
+from .cache import get_version
+
+
+def table_etag(*models):
+    """
+    Función de ETag para django.views.decorators.http.condition.
+
+    El ETag combina la versión de las tablas (ver app/cache.py) con la URL, así
+    se calcula sin consultar la base y cambia con cualquier escritura en ellas.
+    Si coincide con If-None-Match la vista responde 304 sin renderizar nada.
+    """
+
+    def etag(request, *args, **kwargs):
+        versions = ":".join(str(get_version(model)) for model in models)
+        return hashlib.md5(f"{versions}:{request.get_full_path()}".encode()).hexdigest()
+
+    return etag
+
+
+def set_last_modified(response, instance):
+    """Agrega Last-Modified a la respuesta con la fecha de actualización de instance."""
+    if instance is not None and instance.updated_at is not None:
+        response["Last-Modified"] = http_date(instance.updated_at.timestamp())
+    return response
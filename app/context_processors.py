@@ -3,6 +3,7 @@ from django.urls import reverse
 links = [
     {"label": "Home", "href": reverse("home"), "icon": "bi bi-house-door"},
     {"label": "Clientes", "href": reverse("clients_repo"), "icon": "bi bi-people"},
+    {"label": "Buscar", "href": reverse("search"), "icon": "bi bi-search"},
 ]
 
 
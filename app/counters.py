@@ -0,0 +1,282 @@
+"""
+Contadores de filas por entidad (y por grupo) para el tablero del inicio.
+
+Contar con COUNT(*) y GROUP BY en cada visita al inicio recorre las tablas
+enteras. En su lugar SummaryCounter guarda una fila por entidad con su total
+(group = "") y una por cada especialidad de veterinario; el tablero lee esas
+pocas filas con una consulta, sin importar el tamaño de las tablas. Los
+conteos por tipo de producto salen de app/facets.py.
+
+Las señales post_save/post_delete ajustan los contadores con un UPDATE dentro
+de la misma transacción que la escritura, así un rollback también los
+deshace. Las escrituras masivas (bulk_create, bulk_update, borrados de muchas
+filas) acumulan los cambios con batched_counts() y los aplican con un solo
+UPDATE por entidad; una tabla vaciada sin señales (seed_data --clear) pone
+sus contadores en cero con record_cleared(). Lo que escape a esos caminos (SQL a mano, save() de una
+instancia que no se leyó de la base) lo corrige el comando
+reconcile_counters, pensado para correr periódicamente.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+
+from .cache import bump_version
+from .models import Client, Medi, Product, Provider, SummaryCounter, Vet
+
+# Modelo contado: el campo por el que además se cuenta por grupo, o None
+COUNTED = {
+    Client: None,
+    Product: None,
+    Vet: "specialty",
+    Medi: None,
+    Provider: None,
+}
+
+_local = threading.local()
+
+
+def _entity(model):
+    return model._meta.model_name
+
+
+def _group_field(model):
+    name = COUNTED.get(model)
+    return model._meta.get_field(name) if name else None
+
+
+def _deltas_for(model, instances, sign):
+    deltas = defaultdict(int)
+    field = _group_field(model)
+    for instance in instances:
+        deltas[""] += sign
+        if field is not None:
+            deltas[str(field.value_from_object(instance))] += sign
+    return deltas
+
+
+def _write(entity, deltas):
+    deltas = {group: delta for group, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    counters = SummaryCounter.objects.filter(entity=entity, group__in=list(deltas))
+    if len(deltas) == 1:
+        change = Value(next(iter(deltas.values())))
+    else:
+        change = Case(
+            *[When(group=group, then=Value(delta)) for group, delta in deltas.items()],
+            default=Value(0),
+        )
+    updated = counters.update(count=F("count") + change)
+
+    if updated < len(deltas):
+        # Primer registro de un grupo: las filas que ya existían (y ya se
+        # actualizaron) chocan con la restricción única y se ignoran
+        SummaryCounter.objects.bulk_create(
+            [SummaryCounter(entity=entity, group=group, count=delta) for group, delta in deltas.items()],
+            ignore_conflicts=True,
+        )
+
+
+def apply_deltas(model, deltas):
+    """
+    Suma deltas a los contadores de model, o los acumula si hay un batched_counts activo.
+
+    Args:
+        model (Model): La entidad contada.
+        deltas (dict): Cambio por grupo; "" es el total de la entidad.
+    """
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        _write(_entity(model), deltas)
+        return
+
+    for group, delta in deltas.items():
+        pending[_entity(model)][group] += delta
+
+
+@contextmanager
+def batched_counts():
+    """
+    Acumula los cambios de contadores del bloque y los aplica juntos al salir.
+
+    Se usa alrededor de escrituras de muchas filas para que los post_delete de
+    cada fila no hagan un UPDATE cada uno. Si el bloque falla no se aplica nada.
+    """
+    if getattr(_local, "pending", None) is not None:
+        yield
+        return
+
+    _local.pending = defaultdict(lambda: defaultdict(int))
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+
+    for entity, deltas in pending.items():
+        _write(entity, deltas)
+
+
+def _remember_group(field, instances):
+    # El grupo ya contado de cada instancia, para que un save() posterior que
+    # la cambie de grupo no dependa de que se haya leído de la base
+    for instance in instances:
+        instance._counted_group = str(field.value_from_object(instance))
+
+
+def record_created(model, instances):
+    """Cuenta filas insertadas sin post_save (bulk_create)."""
+    if model in COUNTED:
+        apply_deltas(model, _deltas_for(model, instances, 1))
+        field = _group_field(model)
+        if field is not None:
+            _remember_group(field, instances)
+
+
+def record_cleared(model):
+    """Pone en cero los contadores de una tabla vaciada sin post_delete (borrado masivo)."""
+    if model in COUNTED:
+        SummaryCounter.objects.filter(entity=_entity(model)).delete()
+
+
+def record_regrouped(model, instances):
+    """
+    Mueve de grupo las filas editadas sin post_save (bulk_update).
+
+    Compara el último grupo contado de la instancia, o el valor leído de la
+    base (ver ChangeTrackingMixin), con el actual; las instancias que no se
+    crearon ni se leyeron en este proceso se ignoran.
+    """
+    field = _group_field(model)
+    if field is None:
+        return
+
+    deltas = defaultdict(int)
+    counted = []
+    for instance in instances:
+        old = getattr(instance, "_counted_group", None)
+        if old is None:
+            loaded = getattr(instance, "_loaded_values", None) or {}
+            if field.attname not in loaded:
+                continue
+            old = str(loaded[field.attname])
+        new = str(field.value_from_object(instance))
+        if old != new:
+            deltas[old] -= 1
+            deltas[new] += 1
+        counted.append(instance)
+    apply_deltas(model, deltas)
+    _remember_group(field, counted)
+
+
+def count_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Suma la fila creada o la cambia de grupo si se editó su campo de grupo."""
+    if created:
+        record_created(sender, [instance])
+        return
+
+    field = _group_field(sender)
+    if field is not None and (update_fields is None or field.name in update_fields):
+        record_regrouped(sender, [instance])
+
+
+def count_deleted(sender, instance, **kwargs):
+    """Resta la fila borrada del total y de su grupo."""
+    apply_deltas(sender, _deltas_for(sender, [instance], -1))
+
+
+def actual_counts():
+    """
+    Los conteos reales con COUNT(*) y GROUP BY; recorre las tablas.
+
+    Returns:
+        dict: El conteo por (entidad, grupo).
+    """
+    counts = {}
+    for model in COUNTED:
+        entity = _entity(model)
+        counts[(entity, "")] = model.objects.count()
+        field = _group_field(model)
+        if field is not None:
+            rows = model.objects.values_list(field.attname).annotate(total=Count("pk"))
+            for group, total in rows.order_by():
+                counts[(entity, str(group))] = total
+    return counts
+
+
+def reconcile():
+    """
+    Compara los contadores con los conteos reales y corrige los que difieren.
+
+    Las páginas cacheadas de cada modelo corregido (el tablero, los conteos por
+    grupo) mostraban el valor desviado: al confirmarse se sube su versión.
+
+    Returns:
+        list: Las diferencias corregidas como (entidad, grupo, guardado, real).
+    """
+    models = {_entity(model): model for model in COUNTED}
+    with transaction.atomic():
+        actual = actual_counts()
+        stored = {
+            (entity, group): count
+            for entity, group, count in SummaryCounter.objects.values_list("entity", "group", "count")
+        }
+
+        drift = []
+        for key in sorted(set(actual) | set(stored)):
+            expected = actual.get(key, 0)
+            if stored.get(key) == expected or (expected == 0 and key not in stored):
+                continue
+            drift.append((*key, stored.get(key), expected))
+            entity, group = key
+            if expected == 0 and group != "":
+                SummaryCounter.objects.filter(entity=entity, group=group).delete()
+            else:
+                SummaryCounter.objects.update_or_create(
+                    entity=entity, group=group, defaults={"count": expected},
+                )
+
+        for entity in {entity for entity, *_ in drift}:
+            if entity in models:
+                transaction.on_commit(lambda model=models[entity]: bump_version(model))
+    return drift
+
+
+def choices_with_counts(model):
+    """
+    Las opciones del campo de grupo de model con la cantidad de filas de cada una.
+
+    Returns:
+        list: Ternas (valor, etiqueta, cantidad) en el orden de las opciones.
+    """
+    counts = dict(
+        SummaryCounter.objects.filter(entity=_entity(model)).exclude(group="")
+        .values_list("group", "count"),
+    )
+    return [(value, label, counts.get(value, 0)) for value, label in _group_field(model).choices]
+
+
+def dashboard():
+    """
+    Los números del tablero leídos de los contadores con una sola consulta.
+
+    Returns:
+        dict: El total por entidad (totals) y los conteos por grupo (groups) de
+        cada entidad agrupada, de mayor a menor y sin los grupos vacíos.
+    """
+    totals = {_entity(model): 0 for model in COUNTED}
+    groups = {_entity(model): [] for model, field in COUNTED.items() if field}
+    for entity, group, count in SummaryCounter.objects.values_list("entity", "group", "count"):
+        if group == "":
+            totals[entity] = count
+        elif count > 0 and entity in groups:
+            groups[entity].append((group, count))
+
+    for rows in groups.values():
+        rows.sort(key=lambda row: (-row[1], row[0]))
+    return {"totals": totals, "groups": groups}
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import connections
+
+# Pragmas que se aplican en cada conexión nueva, en este orden
+PRAGMA_NAMES = (
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+)
+
+
+def pragma_statements(pragmas):
+    """
+    Arma las sentencias PRAGMA a partir de un diccionario de configuración.
+
+    Args:
+        pragmas (dict): Valores por nombre de pragma; los vacíos se omiten.
+
+    Returns:
+        list: Las sentencias PRAGMA en el orden de PRAGMA_NAMES.
+    """
+    return [
+        f"PRAGMA {name} = {pragmas[name]}"
+        for name in PRAGMA_NAMES
+        if pragmas.get(name) not in (None, "")
+    ]
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Aplica settings.SQLITE_PRAGMAS a cada conexión SQLite que abre Django.
+
+    Con WAL las lecturas no bloquean a la escritura ni al revés, y busy_timeout
+    hace que una escritura concurrente espere el lock en lugar de fallar con
+    "database is locked".
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+            cursor.execute(statement)
+
+
+def active_pragmas(using="default"):
+    """Lee los valores vigentes de los pragmas en la conexión indicada."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return {}
+
+    values = {}
+    with connection.cursor() as cursor:
+        for name in PRAGMA_NAMES:
+            cursor.execute(f"PRAGMA {name}")
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+
+    return values
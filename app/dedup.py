@@ -0,0 +1,241 @@
+"""
+Detección de clientes duplicados por claves de bloqueo.
+
+Comparar cada cliente con todos los demás es O(n²). En cambio cada cliente
+recibe unas pocas claves de bloqueo (el nombre fonético, el teléfono sin
+prefijo y la parte local del email) y solo se comparan los clientes que
+comparten alguna: la cantidad de pares crece casi linealmente con la tabla.
+Los bloques con más de max_block_size clientes (una clave demasiado común,
+como "info@") se descartan para no volver a lo cuadrático.
+
+Cada par candidato se puntúa con la similitud del nombre y la coincidencia de
+teléfono y email; los que superan el umbral se guardan en DuplicateCandidate
+para revisarlos y fusionarlos desde /clientes/duplicados/.
+"""
+
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Client, DuplicateCandidate
+from .text import fold
+from .tracking import ConflictError
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MAX_BLOCK_SIZE = 50
+
+# Dígitos finales del teléfono que se comparan: el número local sin el 54 ni
+# la característica, que se escriben de formas distintas
+PHONE_DIGITS = 8
+
+# Grafías que suenan igual en castellano, en el orden en que se aplican
+PHONETIC_RULES = (
+    ("ch", "x"),
+    ("ll", "y"),
+    ("qu", "k"),
+    ("ce", "se"),
+    ("ci", "si"),
+    ("ge", "je"),
+    ("gi", "ji"),
+    ("c", "k"),
+    ("z", "s"),
+    ("v", "b"),
+    ("w", "b"),
+    ("h", ""),
+    ("y", "i"),
+)
+
+REPEATED_RE = re.compile(r"(.)\1+")
+
+# Campos que se eligen de uno u otro cliente al fusionar, con su etiqueta
+MERGE_FIELDS = (
+    ("name", "Nombre"),
+    ("phone", "Teléfono"),
+    ("email", "Email"),
+    ("address", "Dirección"),
+)
+
+# Peso de cada señal en el puntaje final (suman 1)
+NAME_WEIGHT = 0.5
+PHONE_WEIGHT = 0.3
+EMAIL_WEIGHT = 0.2
+
+
+def phonetic_key(name):
+    """
+    Clave fonética del nombre: primer y último nombre transcritos y ordenados.
+
+    "Juan Carlos Pérez", "Perez Juan" y "Juan Peres" dan la misma clave.
+    """
+    words = fold(name).split()
+    if not words:
+        return ""
+
+    codes = []
+    for word in {words[0], words[-1]}:
+        for spelling, sound in PHONETIC_RULES:
+            word = word.replace(spelling, sound)
+        codes.append(REPEATED_RE.sub(r"\1", word))
+    return " ".join(sorted(codes))
+
+
+def phone_key(phone):
+    """Los últimos PHONE_DIGITS dígitos del teléfono, o "" si tiene menos."""
+    digits = re.sub(r"\D", "", str(phone or ""))
+    return digits[-PHONE_DIGITS:] if len(digits) >= PHONE_DIGITS else ""
+
+
+def email_key(email):
+    """La parte local del email en minúsculas, sin puntos ni el sufijo +etiqueta."""
+    local = (email or "").split("@")[0].casefold()
+    return local.split("+")[0].replace(".", "")
+
+
+def blocking_keys(name, phone, email):
+    """Las claves de bloqueo no vacías de un cliente."""
+    keys = (("name", phonetic_key(name)), ("phone", phone_key(phone)), ("email", email_key(email)))
+    return [(kind, key) for kind, key in keys if key]
+
+
+def similarity(client, other):
+    """
+    Puntaje entre 0 y 1 de que dos clientes sean la misma persona.
+
+    Returns:
+        tuple: El puntaje y las señales que coincidieron (name, phone, email).
+    """
+    name = SequenceMatcher(None, fold(client.name), fold(other.name)).ratio()
+    score = NAME_WEIGHT * name
+    reasons = ["name"] if name >= 0.85 else []
+
+    if phone_key(client.phone) and phone_key(client.phone) == phone_key(other.phone):
+        score += PHONE_WEIGHT
+        reasons.append("phone")
+    if email_key(client.email) and email_key(client.email) == email_key(other.email):
+        score += EMAIL_WEIGHT
+        reasons.append("email")
+
+    return round(score, 3), reasons
+
+
+def build_blocks(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Agrupa los ids de clientes por clave de bloqueo leyendo la tabla por bloques.
+
+    Solo se guardan en memoria las claves y los ids, nunca las filas completas.
+
+    Returns:
+        dict: Los ids de cada clave, en orden ascendente.
+    """
+    blocks = defaultdict(list)
+    last_id = 0
+    while True:
+        rows = list(
+            Client.objects.filter(pk__gt=last_id).order_by("pk")
+            .values_list("pk", "name", "phone", "email")[:chunk_size],
+        )
+        if not rows:
+            break
+
+        for pk, name, phone, email in rows:
+            for key in blocking_keys(name, phone, email):
+                blocks[key].append(pk)
+        last_id = rows[-1][0]
+    return blocks
+
+
+def candidate_pairs(blocks, max_block_size=DEFAULT_MAX_BLOCK_SIZE):
+    """Los pares (id menor, id mayor) que comparten al menos un bloque, sin repetir."""
+    seen = set()
+    for ids in blocks.values():
+        if len(ids) < 2 or len(ids) > max_block_size:
+            continue
+        for position, client_id in enumerate(ids):
+            for other_id in ids[position + 1:]:
+                if (client_id, other_id) not in seen:
+                    seen.add((client_id, other_id))
+                    yield client_id, other_id
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def find_duplicates(
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    threshold=DEFAULT_THRESHOLD,
+    max_block_size=DEFAULT_MAX_BLOCK_SIZE,
+):
+    """
+    Puntúa los pares candidatos por bloques de chunk_size pares.
+
+    Yields:
+        list: Por cada bloque, los DuplicateCandidate (sin guardar) con
+        puntaje mayor o igual a threshold.
+    """
+    pairs = candidate_pairs(build_blocks(chunk_size), max_block_size)
+    for chunk in _chunks(pairs, chunk_size):
+        ids = {client_id for pair in chunk for client_id in pair}
+        clients = Client.objects.only("name", "phone", "email").in_bulk(ids)
+        found = []
+        for client_id, other_id in chunk:
+            # Un cliente borrado (o fusionado) después de armar los bloques ya no está
+            if client_id not in clients or other_id not in clients:
+                continue
+            score, reasons = similarity(clients[client_id], clients[other_id])
+            if score >= threshold:
+                found.append(DuplicateCandidate(
+                    client_id=client_id, other_id=other_id, score=score, reasons=",".join(reasons),
+                ))
+        yield found
+
+
+def merge_clients(kept, removed, data, removed_version):
+    """
+    Fusiona removed en kept: aplica data con update_client y borra removed.
+
+    Todo ocurre en una transacción: si los datos no validan, o si cualquiera
+    de los dos clientes cambió desde que se mostró la fusión, no se escribe
+    nada.
+
+    Args:
+        kept (Client): El cliente que queda.
+        removed (Client): El cliente duplicado que se borra.
+        data (dict): Los valores elegidos y la versión de kept.
+        removed_version (str): La versión de removed que vio quien fusiona.
+
+    Returns:
+        tuple: (True, None) si se fusionaron, o (False, errores).
+
+    Raises:
+        ConflictError: Si alguno de los clientes ya no está en esa versión.
+    """
+    try:
+        removed_version = int(removed_version)
+    except (TypeError, ValueError):
+        raise ConflictError() from None
+
+    with transaction.atomic():
+        saved, errors = kept.update_client(data)
+        if not saved:
+            return False, errors
+
+        deleted, _ = Client.objects.filter(pk=removed.pk, version=removed_version).delete()
+        if not deleted:
+            raise ConflictError()
+
+        DuplicateCandidate.objects.filter(
+            Q(client_id=removed.pk) | Q(other_id=removed.pk),
+        ).delete()
+    return True, None
@@ -0,0 +1,166 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+
+from .filters import (
+    filter_clients,
+    filter_medis,
+    filter_products,
+    filter_providers,
+    filter_vets,
+)
+from .models import Client, Medi, Product, Provider, Vet
+
+# Filas que se piden a la base y se escriben en la respuesta por cada bloque
+EXPORT_CHUNK_SIZE = 2000
+
+# Columnas que se leen de una tabla relacionada: el tipo se exporta por nombre
+COLUMN_LOOKUPS = {
+    "products": {"type": "type__name"},
+}
+
+# Entidad exportable: (modelo, columnas, filtro de la página del repositorio)
+EXPORTS = {
+    "clients": (Client, ("id", "name", "phone", "email", "address"), filter_clients),
+    "products": (Product, ("id", "name", "type", "price"), filter_products),
+    "vets": (Vet, ("id", "name", "email", "phone", "specialty"), filter_vets),
+    "medis": (Medi, ("id", "name", "description", "dose"), filter_medis),
+    "providers": (Provider, ("id", "name", "email", "address"), filter_providers),
+}
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+class Echo:
+    """Buffer mínimo para csv.writer que devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        """Devuelve el valor escrito para que el generador lo entregue."""
+        return value
+
+
+def _export_queryset(entity, params):
+    model, fields, filter_queryset = EXPORTS[entity]
+    queryset = model.objects.all()
+    if filter_queryset is not None:
+        queryset = filter_queryset(queryset, params)
+
+    lookups = COLUMN_LOOKUPS.get(entity, {})
+    columns = [lookups.get(field, field) for field in fields]
+    return queryset.order_by("id").values_list(*columns)
+
+
+def export_rows(entity, params):
+    """
+    Itera las filas de una entidad como tuplas, por bloques y sin cachear.
+
+    Args:
+        entity (str): La clave de la entidad en EXPORTS.
+        params (QueryDict): Los mismos filtros que acepta la página del repositorio.
+
+    Returns:
+        iterator: Las filas como tuplas en el orden de las columnas.
+    """
+    return _export_queryset(entity, params).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+async def aexport_rows(entity, params):
+    """
+    Versión async de export_rows.
+
+    Cada bloque es una consulta corta por id (las filas después del último id
+    leído) que corre en el hilo de sync_to_async; entre bloques el event loop
+    queda libre. El id es siempre la primera columna exportada.
+
+    Returns:
+        AsyncIterator: Las filas como tuplas en el orden de las columnas.
+    """
+    queryset = _export_queryset(entity, params)
+    last_id = 0
+    while True:
+        rows = await sync_to_async(list)(queryset.filter(pk__gt=last_id)[:EXPORT_CHUNK_SIZE])
+        for row in rows:
+            yield row
+        if len(rows) < EXPORT_CHUNK_SIZE:
+            break
+        last_id = rows[-1][0]
+
+
+def _chunks(rows, render_row):
+    buffer = []
+    for row in rows:
+        buffer.append(render_row(row))
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+
+    if buffer:
+        yield "".join(buffer)
+
+
+async def _achunks(rows, render_row):
+    buffer = []
+    async for row in rows:
+        buffer.append(render_row(row))
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def _ndjson_renderer(fields):
+    def render_row(row):
+        return json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n"
+
+    return render_row
+
+
+def stream_csv(entity, params):
+    """Genera el CSV de la entidad: primero el encabezado y luego bloques de filas."""
+    _, fields, _ = EXPORTS[entity]
+    writer = csv.writer(Echo())
+
+    # El encabezado sale antes de ejecutar la consulta
+    yield writer.writerow(fields)
+    yield from _chunks(export_rows(entity, params), writer.writerow)
+
+
+def stream_ndjson(entity, params):
+    """Genera un objeto JSON por línea con las columnas de la entidad."""
+    _, fields, _ = EXPORTS[entity]
+    yield from _chunks(export_rows(entity, params), _ndjson_renderer(fields))
+
+
+async def astream_csv(entity, params):
+    """Versión async de stream_csv, para servir la exportación bajo ASGI."""
+    _, fields, _ = EXPORTS[entity]
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(fields)
+    async for chunk in _achunks(aexport_rows(entity, params), writer.writerow):
+        yield chunk
+
+
+async def astream_ndjson(entity, params):
+    """Versión async de stream_ndjson, para servir la exportación bajo ASGI."""
+    _, fields, _ = EXPORTS[entity]
+    async for chunk in _achunks(aexport_rows(entity, params), _ndjson_renderer(fields)):
+        yield chunk
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
+
+# Bajo ASGI un generador sync se juntaría entero en memoria antes de enviarlo
+ASYNC_STREAMERS = {
+    "csv": astream_csv,
+    "ndjson": astream_ndjson,
+}
@@ -0,0 +1,46 @@
+"""
+Conteos por tipo para el filtro facetado de la página de productos.
+
+La lista de tipos con su cantidad de productos sale de un GROUP BY sobre el
+índice de type_id unido a ProductType. El resultado se guarda en la caché bajo
+la versión de la tabla de productos (ver app/cache.py): cualquier alta,
+edición o borrado de un producto sube esa versión y el siguiente pedido
+vuelve a contar, sin tener que borrar nada a mano.
+"""
+
+from django.conf import settings
+from django.db.models import Count
+
+from .cache import get_cache, get_version
+from .models import Product, ProductType
+
+
+def _count_product_types():
+    rows = (
+        ProductType.objects.annotate(count=Count("products"))
+        .filter(count__gt=0)
+        .order_by("-count", "name")
+        .values_list("name", "count")
+    )
+    return list(rows)
+
+
+def product_type_facets():
+    """
+    Los tipos de producto con su cantidad de productos, de mayor a menor.
+
+    Con la caché de páginas desactivada (en las pruebas) se cuenta siempre.
+
+    Returns:
+        list: Pares (nombre del tipo, cantidad), sin los tipos vacíos.
+    """
+    if not settings.PAGE_CACHE_ENABLED:
+        return _count_product_types()
+
+    cache = get_cache()
+    key = f"facets:product_type:{get_version(Product)}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = _count_product_types()
+        cache.set(key, facets, timeout=settings.PAGE_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,70 @@
+"""
+Campos de modelo propios.
+
+ChoiceCodeField guarda un campo con TextChoices como un entero pequeño (2
+bytes en lugar del texto completo en cada fila) sin que el resto del código
+lo note: en Python el valor sigue siendo el texto de la opción
+("Cardiología"), y los filtros, valores leídos con values()/values_list() y
+las etiquetas para mostrar funcionan igual que con un CharField. Los índices
+sobre la columna comparan enteros y ocupan menos.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class ChoiceCodeField(models.PositiveSmallIntegerField):
+    """Guarda la opción elegida de choices como su posición en la lista.
+
+    El código de cada opción es su posición en choices, así que las opciones
+    nuevas se agregan siempre al final: cambiar el orden cambiaría el
+    significado de las filas guardadas.
+    """
+
+    description = "Opción de choices guardada como entero pequeño"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.options = [value for value, _ in self.flatchoices]
+        self.codes = {value: code for code, value in enumerate(self.options)}
+
+    @cached_property
+    def validators(self):
+        """
+        Los validadores del campo sin los límites de rango de IntegerField.
+
+        Esos límites comparan enteros y en Python el valor es el texto de la opción.
+        """
+        return [*self.default_validators, *self._validators]
+
+    def to_python(self, value):
+        """El texto de la opción, aceptando también su código."""
+        if value is None or value in self.codes:
+            return value
+        if isinstance(value, int) and 0 <= value < len(self.options):
+            return self.options[value]
+        raise ValidationError(
+            self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value},
+        )
+
+    def from_db_value(self, value, expression, connection):
+        """Convierte el código leído de la base en el texto de la opción."""
+        if value is None:
+            return value
+        return self.options[value]
+
+    def get_prep_value(self, value):
+        """
+        El código de la opción para escribir o filtrar.
+
+        Raises:
+            ValueError: Si value no es una de las opciones.
+        """
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return value
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} no es una opción de {self.name}") from None
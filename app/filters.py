@@ -0,0 +1,122 @@
+from django.db.models import Q
+
+from .models import Vet
+from .text import fold
+
+# Mayor carácter del plano básico: todo texto que empieza con el prefijo queda
+# entre prefix y prefix + PREFIX_END, lo que permite resolver la búsqueda con un
+# rango sobre el índice en lugar de un LIKE '%...%' que recorre toda la tabla.
+PREFIX_END = "\uffff"
+
+
+def prefix_range(field, prefix):
+    """Condición de rango sobre el índice para los valores que empiezan con prefix."""
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + PREFIX_END})
+
+
+def repository_ordering(params):
+    """
+    Orden de la página del repositorio según ?sort=.
+
+    Con ?sort=name se ordena por el nombre normalizado (sin acentos ni
+    mayúsculas) y el id como desempate, que la base recorre sobre el índice de
+    name_folded; si no, por id.
+    """
+    if params.get("sort", "") == "name":
+        return ("name_folded", "id")
+    return ("id",)
+
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_clients(queryset, params):
+    """
+    Filtra clientes por ?q= buscando por nombre, teléfono o email.
+
+    El nombre se busca por prefijo sin distinguir acentos ni mayúsculas (sobre
+    name_folded), el teléfono y el email por igualdad, de modo que cada
+    condición usa su propio índice.
+    """
+    q = params.get("q", "").strip()
+    if q == "":
+        return queryset
+
+    condition = prefix_range("name_folded", fold(q))
+    if q.isdigit():
+        condition |= Q(phone=int(q))
+    if "@" in q:
+        condition |= Q(email=q)
+
+    return queryset.filter(condition)
+
+
+def filter_products(queryset, params):
+    """
+    Filtra productos por ?type= y por rango de precio ?min_price= / ?max_price=.
+
+    El tipo se pide por nombre y se busca en el índice único de ProductType;
+    los productos se filtran por el type_id resultante.
+    """
+    type = params.get("type", "").strip()
+    if type != "":
+        queryset = queryset.filter(type__name=type)
+
+    min_price = _float_or_none(params.get("min_price"))
+    if min_price is not None:
+        queryset = queryset.filter(price__gte=min_price)
+
+    max_price = _float_or_none(params.get("max_price"))
+    if max_price is not None:
+        queryset = queryset.filter(price__lte=max_price)
+
+    return queryset
+
+
+def filter_vets(queryset, params):
+    """
+    Filtra veterinarios por ?q= (prefijo del nombre) y por ?specialty=.
+
+    La especialidad se acepta sin acentos ni mayúsculas ("cardiologia") y se
+    traduce a la opción, que se guarda como código entero (ver
+    app/fields.py): el filtro es una igualdad entre enteros sobre el índice.
+    Una especialidad que no es una opción no devuelve resultados.
+    """
+    q = params.get("q", "").strip()
+    if q != "":
+        queryset = queryset.filter(prefix_range("name_folded", fold(q)))
+
+    specialty = params.get("specialty", "").strip()
+    if specialty == "":
+        return queryset
+
+    specialties = {fold(value): value for value in Vet.VetSpecialties.values}
+    if fold(specialty) not in specialties:
+        return queryset.none()
+    return queryset.filter(specialty=specialties[fold(specialty)])
+
+
+def filter_medis(queryset, params):
+    """Filtra medicinas por ?q= buscando por prefijo del nombre sin acentos."""
+    q = params.get("q", "").strip()
+    if q == "":
+        return queryset
+
+    return queryset.filter(prefix_range("name_folded", fold(q)))
+
+
+def filter_providers(queryset, params):
+    """Filtra proveedores por ?q= buscando por prefijo de nombre (sin acentos) o por email."""
+    q = params.get("q", "").strip()
+    if q == "":
+        return queryset
+
+    condition = prefix_range("name_folded", fold(q))
+    if "@" in q:
+        condition |= Q(email=q)
+
+    return queryset.filter(condition)
@@ -0,0 +1,173 @@
+import csv
+import io
+from itertools import islice
+
+from django.db import transaction
+
+from .cache import bump_version
+from .counters import record_created
+from .models import Client, Product, ProductType, validate_client, validate_product
+from .writer import run_write
+
+# Filas que se validan y se insertan juntas en una sola transacción
+IMPORT_BATCH_SIZE = 1000
+
+ENCODING_ERROR = "El archivo no está codificado en UTF-8: no se leyó desde esta línea"
+
+
+def build_clients(rows):
+    """Crea (sin guardar) los clientes de un bloque de filas ya validadas."""
+    return [
+        Client(
+            name=data.get("name"),
+            phone=int(data.get("phone")),
+            email=data.get("email"),
+            address=data.get("address") or "",
+        )
+        for data in rows
+    ]
+
+
+def build_products(rows):
+    """
+    Crea (sin guardar) los productos de un bloque de filas ya validadas.
+
+    Los tipos del bloque se resuelven a ids juntos, creando los nuevos.
+    """
+    type_ids = ProductType.objects.ids_for(data.get("type") for data in rows)
+    return [
+        Product(
+            name=data.get("name"),
+            type_id=type_ids[data.get("type")],
+            price=float(data.get("price")),
+        )
+        for data in rows
+    ]
+
+
+# Entidad importable: (modelo, validación existente, constructor de las instancias del bloque)
+IMPORTS = {
+    "clients": (Client, validate_client, build_clients),
+    "products": (Product, validate_product, build_products),
+}
+
+# Columnas esperadas en el encabezado del CSV
+IMPORT_COLUMNS = {
+    "clients": ("name", "phone", "email", "address"),
+    "products": ("name", "type", "price"),
+}
+
+
+class ImportReport:
+    """Resultado de una importación.
+
+    Attributes:
+        created (int): Cantidad de filas insertadas.
+        errors (list): Pares (línea, errores) de las filas rechazadas.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    @property
+    def rejected(self):
+        """Cantidad de filas rechazadas por la validación."""
+        return len(self.errors)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _clean(row):
+    return {key.strip(): (value or "").strip() for key, value in row.items() if key}
+
+
+def _numbered_rows(reader):
+    """
+    Las filas del CSV con su número de línea (la 1 es el encabezado).
+
+    Si el archivo no es UTF-8 la fila que no se pudo decodificar sale como
+    None y la lectura termina ahí.
+    """
+    line = 1
+    while True:
+        line += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            yield line, None
+            return
+        yield line, row
+
+
+def _insert(model, build, rows, batch_size):
+    with transaction.atomic():
+        instances = build(rows)
+        model.objects.bulk_create(instances, batch_size=batch_size)
+        record_created(model, instances)
+
+    # bulk_create no envía post_save: se cuentan las filas y se invalidan
+    # las páginas a mano
+    bump_version(model)
+    return len(instances)
+
+
+def import_csv(entity, stream, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importa filas CSV con encabezado leyendo el archivo de a poco.
+
+    Cada bloque se valida con las mismas reglas que el formulario (validate_*)
+    y las filas válidas se insertan con bulk_create en una transacción por
+    bloque, a través del escritor único (ver app/writer.py). Las filas
+    inválidas no se insertan y quedan en el reporte; un archivo que no es
+    UTF-8 se importa hasta la línea que no se pudo leer, que queda como error.
+
+    Args:
+        entity (str): La clave de la entidad en IMPORTS.
+        stream (file): Un archivo de texto abierto con el CSV.
+        batch_size (int): Filas por bloque y por transacción.
+
+    Returns:
+        ImportReport: Las filas creadas y los errores por línea.
+    """
+    model, validate, build = IMPORTS[entity]
+    report = ImportReport()
+    reader = csv.DictReader(stream)
+
+    for batch in _batches(_numbered_rows(reader), batch_size):
+        rows = []
+        for line, row in batch:
+            if row is None:
+                report.errors.append((line, {"file": ENCODING_ERROR}))
+                continue
+            data = _clean(row)
+            errors = validate(data)
+            if errors:
+                report.errors.append((line, errors))
+                continue
+            rows.append(data)
+
+        if not rows:
+            continue
+
+        report.created += run_write(_insert, model, build, rows, batch_size)
+
+    return report
+
+
+def import_uploaded_file(entity, uploaded_file, batch_size=IMPORT_BATCH_SIZE):
+    """Importa un archivo subido por formulario sin cargarlo entero en memoria."""
+    stream = io.TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_csv(entity, stream, batch_size=batch_size)
+    finally:
+        stream.detach()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from app.imports import IMPORT_BATCH_SIZE, import_csv
+
+
+class ImportCommand(BaseCommand):
+    """Base de los comandos de importación CSV por bloques."""
+
+    entity = None
+
+    def add_arguments(self, parser):
+        """Define las opciones del comando."""
+        parser.add_argument("path", help="Ruta del archivo CSV con encabezado.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        """Importa el archivo y muestra las filas rechazadas con sus errores."""
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            report = import_csv(self.entity, stream, batch_size=options["batch_size"])
+
+        for line, errors in report.errors:
+            details = "; ".join(f"{field}: {message}" for field, message in errors.items())
+            self.stderr.write(f"Línea {line}: {details}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.created} filas importadas, {report.rejected} rechazadas",
+            ),
+        )
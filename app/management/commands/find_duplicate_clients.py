@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.dedup import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_BLOCK_SIZE,
+    DEFAULT_THRESHOLD,
+    find_duplicates,
+)
+from app.models import DuplicateCandidate
+
+
+class Command(BaseCommand):
+    """Busca clientes duplicados por claves de bloqueo y guarda los pares candidatos."""
+
+    help = "Detecta clientes probablemente duplicados y los deja para revisar en /clientes/duplicados/."
+
+    def add_arguments(self, parser):
+        """Define las opciones del comando."""
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Clientes leídos y pares puntuados por bloque.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="Puntaje mínimo (0 a 1) para guardar un par.",
+        )
+        parser.add_argument(
+            "--max-block-size",
+            type=int,
+            default=DEFAULT_MAX_BLOCK_SIZE,
+            help="Se ignoran las claves compartidas por más clientes que este número.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Segundos de pausa entre bloques para ceder la base a otras escrituras.",
+        )
+
+    def handle(self, *args, **options):
+        """Reemplaza los pares candidatos por los de una pasada nueva, bloque por bloque."""
+        DuplicateCandidate.objects.all().delete()
+
+        chunks = found = 0
+        for candidates in find_duplicates(
+            chunk_size=options["chunk_size"],
+            threshold=options["threshold"],
+            max_block_size=options["max_block_size"],
+        ):
+            with transaction.atomic():
+                DuplicateCandidate.objects.bulk_create(candidates, ignore_conflicts=True)
+            chunks += 1
+            found += len(candidates)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{found} pares de clientes duplicados en {chunks} bloques"),
+        )
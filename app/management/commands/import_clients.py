@@ -0,0 +1,8 @@
+from ._import import ImportCommand
+
+
+class Command(ImportCommand):
+    """Importa clientes desde un archivo CSV."""
+
+    help = "Importa clientes desde un CSV validando y guardando por bloques."
+    entity = "clients"
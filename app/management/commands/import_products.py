@@ -0,0 +1,8 @@
+from ._import import ImportCommand
+
+
+class Command(ImportCommand):
+    """Importa productos desde un archivo CSV."""
+
+    help = "Importa productos desde un CSV validando y guardando por bloques."
+    entity = "products"
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.search import FTS_INDEXES, fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    """Reconstruye los índices FTS5 sin bloquear la base durante toda la operación."""
+
+    help = "Reconstruye por bloques los índices de texto completo de medicinas y clientes."
+
+    def add_arguments(self, parser):
+        """Define las opciones del comando."""
+        parser.add_argument(
+            "--model",
+            choices=[model.__name__.lower() for model in FTS_INDEXES],
+            help="Reconstruye solo el índice de este modelo.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Segundos de pausa entre bloques para ceder la base a otras escrituras.",
+        )
+
+    def handle(self, *args, **options):
+        """Reconstruye el índice de cada modelo pedido, bloque por bloque."""
+        if not fts_available():
+            raise CommandError("La búsqueda de texto completo requiere SQLite (FTS5).")
+
+        for model in FTS_INDEXES:
+            name = model.__name__.lower()
+            if options["model"] and options["model"] != name:
+                continue
+
+            chunks = 0
+            for _last_id in rebuild_index(model, chunk_size=options["chunk_size"]):
+                chunks += 1
+                if options["sleep"]:
+                    time.sleep(options["sleep"])
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Índice de {name} reconstruido en {chunks} bloques"),
+            )
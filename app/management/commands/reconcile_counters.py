@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from app.counters import reconcile
+from app.writer import file_lock
+
+
+class Command(BaseCommand):
+    """Corrige los contadores del tablero comparándolos con los conteos reales."""
+
+    help = (
+        "Recalcula con COUNT(*) los contadores del tablero y corrige los que difieren. "
+        "Pensado para correr periódicamente (por ejemplo con cron)."
+    )
+
+    def handle(self, *args, **options):
+        """Recalcula los contadores y muestra las diferencias encontradas."""
+        # Con WRITE_LOCK_FILE no se mezcla con los lotes del escritor único
+        with file_lock():
+            drift = reconcile()
+
+        for entity, group, stored, actual in drift:
+            label = f"{entity}:{group}" if group else entity
+            self.stdout.write(f"{label}: {stored} -> {actual}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Contadores verificados, {len(drift)} corregidos"),
+        )
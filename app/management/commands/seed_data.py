@@ -0,0 +1,147 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from app.cache import bump_version
+from app.counters import record_cleared, record_created
+from app.models import Client, Medi, Product, ProductType, Provider, Vet
+
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+BATCH_SIZE = 5000
+
+FIRST_NAMES = (
+    "Juan", "Maria", "Lucia", "Pedro", "Sofia", "Martin", "Ana", "Diego",
+    "Valentina", "Tomas", "Camila", "Mateo", "Julieta", "Santiago", "Paula",
+)
+LAST_NAMES = (
+    "Perez", "Gomez", "Rodriguez", "Fernandez", "Lopez", "Martinez", "Garcia",
+    "Sanchez", "Romero", "Sosa", "Torres", "Alvarez", "Ruiz", "Diaz", "Acosta",
+)
+STREETS = ("Calle", "Avenida", "Diagonal", "Pasaje")
+PRODUCT_TYPES = ("Alimento", "Accesorio", "Higiene", "Juguete", "Farmacia")
+MEDICINE_WORDS = (
+    "antibiotico", "analgesico", "antiinflamatorio", "antiparasitario",
+    "vitaminas", "vacuna", "dermatologico", "digestivo",
+)
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def build_clients(rng, count):
+    for number in range(count):
+        yield Client(
+            name=_name(rng),
+            phone=54221_000_0000 + number,
+            email=f"cliente{number}@vetsoft.com",
+            address=f"{rng.choice(STREETS)} {rng.randint(1, 200)}",
+        )
+
+
+def build_products(rng, count):
+    type_ids = ProductType.objects.ids_for(PRODUCT_TYPES)
+    for number in range(count):
+        yield Product(
+            name=f"Producto {number}",
+            type_id=type_ids[rng.choice(PRODUCT_TYPES)],
+            price=round(rng.uniform(100, 50000), 2),
+        )
+
+
+def build_vets(rng, count):
+    specialties = Vet.VetSpecialties.values
+    for number in range(count):
+        yield Vet(
+            name=_name(rng),
+            email=f"vet{number}@vetsoft.com",
+            phone=str(221_000_0000 + number),
+            specialty=rng.choice(specialties),
+        )
+
+
+def build_medis(rng, count):
+    for number in range(count):
+        yield Medi(
+            name=f"Medicina {number}",
+            description=" ".join(rng.sample(MEDICINE_WORDS, 3)),
+            dose=rng.randint(1, 10),
+        )
+
+
+def build_providers(rng, count):
+    for number in range(count):
+        yield Provider(
+            name=f"Proveedor {rng.choice(LAST_NAMES)} {number}",
+            email=f"proveedor{number}@vetsoft.com",
+            address=f"{rng.choice(STREETS)} {rng.randint(1, 200)}",
+        )
+
+
+BUILDERS = {
+    Client: build_clients,
+    Product: build_products,
+    Vet: build_vets,
+    Medi: build_medis,
+    Provider: build_providers,
+}
+
+
+class Command(BaseCommand):
+    """Carga datos sintéticos deterministas para las pruebas de rendimiento."""
+
+    help = "Carga datos sintéticos deterministas (misma semilla, mismos datos) por modelo."
+
+    def add_arguments(self, parser):
+        """Define las opciones del comando."""
+        parser.add_argument("--scale", choices=SCALES, default="1k")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--clear", action="store_true", help="Borra los datos existentes antes de cargar.",
+        )
+
+    def handle(self, *args, **options):
+        """Inserta la cantidad de filas de la escala en cada modelo por bloques."""
+        count = SCALES[options["scale"]]
+
+        for model, build in BUILDERS.items():
+            if options["clear"]:
+                self._clear(model)
+
+            # Una semilla por modelo para que cada tabla sea reproducible por sí sola
+            rng = random.Random(f"{options['seed']}-{model.__name__}")
+            batch = []
+            for instance in build(rng, count):
+                batch.append(instance)
+                if len(batch) >= BATCH_SIZE:
+                    self._insert(model, batch)
+                    batch = []
+            if batch:
+                self._insert(model, batch)
+
+            self.stdout.write(f"{model.__name__}: {count} filas")
+
+    def _clear(self, model):
+        # Un DELETE por tabla, sin leer las filas ni disparar señales por cada
+        # una: lo que borraría el CASCADE se borra antes a mano, y contadores y
+        # versión se ajustan una vez para toda la tabla
+        with transaction.atomic():
+            for relation in model._meta.related_objects:
+                if relation.on_delete is models.CASCADE:
+                    related = relation.related_model
+                    related.objects.all()._raw_delete(related.objects.db)
+            model.objects.all()._raw_delete(model.objects.db)
+            record_cleared(model)
+        bump_version(model)
+
+    def _insert(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+            record_created(model, batch)
+        bump_version(model)
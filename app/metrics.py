@@ -0,0 +1,142 @@
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .counters import dashboard
+from .middleware import current_timings
+
+# Con PROMETHEUS_MULTIPROC_DIR definido, prometheus_client guarda los valores de
+# cada worker en archivos mmap de ese directorio y /metrics los suma al leerlos,
+# así las métricas son correctas con varios workers de gunicorn.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    "vetsoft_requests_total",
+    "Solicitudes atendidas",
+    ["url_name", "method", "status"],
+)
+ERRORS = Counter(
+    "vetsoft_request_errors_total",
+    "Solicitudes que terminaron en error del servidor (5xx)",
+    ["url_name"],
+)
+LATENCY = Histogram(
+    "vetsoft_request_latency_seconds",
+    "Duración de las solicitudes",
+    ["url_name"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERIES = Histogram(
+    "vetsoft_request_queries",
+    "Consultas SQL por solicitud",
+    ["url_name"],
+    buckets=QUERY_BUCKETS,
+)
+
+
+class RowCountCollector:
+    """Informa la cantidad de filas de cada modelo según los contadores del tablero."""
+
+    def collect(self):
+        """Genera el gauge vetsoft_model_rows con una muestra por modelo."""
+        rows = GaugeMetricFamily(
+            "vetsoft_model_rows", "Filas por modelo", labels=["model"],
+        )
+        # Una sola consulta a SummaryCounter en lugar de un COUNT(*) por tabla
+        for entity, count in dashboard()["totals"].items():
+            rows.add_metric([entity], count)
+        yield rows
+
+
+def render_metrics():
+    """
+    Devuelve el texto en formato Prometheus y su content type.
+
+    Suma las métricas de todos los workers (o las del proceso actual si no hay
+    directorio multiproceso) y agrega los conteos de filas del momento.
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    rows_registry = CollectorRegistry()
+    rows_registry.register(RowCountCollector())
+
+    return generate_latest(registry) + generate_latest(rows_registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Registra cantidad, errores, latencia y consultas por nombre de URL.
+
+    Debe ir después de RequestTimingMiddleware para leer la cantidad de
+    consultas de la solicitud. Con METRICS_ENABLED=False no se carga.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Ejecuta la solicitud y actualiza las métricas con su resultado."""
+        if iscoroutinefunction(self):
+            return self._acall(request)
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.observe(request, status, time.perf_counter() - start)
+
+    async def _acall(self, request):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.observe(request, status, time.perf_counter() - start)
+
+    def observe(self, request, status, elapsed):
+        """Registra una solicitud terminada en las métricas de su ruta."""
+        match = request.resolver_match
+        url_name = (match.url_name if match else None) or "unmatched"
+
+        REQUESTS.labels(url_name, request.method, str(status)).inc()
+        LATENCY.labels(url_name).observe(elapsed)
+        if status >= 500:
+            ERRORS.labels(url_name).inc()
+
+        timings = current_timings.get()
+        if timings is not None:
+            QUERIES.labels(url_name).observe(timings.queries)
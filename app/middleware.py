@@ -0,0 +1,173 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import Template
+
+logger = logging.getLogger("app.requests")
+
+# Mediciones de la solicitud en curso; None fuera de una solicitud medida
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """Acumula las mediciones de una solicitud.
+
+    Attributes:
+        queries (int): Cantidad de consultas SQL ejecutadas.
+        sql (float): Segundos en la base de datos.
+        template (float): Segundos renderizando templates.
+        total (float): Segundos entre que la solicitud entra y sale de la vista.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.total = 0.0
+
+    @property
+    def view(self):
+        """Segundos de Python en la vista, sin contar SQL ni templates."""
+        return max(self.total - self.sql - self.template, 0.0)
+
+    def server_timing(self):
+        """Valor del header Server-Timing con las duraciones en milisegundos."""
+        return ", ".join(
+            [
+                f'db;dur={self.sql * 1000:.1f};desc="{self.queries} queries"',
+                f"view;dur={self.view * 1000:.1f}",
+                f"tpl;dur={self.template * 1000:.1f}",
+                f"total;dur={self.total * 1000:.1f}",
+            ],
+        )
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql += time.perf_counter() - start
+        timings.queries += 1
+
+
+def install_sql_timing():
+    """
+    Mide las consultas de la conexión del hilo actual; solo suma si hay una solicitud medida.
+
+    Cada hilo tiene su propia conexión, y bajo ASGI el ORM corre en los hilos de
+    sync_to_async, no en el del event loop: por eso el wrapper se instala en la
+    conexión del hilo que ejecuta las consultas y queda puesto (una sola vez por
+    conexión). Las mediciones van a la solicitud de current_timings, que
+    sync_to_async copia al hilo, así que solicitudes concurrentes que comparten
+    el hilo no se mezclan.
+    """
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+_original_template_render = Template.render
+
+
+def _timed_template_render(self, context=None, request=None):
+    timings = current_timings.get()
+    if timings is None:
+        return _original_template_render(self, context, request)
+
+    start = time.perf_counter()
+    try:
+        return _original_template_render(self, context, request)
+    finally:
+        timings.template += time.perf_counter() - start
+
+
+def install_template_timing():
+    """Mide el render de templates de Django; solo suma si hay una solicitud medida."""
+    Template.render = _timed_template_render
+
+
+class RequestTimingMiddleware:
+    """Mide consultas, tiempo de SQL, de vista y de templates de cada solicitud.
+
+    Agrega el header Server-Timing a la respuesta y escribe una línea de log
+    JSON en el logger "app.requests". Con REQUEST_TIMING_ENABLED=False Django
+    descarta el middleware al iniciar, así que no tiene costo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        install_template_timing()
+        # Bajo ASGI con vistas async la cadena sigue siendo async, sin pasar a un hilo
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Ejecuta la solicitud midiendo SQL y templates y agrega los resultados."""
+        if iscoroutinefunction(self):
+            return self._acall(request)
+
+        install_sql_timing()
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings.total = time.perf_counter() - start
+            current_timings.reset(token)
+
+        return self.process_timings(request, response, timings)
+
+    async def _acall(self, request):
+        # El ORM async corre en el hilo de sync_to_async: el wrapper va en esa conexión
+        await sync_to_async(install_sql_timing)()
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timings.total = time.perf_counter() - start
+            current_timings.reset(token)
+
+        return self.process_timings(request, response, timings)
+
+    def process_timings(self, request, response, timings):
+        """Agrega el header Server-Timing y escribe la línea de log de la solicitud."""
+        response["Server-Timing"] = timings.server_timing()
+
+        if logger.isEnabledFor(logging.INFO):
+            match = request.resolver_match
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "url_name": match.url_name if match else None,
+                        "status": response.status_code,
+                        "queries": timings.queries,
+                        "sql_ms": round(timings.sql * 1000, 2),
+                        "view_ms": round(timings.view * 1000, 2),
+                        "template_ms": round(timings.template * 1000, 2),
+                        "total_ms": round(timings.total * 1000, 2),
+                    },
+                ),
+            )
+
+        return response
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.4 on 2026-10-18 17:45
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_alter_client_phone_alter_vet_specialty'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='client',
+            name='email',
+            field=models.EmailField(db_index=True, max_length=254),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100, validators=[django.core.validators.RegexValidator(message='El nombre solo puede contener letras y espacios.', regex='^[a-zA-Z\\s]+$')]),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='phone',
+            field=models.BigIntegerField(db_index=True, validators=[django.core.validators.RegexValidator(message='El teléfono debe contener solo números.', regex='^\\d+$')]),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='price',
+            field=models.FloatField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='type',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='provider',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='vet',
+            name='specialty',
+            field=models.CharField(choices=[('Sin especialidad', 'Sin especialidad'), ('Cardiología', 'Cardiología'), ('Medicina interna de pequeños animales', 'Medicina interna de pequeños animales'), ('Medicina interna de grandes animales', 'Medicina interna de grandes animales'), ('Neurología', 'Neurología'), ('Oncología', 'Oncología'), ('Nutrición', 'Nutrición')], db_index=True, default='Sin especialidad', max_length=100),
+        ),
+    ]
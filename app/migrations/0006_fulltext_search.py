@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# Tablas FTS5 que replican el texto buscable de Medi y Client. Se mantienen
+# sincronizadas con triggers, así ninguna escritura por fuera del ORM queda sin
+# indexar. Solo se crean en SQLite; en otros motores la búsqueda usa el ORM.
+FTS_TABLES = {
+    "app_medi_fts": ("app_medi", ("name", "description")),
+    "app_client_fts": ("app_client", ("name", "address")),
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    for fts_table, (table, columns) in FTS_TABLES.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+            f"{column_list}, tokenize='unicode61 remove_diacritics 2')",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+            f"END",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {fts_table} WHERE rowid = old.id; "
+            f"END",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+            f"DELETE FROM {fts_table} WHERE rowid = old.id; "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+            f"END",
+        )
+        schema_editor.execute(
+            f"INSERT INTO {fts_table}(rowid, {column_list}) "
+            f"SELECT id, {column_list} FROM {table}",
+        )
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    for fts_table in FTS_TABLES:
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
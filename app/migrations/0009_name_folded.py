@@ -0,0 +1,68 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:17
+
+import django.core.validators
+from django.db import migrations, models, transaction
+
+from app.text import fold
+
+BACKFILL_MODELS = ("client", "medi", "provider", "vet")
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def backfill_name_folded(apps, schema_editor):
+    # Por bloques de ids, cada uno en su propia transacción corta, así la base
+    # sigue aceptando escrituras mientras se completan tablas grandes
+    db = schema_editor.connection.alias
+    for model_name in BACKFILL_MODELS:
+        model = apps.get_model("app", model_name)
+        last_id = 0
+        while True:
+            rows = list(
+                model.objects.using(db).filter(pk__gt=last_id).order_by("pk")
+                .only("pk", "name")[:BACKFILL_CHUNK_SIZE],
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                row.name_folded = fold(row.name)
+            with transaction.atomic(using=db):
+                model.objects.using(db).bulk_update(rows, ["name_folded"])
+            last_id = rows[-1].pk
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0008_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='medi',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='provider',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='vet',
+            name='name_folded',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100, validators=[django.core.validators.RegexValidator(message='El nombre solo puede contener letras y espacios.', regex='^(?:[^\\W\\d_]|\\s)+$')]),
+        ),
+        migrations.RunPython(backfill_name_folded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:25
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Entidad contada: el campo por el que además se cuenta por grupo
+COUNTED = {
+    "client": None,
+    "product": "type",
+    "vet": "specialty",
+    "medi": None,
+    "provider": None,
+}
+
+
+def fill_counters(apps, schema_editor):
+    db = schema_editor.connection.alias
+    counter = apps.get_model("app", "SummaryCounter")
+    rows = []
+    for entity, field in COUNTED.items():
+        model = apps.get_model("app", entity)
+        rows.append(counter(entity=entity, group="", count=model.objects.using(db).count()))
+        if field:
+            groups = model.objects.using(db).values_list(field).annotate(total=Count("pk")).order_by()
+            rows.extend(counter(entity=entity, group=group, count=total) for group, total in groups)
+    counter.objects.using(db).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_duplicate_candidate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=20)),
+                ('group', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='summarycounter',
+            constraint=models.UniqueConstraint(fields=('entity', 'group'), name='unique_summary_counter'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
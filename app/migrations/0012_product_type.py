@@ -0,0 +1,85 @@
+# Generated by Django 5.0.4 on 2026-10-18 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def fill_product_types(apps, schema_editor):
+    # Un tipo por cada nombre distinto (recorre el índice de type) y después
+    # los productos por bloques de ids, cada bloque en su propia transacción
+    # corta para no bloquear las escrituras en tablas grandes
+    db = schema_editor.connection.alias
+    product_model = apps.get_model("app", "Product")
+    type_model = apps.get_model("app", "ProductType")
+
+    names = product_model.objects.using(db).order_by().values_list("type", flat=True).distinct()
+    type_model.objects.using(db).bulk_create(
+        [type_model(name=name) for name in names], ignore_conflicts=True,
+    )
+    ids = dict(type_model.objects.using(db).values_list("name", "id"))
+
+    last_id = 0
+    while True:
+        rows = list(
+            product_model.objects.using(db).filter(pk__gt=last_id).order_by("pk")
+            .values_list("pk", "type")[:BACKFILL_CHUNK_SIZE],
+        )
+        if not rows:
+            break
+
+        by_type = {}
+        for pk, name in rows:
+            by_type.setdefault(ids[name], []).append(pk)
+        with transaction.atomic(using=db):
+            for type_id, pks in by_type.items():
+                product_model.objects.using(db).filter(pk__in=pks).update(type_ref=type_id)
+        last_id = rows[-1][0]
+
+
+def drop_type_counters(apps, schema_editor):
+    # Los conteos por tipo pasan a salir de app/facets.py
+    counter_model = apps.get_model("app", "SummaryCounter")
+    counter_model.objects.using(schema_editor.connection.alias).filter(
+        entity="product",
+    ).exclude(group="").delete()
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0011_summary_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='type_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='app.producttype'),
+        ),
+        migrations.RunPython(fill_product_types, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='product',
+            name='type',
+        ),
+        migrations.RenameField(
+            model_name='product',
+            old_name='type_ref',
+            new_name='type',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='products', to='app.producttype'),
+        ),
+        migrations.RunPython(drop_type_counters, migrations.RunPython.noop),
+    ]
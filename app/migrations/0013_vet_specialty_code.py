@@ -0,0 +1,73 @@
+# Generated by Django 5.0.4 on 2026-10-18 22:10
+
+import app.fields
+from django.db import migrations, models, transaction
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# Código de cada especialidad: su posición en Vet.VetSpecialties (ver app/fields.py)
+SPECIALTIES = [
+    "Sin especialidad",
+    "Cardiología",
+    "Medicina interna de pequeños animales",
+    "Medicina interna de grandes animales",
+    "Neurología",
+    "Oncología",
+    "Nutrición",
+]
+
+
+def fill_specialty_codes(apps, schema_editor):
+    # Por bloques de ids, cada uno en su propia transacción corta; un texto
+    # que no es una opción queda como "Sin especialidad" (código 0)
+    db = schema_editor.connection.alias
+    vet_model = apps.get_model("app", "Vet")
+    codes = {value: code for code, value in enumerate(SPECIALTIES)}
+
+    last_id = 0
+    while True:
+        rows = list(
+            vet_model.objects.using(db).filter(pk__gt=last_id).order_by("pk")
+            .values_list("pk", "specialty")[:BACKFILL_CHUNK_SIZE],
+        )
+        if not rows:
+            break
+
+        by_code = {}
+        for pk, specialty in rows:
+            by_code.setdefault(codes.get(specialty, 0), []).append(pk)
+        with transaction.atomic(using=db):
+            for code, pks in by_code.items():
+                vet_model.objects.using(db).filter(pk__in=pks).update(specialty_code=code)
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0012_product_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vet',
+            name='specialty_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(fill_specialty_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='vet',
+            name='specialty',
+        ),
+        migrations.RenameField(
+            model_name='vet',
+            old_name='specialty_code',
+            new_name='specialty',
+        ),
+        migrations.AlterField(
+            model_name='vet',
+            name='specialty',
+            field=app.fields.ChoiceCodeField(choices=[('Sin especialidad', 'Sin especialidad'), ('Cardiología', 'Cardiología'), ('Medicina interna de pequeños animales', 'Medicina interna de pequeños animales'), ('Medicina interna de grandes animales', 'Medicina interna de grandes animales'), ('Neurología', 'Neurología'), ('Oncología', 'Oncología'), ('Nutrición', 'Nutrición')], db_index=True, default='Sin especialidad'),
+        ),
+    ]
@@ -1,9 +1,16 @@
 import re
 
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
+from .fields import ChoiceCodeField
+from .text import FoldedNameMixin, FoldedNameQuerySet
+from .tracking import ChangeTrackingMixin
+
+# Letras (incluidas las acentuadas y la ñ) y espacios
+NAME_RE = r'^(?:[^\W\d_]|\s)+$'
+
 # def validate_name(name):
 #     if not re.match(r'^[a-zA-Z\s]+$', name):
 #         raise ValidationError('El nombre solo puede contener letras y espacios.')
@@ -22,7 +29,7 @@ def validate_client(data):
     if name == "":
         errors["name"] = "Por favor ingrese un nombre"
     else:
-        if not re.match(r'^[a-zA-Z\s]+$', name):
+        if not re.match(NAME_RE, name):
             errors["name"] = "El nombre solo puede contener letras y espacios."
 
     
@@ -64,6 +71,10 @@ def validate_vet(data):
     elif email.count("@") == 0:
         errors["email"] = "Por favor ingrese un email valido"
 
+    # Si se envía tiene que ser una opción: "" no tiene código (ver app/fields.py)
+    if "specialty" in data and data["specialty"] not in Vet.VetSpecialties.values:
+        errors["specialty"] = "Por favor seleccione una especialidad válida"
+
     return errors
 
 
@@ -147,33 +158,43 @@ def validate_provider(data):
     return errors
 
 
-class Client(models.Model):
+class Client(FoldedNameMixin, ChangeTrackingMixin, models.Model):
     """Representa un cliente con detalles de contacto personal.
 
     Attributes:
         name (str): El nombre del cliente.
+        name_folded (str): El nombre sin acentos ni mayúsculas, para buscar y ordenar.
         phone (str): El número de teléfono del cliente.
         email (str): La dirección de correo electrónico del cliente.
         address (str): La dirección física del cliente.
+        updated_at (datetime): La fecha de la última modificación.
+        version (int): Se incrementa en cada edición (concurrencia optimista).
     """
     name = models.CharField(
         max_length=100,
+        db_index=True,
         validators=[
             RegexValidator(
-                regex=r'^[a-zA-Z\s]+$',
+                regex=NAME_RE,
                 message="El nombre solo puede contener letras y espacios.",
             ),
         ],
     )
+    name_folded = models.CharField(max_length=100, db_index=True, editable=False, default="")
     phone = models.BigIntegerField(
+        db_index=True,
         validators=[
             RegexValidator(
                 regex=r'^\d+$',
                 message="El teléfono debe contener solo números.",
             ),
         ])
-    email = models.EmailField()
+    email = models.EmailField(db_index=True)
     address = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = FoldedNameQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -215,20 +236,66 @@ class Client(models.Model):
         if errors:
             return False, errors
 
-        self.save()
+        self.save_changes(client_data.get("version"))
         return True, None
 
-class Product(models.Model):
+class ProductTypeQuerySet(models.QuerySet):
+    """QuerySet de tipos de producto con la traducción de nombres a ids."""
+
+    def ids_for(self, names):
+        """
+        Los ids de los tipos con esos nombres, creando los que no existen.
+
+        Se usa en las escrituras masivas (importación, lotes de la API) para
+        resolver todos los tipos de un bloque con dos o tres consultas.
+
+        Args:
+            names (iterable): Los nombres de los tipos.
+
+        Returns:
+            dict: El id de cada nombre.
+        """
+        names = set(names)
+        ids = dict(self.filter(name__in=names).values_list("name", "id"))
+        missing = names - ids.keys()
+        if missing:
+            self.bulk_create([ProductType(name=name) for name in missing], ignore_conflicts=True)
+            ids.update(self.filter(name__in=missing).values_list("name", "id"))
+        return ids
+
+
+class ProductType(models.Model):
+    """Un tipo o categoría de producto.
+
+    Cada nombre se guarda una sola vez y los productos lo referencian por id,
+    así filtrar y agrupar por tipo compara enteros sobre un índice.
+
+    Attributes:
+        name (str): El nombre del tipo, único.
+    """
+    name = models.CharField(max_length=100, unique=True)
+
+    objects = ProductTypeQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
+class Product(ChangeTrackingMixin, models.Model):
     """Representa un producto disponible para la venta.
 
     Attributes:
         name (str): El nombre del producto.
-        type (str): El tipo o categoría del producto.
+        type (ProductType): El tipo o categoría del producto.
         price (float): El precio del producto.
+        updated_at (datetime): La fecha de la última modificación.
+        version (int): Se incrementa en cada edición (concurrencia optimista).
     """
     name = models.CharField(max_length=100)
-    type = models.CharField(max_length=100)
-    price = models.FloatField()
+    type = models.ForeignKey(ProductType, on_delete=models.PROTECT, related_name="products")
+    price = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return self.name
@@ -241,18 +308,18 @@ class Product(models.Model):
         if len(errors.keys()) > 0:
             return False, errors
 
-        Product.objects.create(
-            name=product_data.get("name"),
-            type=product_data.get("type"),
-            price=product_data.get("price"),
-        )
+        with transaction.atomic():
+            Product.objects.create(
+                name=product_data.get("name"),
+                type=ProductType.objects.get_or_create(name=product_data.get("type"))[0],
+                price=product_data.get("price"),
+            )
 
         return True, None
 
     def update_product(self, product_data):
         """Actualiza los datos de un producto"""
         self.name = product_data.get("name", "") or self.name
-        self.type = product_data.get("type", "") or self.type
         try:
             price = float(product_data.get("price", ""))
         except ValueError:
@@ -265,17 +332,30 @@ class Product(models.Model):
 
         # Si no hay errores, actualiza el precio y guarda el objeto en la base de datos
         self.price = price
-        self.save()
+        type_name = product_data.get("type", "")
+        if not type_name:
+            self.save_changes(product_data.get("version"))
+            return True, None
+
+        # El tipo se busca o crea recién con los datos validados y en la misma
+        # transacción que la edición: si esta falla (por ejemplo por un
+        # conflicto) no queda un tipo huérfano
+        with transaction.atomic():
+            self.type = ProductType.objects.get_or_create(name=type_name)[0]
+            self.save_changes(product_data.get("version"))
         return True, None
 
-class Vet(models.Model):
+class Vet(FoldedNameMixin, ChangeTrackingMixin, models.Model):
     """Representa un veterinario con una especialidad específica.
 
     Attributes:
         name (str): El nombre del veterinario.
+        name_folded (str): El nombre sin acentos ni mayúsculas, para buscar y ordenar.
         email (str): La dirección de correo electrónico del veterinario.
         phone (str): El número de teléfono del veterinario.
         specialty (str): La especialidad del veterinario.
+        updated_at (datetime): La fecha de la última modificación.
+        version (int): Se incrementa en cada edición (concurrencia optimista).
     """
     class VetSpecialties(models.TextChoices):
         SIN_ESPECIALIDAD="Sin especialidad", _("Sin especialidad")
@@ -288,13 +368,19 @@ class Vet(models.Model):
 
 
     name = models.CharField(max_length=100)
+    name_folded = models.CharField(max_length=100, db_index=True, editable=False, default="")
     email = models.EmailField()
     phone = models.CharField(max_length=15)
-    specialty = models.CharField(
-        max_length=100,
+    # En la base es el código de la opción (ver app/fields.py); en Python, su texto
+    specialty = ChoiceCodeField(
         choices=VetSpecialties,
-        default=VetSpecialties.SIN_ESPECIALIDAD, # se agrego la coma faltante detectada con ruff
+        default=VetSpecialties.SIN_ESPECIALIDAD,
+        db_index=True,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = FoldedNameQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -321,21 +407,31 @@ class Vet(models.Model):
         self.name = vet_data.get("name", "") or self.name
         self.email = vet_data.get("email", "") or self.email
         self.phone = vet_data.get("phone", "") or self.phone
-        self.specialty = vet_data.get("specialty", "") or self.specialty
-        self.save()
+        # Una especialidad que no es una opción no se puede guardar: se conserva la actual
+        if vet_data.get("specialty", "") in Vet.VetSpecialties.values:
+            self.specialty = vet_data["specialty"]
+        self.save_changes(vet_data.get("version"))
 
 
-class Medi(models.Model):
+class Medi(FoldedNameMixin, ChangeTrackingMixin, models.Model):
     """Representa una medicina.
 
     Attributes:
         name (str): El nombre de la medicina.
+        name_folded (str): El nombre sin acentos ni mayúsculas, para buscar y ordenar.
         description (str): La descripción de la medicina.
         dose (int): La dosis de la medicina.
+        updated_at (datetime): La fecha de la última modificación.
+        version (int): Se incrementa en cada edición (concurrencia optimista).
     """
     name = models.CharField(max_length=100)
+    name_folded = models.CharField(max_length=100, db_index=True, editable=False, default="")
     description = models.TextField()
     dose = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = FoldedNameQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -361,20 +457,28 @@ class Medi(models.Model):
         self.name = medi_data.get("name", "") or self.name
         self.description = medi_data.get("description", "") or self.description
         self.dose = medi_data.get("dose", "") or self.dose
-        self.save()
+        self.save_changes(medi_data.get("version"))
 
 
-class Provider(models.Model):
+class Provider(FoldedNameMixin, ChangeTrackingMixin, models.Model):
     """Representa un proveedor.
 
      Attributes:
          name (str): El nombre del proveedor.
+         name_folded (str): El nombre sin acentos ni mayúsculas, para buscar y ordenar.
          email (str): La dirección de correo electrónico del proveedor.
          address (str, opcional): La dirección física del proveedor.
+         updated_at (datetime): La fecha de la última modificación.
+         version (int): Se incrementa en cada edición (concurrencia optimista).
     """
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
+    name_folded = models.CharField(max_length=100, db_index=True, editable=False, default="")
     email = models.EmailField()
     address = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = FoldedNameQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -402,4 +506,61 @@ class Provider(models.Model):
         self.email = provider_data.get("email","") or self.email
         self.address = provider_data.get("address","") or self.address
 
-        self.save()
+        self.save_changes(provider_data.get("version"))
+
+
+class DuplicateCandidate(models.Model):
+    """Un par de clientes que probablemente son la misma persona.
+
+    Lo completa el comando find_duplicate_clients (ver app/dedup.py) y se
+    revisa desde la página de duplicados, que permite fusionarlos.
+
+    Attributes:
+        client (Client): El cliente de menor id del par.
+        other (Client): El otro cliente del par.
+        score (float): La similitud entre 0 y 1.
+        reasons (str): Las señales que coincidieron, separadas por comas.
+        created_at (datetime): Cuándo se detectó el par.
+    """
+    # Sin FK en la base ni cascada: borrar un cliente no consulta esta tabla.
+    # Los pares de clientes borrados no aparecen porque la lista usa un JOIN.
+    client = models.ForeignKey(
+        Client, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    other = models.ForeignKey(
+        Client, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    score = models.FloatField()
+    reasons = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["client", "other"], name="unique_duplicate_pair"),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} ~ {self.other_id} ({self.score})"
+
+
+class SummaryCounter(models.Model):
+    """Cantidad de filas de una entidad, o de un grupo de ella, para el tablero.
+
+    La mantienen las señales de guardado y borrado (ver app/counters.py).
+
+    Attributes:
+        entity (str): El nombre del modelo contado (client, vet, ...).
+        group (str): Vacío para el total; si no, la especialidad contada.
+        count (int): La cantidad de filas.
+    """
+    entity = models.CharField(max_length=20)
+    group = models.CharField(max_length=100, blank=True, default="")
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entity", "group"], name="unique_summary_counter"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity}:{self.group} = {self.count}"
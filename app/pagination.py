@@ -0,0 +1,205 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values):
+    """Codifica los valores de la clave de orden en un token opaco para la URL."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, length):
+    """Decodifica un token de cursor. Devuelve None si el token no es válido."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != length:
+        return None
+
+    return values
+
+
+def clean_cursor(model, ordering, values):
+    """
+    Convierte los valores de un cursor al tipo de cada campo de la clave de orden.
+
+    El token es opaco pero lo puede armar cualquiera: un valor de otro tipo (una
+    lista donde va un id, un null, un número fuera de rango) haría fallar la
+    consulta. Se trata igual que un token mal formado.
+
+    Returns:
+        list: Los valores convertidos, o None si alguno no es válido para su campo.
+    """
+    if values is None:
+        return None
+
+    cleaned = []
+    for name, value in zip(ordering, values):
+        field = model._meta.get_field(name)
+        if value is None:
+            return None
+        try:
+            value = field.to_python(value)
+            field.run_validators(value)
+        except ValidationError:
+            return None
+        cleaned.append(value)
+    return cleaned
+
+
+def get_page_size(request):
+    """Obtiene el tamaño de página desde ?page_size= acotado a MAX_PAGE_SIZE."""
+    default = settings.REPOSITORY_PAGE_SIZE
+    try:
+        size = int(request.GET.get("page_size", default))
+    except ValueError:
+        size = default
+
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_filter(ordering, values, lookup):
+    """
+    Construye la condición de keyset para una clave de orden compuesta.
+
+    Para ordering=("name", "id") y lookup="gt" genera
+    name > v0 OR (name = v0 AND id > v1), que la base resuelve
+    recorriendo el índice sin OFFSET.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        clause = Q(**{f"{field}__{lookup}": values[position]})
+        for previous, value in zip(ordering[:position], values):
+            clause &= Q(**{previous: value})
+        condition |= clause
+
+    return condition
+
+
+class KeysetPage:
+    """Una página de resultados obtenida por cursor.
+
+    Attributes:
+        items (list): Las filas de la página.
+        has_next (bool): Si existen filas posteriores a la página.
+        has_previous (bool): Si existen filas anteriores a la página.
+        next_cursor (str): Token para pedir la página siguiente (?after=).
+        previous_cursor (str): Token para pedir la página anterior (?before=).
+    """
+
+    def __init__(self, items, ordering, has_next, has_previous, query):
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = None
+        self.previous_cursor = None
+        self._query = query
+
+        if items and has_next:
+            self.next_cursor = encode_cursor(_key(items[-1], ordering))
+        if items and has_previous:
+            self.previous_cursor = encode_cursor(_key(items[0], ordering))
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _url(self, param, cursor):
+        query = self._query.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query[param] = cursor
+        return "?" + query.urlencode()
+
+    @property
+    def next_url(self):
+        """URL relativa de la página siguiente, conservando los demás parámetros."""
+        if self.next_cursor is None:
+            return None
+        return self._url("after", self.next_cursor)
+
+    @property
+    def previous_url(self):
+        """URL relativa de la página anterior, conservando los demás parámetros."""
+        if self.previous_cursor is None:
+            return None
+        return self._url("before", self.previous_cursor)
+
+
+def _key(item, ordering):
+    if isinstance(item, dict):
+        return [item[field] for field in ordering]
+    return [getattr(item, field) for field in ordering]
+
+
+def _page_query(queryset, request, ordering):
+    # La consulta de la página pedida: (queryset, tamaño, cursor ?after=, hacia atrás)
+    size = get_page_size(request)
+    after = request.GET.get("after")
+    before = request.GET.get("before")
+
+    after_values = decode_cursor(after, len(ordering)) if after else None
+    before_values = decode_cursor(before, len(ordering)) if before else None
+    after_values = clean_cursor(queryset.model, ordering, after_values)
+    before_values = clean_cursor(queryset.model, ordering, before_values)
+
+    if before_values is not None and after_values is None:
+        queryset = queryset.filter(keyset_filter(ordering, before_values, "lt"))
+        queryset = queryset.order_by(*[f"-{field}" for field in ordering])[: size + 1]
+        return queryset, size, after_values, True
+
+    if after_values is not None:
+        queryset = queryset.filter(keyset_filter(ordering, after_values, "gt"))
+
+    return queryset.order_by(*ordering)[: size + 1], size, after_values, False
+
+
+def _build_page(rows, request, ordering, size, after_values, backwards):
+    if backwards:
+        has_previous = len(rows) > size
+        items = list(reversed(rows[:size]))
+        return KeysetPage(items, ordering, True, has_previous, request.GET)
+
+    has_next = len(rows) > size
+    return KeysetPage(
+        rows[:size], ordering, has_next, after_values is not None, request.GET,
+    )
+
+
+def paginate(queryset, request, ordering=("id",)):
+    """
+    Pagina un queryset por cursor usando ?after= / ?before= y ?page_size=.
+
+    El costo de cada página es constante: se filtra por la clave de orden y se
+    piden page_size + 1 filas para saber si hay más, sin OFFSET ni COUNT(*).
+
+    Args:
+        queryset (QuerySet): El queryset a paginar.
+        request (HttpRequest): La solicitud HTTP con los parámetros del cursor.
+        ordering (tuple): Campos ascendentes que forman una clave única y estable.
+
+    Returns:
+        KeysetPage: La página de resultados.
+    """
+    ordering = tuple(ordering)
+    query, *state = _page_query(queryset, request, ordering)
+    return _build_page(list(query), request, ordering, *state)
+
+
+async def apaginate(queryset, request, ordering=("id",)):
+    """Versión asíncrona de paginate para las vistas async (ver app/async_views.py)."""
+    ordering = tuple(ordering)
+    query, *state = _page_query(queryset, request, ordering)
+    return _build_page([row async for row in query], request, ordering, *state)
@@ -0,0 +1,158 @@
+import re
+
+from django.db import connection, connections, transaction
+from django.db.models import Q
+
+from .models import Client, Medi
+
+# Tabla FTS5 y columnas indexadas por modelo (ver migración 0006_fulltext_search)
+FTS_INDEXES = {
+    Medi: ("app_medi_fts", ("name", "description")),
+    Client: ("app_client_fts", ("name", "address")),
+}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_available():
+    """Indica si la base de datos actual tiene las tablas FTS5."""
+    return connection.vendor == "sqlite"
+
+
+def ensure_triggers(using="default", **kwargs):
+    """
+    Crea los triggers de sincronización de las tablas FTS5 si faltan.
+
+    SQLite reconstruye la tabla en muchas migraciones (por ejemplo al agregar
+    una columna) y al hacerlo se pierden sus triggers, así que se vuelven a
+    crear después de cada migrate. El contenido indexado no se pierde porque
+    los ids se conservan.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for model, (fts_table, columns) in FTS_INDEXES.items():
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [fts_table],
+            )
+            if cursor.fetchone() is None:
+                continue
+
+            table = model._meta.db_table
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+                f"END",
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {fts_table} WHERE rowid = old.id; "
+                f"END",
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+                f"DELETE FROM {fts_table} WHERE rowid = old.id; "
+                f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+                f"END",
+            )
+
+
+def build_match_query(text):
+    """
+    Convierte el texto ingresado en una consulta MATCH segura.
+
+    Cada palabra se cita para que los operadores de FTS5 escritos por el usuario
+    no provoquen errores de sintaxis y se busca como prefijo ("amoxi" encuentra
+    "amoxicilina"). Todas las palabras deben aparecer.
+    """
+    tokens = TOKEN_RE.findall(text)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def ranked_search(model, text, limit=20):
+    """
+    Busca instancias de model por texto completo ordenadas por relevancia (bm25).
+
+    Args:
+        model (Model): Medi o Client.
+        text (str): El texto a buscar.
+        limit (int): Cantidad máxima de resultados.
+
+    Returns:
+        list: Las instancias encontradas, de la más a la menos relevante.
+    """
+    match = build_match_query(text)
+    if match == "":
+        return []
+
+    fts_table, columns = FTS_INDEXES[model]
+
+    if not fts_available():
+        condition = Q()
+        for column in columns:
+            condition |= Q(**{f"{column}__icontains": text})
+        return list(model.objects.filter(condition)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s "
+            f"ORDER BY rank LIMIT %s",
+            [match, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    found = model.objects.in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
+
+
+def rebuild_index(model, chunk_size=1000):
+    """
+    Reconstruye el índice FTS5 de model por bloques de ids.
+
+    Cada bloque se reemplaza en su propia transacción corta, así la base sigue
+    aceptando escrituras entre bloques. Las filas creadas durante la
+    reconstrucción ya las indexan los triggers.
+
+    Yields:
+        int: El último id procesado en cada bloque.
+    """
+    fts_table, columns = FTS_INDEXES[model]
+    table = model._meta.db_table
+    column_list = ", ".join(columns)
+
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size],
+        )
+        if not ids:
+            break
+
+        low, high = last_id + 1, ids[-1]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {fts_table} WHERE rowid BETWEEN %s AND %s", [low, high],
+            )
+            cursor.execute(
+                f"INSERT INTO {fts_table}(rowid, {column_list}) "
+                f"SELECT id, {column_list} FROM {table} WHERE id BETWEEN %s AND %s",
+                [low, high],
+            )
+
+        last_id = high
+        yield last_id
+
+    # Las filas del índice sin fila de origen más allá del último bloque
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {fts_table} WHERE rowid > %s "
+            f"AND rowid NOT IN (SELECT id FROM {table} WHERE id > %s)",
+            [last_id, last_id],
+        )
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .autocomplete import ENTITIES, index_deleted, index_saved
+from .cache import bump_version
+from .counters import COUNTED, count_deleted, count_saved
+from .models import Client, Medi, Product, Provider, Vet
+
+CACHED_MODELS = (Client, Product, Vet, Medi, Provider)
+
+
+def invalidate_pages(sender, **kwargs):
+    """
+    Sube la versión de la tabla que cambió para invalidar sus páginas.
+
+    La versión se sube al confirmarse la transacción: si subiera antes, otra
+    solicitud podría leer la versión nueva con las filas viejas y cachear esa
+    página (o su ETag) bajo la clave nueva. Si la transacción se deshace la
+    versión no cambia.
+    """
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def connect():
+    """Conecta las señales de invalidación, del índice de autocompletado y de los contadores."""
+    for model in CACHED_MODELS:
+        post_save.connect(
+            invalidate_pages, sender=model, dispatch_uid=f"pages-save-{model.__name__}",
+        )
+        post_delete.connect(
+            invalidate_pages, sender=model, dispatch_uid=f"pages-delete-{model.__name__}",
+        )
+
+    # Después de invalidate_pages: al confirmar, la versión se sube antes de
+    # que el índice la lea
+    for model in ENTITIES.values():
+        post_save.connect(
+            index_saved, sender=model, dispatch_uid=f"autocomplete-save-{model.__name__}",
+        )
+        post_delete.connect(
+            index_deleted, sender=model, dispatch_uid=f"autocomplete-delete-{model.__name__}",
+        )
+
+    for model in COUNTED:
+        post_save.connect(
+            count_saved, sender=model, dispatch_uid=f"counters-save-{model.__name__}",
+        )
+        post_delete.connect(
+            count_deleted, sender=model, dispatch_uid=f"counters-delete-{model.__name__}",
+        )
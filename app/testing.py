@@ -0,0 +1,145 @@
+"""
+Presupuestos de consultas y de tiempo por ruta para las pruebas de integración.
+
+Cada nombre de URL de app/urls.py declara cuántas consultas SQL y cuántos
+milisegundos puede usar una solicitud. QueryBudgetMixin agrega a un TestCase
+la aserción assertWithinBudget, que además detecta consultas repetidas dentro
+de una misma solicitud (el patrón N+1).
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import connection
+
+# url_name: (máximo de consultas, máximo de milisegundos)
+# Las ediciones hacen SELECT + UPDATE; si no cambia ningún campo no hay UPDATE, así
+# que la prueba de escrituras cambia al menos un campo en cada una.
+# Los borrados hacen SELECT + DELETE: post_delete necesita las instancias borradas.
+# Altas y borrados suman el UPDATE de los contadores del tablero, más un INSERT
+# la primera vez que aparece una especialidad (ver app/counters.py). Un tipo de
+# producto nuevo suma su SELECT + INSERT en ProductType.
+# home y products_repo cuentan las facetas por tipo si no están en la caché;
+# vets_repo lee las cantidades por especialidad de los contadores.
+QUERY_BUDGETS = {
+    "home": (2, 500),
+    "search": (4, 500),
+    "db_diagnostics": (6, 500),
+    "metrics": (1, 500),
+    "api_batch": (10, 1000),
+    "api_collection": (4, 500),
+    "api_item": (3, 500),
+    "autocomplete": (1, 100),
+    "clients_repo": (1, 500),
+    "clients_form": (2, 500),
+    "clients_edit": (1, 500),
+    "clients_delete": (3, 500),
+    "clients_import": (0, 500),
+    "clients_export": (1, 500),
+    "clients_duplicates": (1, 500),
+    "clients_merge": (6, 500),
+    "vets_repo": (2, 500),
+    "vets_form": (4, 500),
+    "vets_edit": (1, 500),
+    "vets_delete": (3, 500),
+    "vets_export": (1, 500),
+    "medi_repo": (1, 500),
+    "medi_form": (2, 500),
+    "medi_edit": (1, 500),
+    "medi_delete": (3, 500),
+    "medi_export": (1, 500),
+    "products_repo": (2, 500),
+    "products_form": (4, 500),
+    "products_edit": (1, 500),
+    "products_delete": (3, 500),
+    "products_import": (0, 500),
+    "products_export": (1, 500),
+    "provider_repo": (1, 500),
+    "provider_form": (2, 500),
+    "provider_edit": (1, 500),
+    "provider_delete": (3, 500),
+    "provider_export": (1, 500),
+}
+
+# Veces que puede repetirse una misma consulta (mismo SQL, distintos parámetros)
+# dentro de una solicitud antes de considerarla un N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+_SAVEPOINT_RE = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.I)
+
+
+class QueryLog:
+    """Consultas ejecutadas durante un bloque, capturadas con execute_wrapper.
+
+    Attributes:
+        queries (list): Pares (sql, parámetros) en orden de ejecución.
+        elapsed_ms (float): Duración del bloque en milisegundos.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.elapsed_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not _SAVEPOINT_RE.match(sql):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def duplicates(self):
+        """Consultas idénticas (mismo SQL y mismos parámetros) ejecutadas más de una vez."""
+        counts = Counter((sql, repr(params)) for sql, params in self.queries)
+        return [sql for (sql, _), count in counts.items() if count > 1]
+
+    def n_plus_one(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """Consultas con el mismo SQL repetidas al menos threshold veces."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return [sql for sql, count in counts.items() if count >= threshold]
+
+
+@contextmanager
+def capture_queries():
+    """Captura las consultas y el tiempo del bloque en un QueryLog."""
+    log = QueryLog()
+    start = time.perf_counter()
+    with connection.execute_wrapper(log):
+        yield log
+    log.elapsed_ms = (time.perf_counter() - start) * 1000
+
+
+class QueryBudgetMixin:
+    """Aserciones de presupuesto de consultas y tiempo para un TestCase."""
+
+    @contextmanager
+    def assertWithinBudget(self, url_name):
+        """
+        Falla si el bloque supera el presupuesto de url_name o repite consultas.
+
+        Uso:
+            with self.assertWithinBudget("clients_repo"):
+                self.client.get(reverse("clients_repo"))
+        """
+        if url_name not in QUERY_BUDGETS:
+            self.fail(f"La ruta {url_name} no tiene presupuesto en QUERY_BUDGETS")
+
+        max_queries, max_ms = QUERY_BUDGETS[url_name]
+        with capture_queries() as log:
+            yield log
+
+        listing = "\n".join(sql for sql, _ in log.queries)
+        self.assertLessEqual(
+            len(log),
+            max_queries,
+            f"{url_name} ejecutó {len(log)} consultas (presupuesto {max_queries}):\n{listing}",
+        )
+        self.assertLessEqual(
+            log.elapsed_ms,
+            max_ms,
+            f"{url_name} tardó {log.elapsed_ms:.1f} ms (presupuesto {max_ms} ms)",
+        )
+        self.assertEqual(log.duplicates(), [], f"{url_name} repite consultas idénticas")
+        self.assertEqual(log.n_plus_one(), [], f"{url_name} tiene un patrón N+1")
@@ -1,7 +1,32 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.http import Http404, HttpResponse
+from django.test import AsyncRequestFactory, TestCase, override_settings
 
-from app.models import Client, Medi, Product, Provider, Vet
+from app import async_views
+from app.autocomplete import reset_indexes
+from app.cache import CSRF_PLACEHOLDER, get_cache, get_version
+from app.counters import dashboard
+from app.facets import product_type_facets
+from app.imports import ENCODING_ERROR
+from app.middleware import RequestTimingMiddleware
+from app.models import Client, DuplicateCandidate, Medi, Product, ProductType, Provider, Vet
+from app.pagination import encode_cursor
+from app.testing import QUERY_BUDGETS, QueryBudgetMixin, capture_queries
+from app.urls import urlpatterns
+from app.writer import run_write
+
+
+def product_type(name):
+    return ProductType.objects.get_or_create(name=name)[0]
 
 
 class HomePageTest(TestCase):
@@ -283,6 +308,33 @@ class MedicineTest(TestCase):
 
 class VetsTest(TestCase):
     """Pruebas para el manejo de veterinarios."""
+    def test_empty_specialty_is_a_validation_error(self):
+        """Verifica que el formulario y el lote rechacen una especialidad vacía sin error 500."""
+        vet = {"name": "Mariano Navone", "phone": "2219870789", "email": "lanavoneta@gmail.com"}
+
+        response = self.client.post(reverse("vets_form"), data={**vet, "specialty": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Por favor seleccione una especialidad válida")
+
+        response = self.client.post(reverse("api_batch"), {"operations": [
+            {"op": "create", "entity": "vets", "data": {**vet, "specialty": ""}},
+        ]}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("specialty", response.json()["results"][0]["errors"])
+        self.assertFalse(Vet.objects.exists())
+
+    def test_edit_with_invalid_specialty_keeps_the_current_one(self):
+        """Verifica que editar con una especialidad que no es una opción no falle."""
+        vet = Vet.objects.create(
+            name="Ana", email="ana@vetsoft.com", phone="221", specialty=Vet.VetSpecialties.NUTRICION,
+        )
+
+        response = self.client.post(reverse("vets_form"), data={"id": vet.id, "specialty": ""})
+
+        self.assertEqual(response.status_code, 302)
+        vet.refresh_from_db()
+        self.assertEqual(vet.specialty, Vet.VetSpecialties.NUTRICION)
+
     def test_vet_table_shows_specialty(self):
         """Verifica si la tabla de veterinarios muestra correctamente la especialidad."""
         self.client.post(
@@ -335,7 +387,7 @@ class ProductsTest(TestCase):
         self.assertEqual(len(products), 1)
 
         self.assertEqual(products[0].name, "Producto 1")
-        self.assertEqual(products[0].type, "Alimento")
+        self.assertEqual(products[0].type.name, "Alimento")
         self.assertEqual(products[0].price, 100)
 
         self.assertRedirects(response, reverse("products_repo"))
@@ -402,7 +454,7 @@ class ProductsTest(TestCase):
         """Verifica si se puede editar un producto con datos válidos."""
         product = Product.objects.create(
             name="Producto 1",
-            type= "Alimento",
+            type=product_type("Alimento"),
             price= 100,
         )
 
@@ -426,9 +478,9 @@ class ProductsTest(TestCase):
     def test_display_all_products(self):
         """Verifica si se muestran todos los productos en la página de repositorio de productos."""
         # Crear varios productos
-        Product.objects.create(name="Producto 1", type="Alimento", price=100.0)
-        Product.objects.create(name="Producto 2", type="Medicamento", price=200.0)
-        Product.objects.create(name="Producto 3", type="Juguete", price=50.0)
+        Product.objects.create(name="Producto 1", type=product_type("Alimento"), price=100.0)
+        Product.objects.create(name="Producto 2", type=product_type("Medicamento"), price=200.0)
+        Product.objects.create(name="Producto 3", type=product_type("Juguete"), price=50.0)
 
         response = self.client.get(reverse("products_repo"))
         self.assertEqual(response.status_code, 200)
@@ -439,6 +491,57 @@ class ProductsTest(TestCase):
         self.assertContains(response, "Producto 2")
         self.assertContains(response, "Producto 3")
 
+@override_settings(PAGE_CACHE_ENABLED=True)
+class ProductTypeFacetsTest(QueryBudgetMixin, TestCase):
+    """Pruebas para el filtro facetado por tipo del repositorio de productos."""
+    def setUp(self):
+        get_cache().clear()
+        Product.objects.create(name="Balanceado", type=product_type("Alimento"), price=100)
+        Product.objects.create(name="Premium", type=product_type("Alimento"), price=500)
+        Product.objects.create(name="Collar", type=product_type("Accesorio"), price=150)
+
+    def test_repository_shows_counts_and_filters_by_type(self):
+        """Verifica que se muestre la cantidad por tipo y que el filtro use el tipo elegido."""
+        with self.assertWithinBudget("products_repo"):
+            response = self.client.get(reverse("products_repo"), {"type": "Accesorio"})
+
+        self.assertEqual(response.context["type_facets"], [("Alimento", 2), ("Accesorio", 1)])
+        self.assertEqual([product.name for product in response.context["products"]], ["Collar"])
+        self.assertContains(response, "?type=Accesorio")
+
+    def test_facet_counts_are_cached_until_a_product_changes(self):
+        """Verifica que las facetas se sirvan de la caché y se recalculen al escribir."""
+        self.assertEqual(product_type_facets(), [("Alimento", 2), ("Accesorio", 1)])
+        with self.assertNumQueries(0):
+            product_type_facets()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.filter(name="Collar").get().delete()
+        self.assertEqual(product_type_facets(), [("Alimento", 2)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name="Pelota", type=product_type("Juguete"), price=50)
+        self.assertEqual(product_type_facets(), [("Alimento", 2), ("Juguete", 1)])
+
+    def test_api_reads_and_writes_the_type_by_name(self):
+        """Verifica que la API y los lotes acepten y devuelvan el tipo por su nombre."""
+        collar = Product.objects.get(name="Collar")
+        response = self.client.get(reverse("api_item", kwargs={"entity": "products", "id": collar.pk}))
+        self.assertEqual(response.json()["type"], "Accesorio")
+
+        response = self.client.post(reverse("api_batch"), {"operations": [
+            {"op": "create", "entity": "products", "data": {"name": "Pelota", "type": "Juguete", "price": 50}},
+            {"op": "update", "entity": "products", "id": collar.pk, "data": {"type": "Juguete"}},
+        ]}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(Product.objects.filter(type__name="Juguete").values_list("name", flat=True)),
+            ["Collar", "Pelota"],
+        )
+        self.assertEqual(ProductType.objects.filter(name="Juguete").count(), 1)
+
+
 class ProviderIntegrationTest(TestCase):
     """Verifica si se puede editar un producto con datos válidos."""
     def test_can_create_provider(self):
@@ -498,3 +601,1182 @@ class ProviderIntegrationTest(TestCase):
         self.assertEqual(editedProvider.name, "Nuevo Proveedor")
         self.assertEqual(editedProvider.email, provider.email)
         self.assertEqual(editedProvider.address, provider.address)
+
+
+class RepositoryPaginationTest(TestCase):
+    """Pruebas para la paginación por cursor de los repositorios."""
+    def setUp(self):
+        for number in range(5):
+            Provider.objects.create(
+                name=f"Proveedor {number}",
+                email=f"proveedor{number}@ejemplo.com",
+                address="Calle Falsa 123",
+            )
+
+    def test_first_page_is_limited_by_page_size(self):
+        """Verifica que la primera página respete ?page_size= y ofrezca la siguiente."""
+        response = self.client.get(reverse("provider_repo"), {"page_size": 2})
+        page = response.context["page"]
+
+        self.assertEqual([p.name for p in page], ["Proveedor 0", "Proveedor 1"])
+        self.assertTrue(page.has_next)
+        self.assertFalse(page.has_previous)
+
+    def test_can_walk_forward_and_back_with_cursors(self):
+        """Verifica que ?after= y ?before= recorran las páginas sin saltear filas."""
+        first = self.client.get(reverse("provider_repo"), {"page_size": 2}).context["page"]
+        second = self.client.get(
+            reverse("provider_repo"), {"page_size": 2, "after": first.next_cursor},
+        ).context["page"]
+        self.assertEqual([p.name for p in second], ["Proveedor 2", "Proveedor 3"])
+        self.assertTrue(second.has_previous)
+
+        back = self.client.get(
+            reverse("provider_repo"),
+            {"page_size": 2, "before": second.previous_cursor},
+        ).context["page"]
+        self.assertEqual([p.name for p in back], ["Proveedor 0", "Proveedor 1"])
+        self.assertFalse(back.has_previous)
+
+    def test_last_page_has_no_next(self):
+        """Verifica que la última página no ofrezca una página siguiente."""
+        first = self.client.get(reverse("provider_repo"), {"page_size": 4}).context["page"]
+        last = self.client.get(
+            reverse("provider_repo"), {"page_size": 4, "after": first.next_cursor},
+        ).context["page"]
+
+        self.assertEqual([p.name for p in last], ["Proveedor 4"])
+        self.assertFalse(last.has_next)
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Verifica que un cursor inválido no rompa la página."""
+        response = self.client.get(reverse("provider_repo"), {"after": "no-es-un-cursor"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page"]), 5)
+
+    def test_cursor_with_values_of_the_wrong_type_is_ignored(self):
+        """Verifica que un cursor armado a mano con valores de otro tipo no llegue al ORM."""
+        cursors = [
+            ({}, [[1]]),
+            ({}, [None]),
+            ({}, [10 ** 30]),
+            ({"sort": "name"}, [{"a": 1}, "x"]),
+        ]
+        for params, values in cursors:
+            with self.subTest(values=values):
+                for param in ["after", "before"]:
+                    response = self.client.get(
+                        reverse("provider_repo"), {**params, param: encode_cursor(values)},
+                    )
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(len(response.context["page"]), 5)
+                response = self.client.get(
+                    reverse("api_collection", kwargs={"entity": "providers"}),
+                    {"after": encode_cursor(values)},
+                )
+                self.assertEqual(response.status_code, 200)
+
+
+class RepositorySearchTest(QueryBudgetMixin, TestCase):
+    """Pruebas para la búsqueda y los filtros de los repositorios."""
+    def test_search_clients_by_name_prefix_phone_and_email(self):
+        """Verifica que ?q= encuentre clientes por nombre, teléfono o email."""
+        Client.objects.create(
+            name="Juan Perez", phone=54221555232, email="juan@vetsoft.com", address="",
+        )
+        Client.objects.create(
+            name="Maria Lopez", phone=54221000000, email="maria@vetsoft.com", address="",
+        )
+
+        for q in ["Juan", "54221555232", "juan@vetsoft.com"]:
+            response = self.client.get(reverse("clients_repo"), {"q": q})
+            self.assertEqual([c.name for c in response.context["clients"]], ["Juan Perez"])
+
+    def test_filter_products_by_type_and_price_range(self):
+        """Verifica el filtro de productos por tipo y rango de precio."""
+        Product.objects.create(name="Balanceado", type=product_type("Alimento"), price=100)
+        Product.objects.create(name="Premium", type=product_type("Alimento"), price=500)
+        Product.objects.create(name="Collar", type=product_type("Accesorio"), price=150)
+
+        response = self.client.get(
+            reverse("products_repo"),
+            {"type": "Alimento", "min_price": "50", "max_price": "200"},
+        )
+        self.assertEqual([p.name for p in response.context["products"]], ["Balanceado"])
+
+    def test_filter_vets_by_specialty(self):
+        """Verifica el filtro de veterinarios por especialidad."""
+        Vet.objects.create(
+            name="Ana", email="ana@vetsoft.com", phone="221",
+            specialty=Vet.VetSpecialties.ONCOLOGIA,
+        )
+        Vet.objects.create(name="Luis", email="luis@vetsoft.com", phone="221")
+
+        response = self.client.get(
+            reverse("vets_repo"), {"specialty": Vet.VetSpecialties.ONCOLOGIA},
+        )
+        self.assertEqual([v.name for v in response.context["vets"]], ["Ana"])
+
+    def test_vets_by_specialty_filter_shows_counts(self):
+        """Verifica las cantidades por especialidad y que una especialidad inválida no devuelva filas."""
+        Vet.objects.create(
+            name="Ana", email="ana@vetsoft.com", phone="221",
+            specialty=Vet.VetSpecialties.NEUROLOGIA,
+        )
+        Vet.objects.create(name="Luis", email="luis@vetsoft.com", phone="221")
+
+        with self.assertWithinBudget("vets_repo"):
+            response = self.client.get(reverse("vets_repo"), {"specialty": "neurologia"})
+
+        self.assertEqual([v.name for v in response.context["vets"]], ["Ana"])
+        self.assertContains(response, "Neurología (1)")
+        self.assertContains(response, "Sin especialidad (1)")
+
+        response = self.client.get(reverse("vets_repo"), {"specialty": "Dermatología"})
+        self.assertEqual(list(response.context["vets"]), [])
+
+    def test_search_providers_by_name(self):
+        """Verifica la búsqueda de proveedores por nombre."""
+        Provider.objects.create(name="Distribuidora Sur", email="sur@ejemplo.com")
+        Provider.objects.create(name="Norte SA", email="norte@ejemplo.com")
+
+        response = self.client.get(reverse("provider_repo"), {"q": "Norte"})
+        self.assertEqual([p.name for p in response.context["provider"]], ["Norte SA"])
+
+
+class FullTextSearchTest(TestCase):
+    """Pruebas para la búsqueda de texto completo de medicinas y clientes."""
+    def test_search_medicine_by_description(self):
+        """Verifica que se encuentre una medicina por una palabra de su descripción."""
+        Medi.objects.create(name="Amoxicilina", description="Antibiótico para infecciones", dose=5)
+        Medi.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=2)
+
+        response = self.client.get(reverse("search"), {"q": "infecciones"})
+
+        self.assertTemplateUsed(response, "search/results.html")
+        self.assertEqual([m.name for m in response.context["medis"]], ["Amoxicilina"])
+
+    def test_search_ignores_accents_and_matches_prefixes(self):
+        """Verifica que la búsqueda ignore acentos y acepte prefijos."""
+        Medi.objects.create(name="Amoxicilina", description="Antibiótico", dose=5)
+
+        response = self.client.get(reverse("search"), {"q": "antibio"})
+
+        self.assertEqual([m.name for m in response.context["medis"]], ["Amoxicilina"])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Verifica que el índice se mantenga sincronizado con los cambios."""
+        client = Client.objects.create(
+            name="Juan Perez", phone=54221555232, email="juan@vetsoft.com", address="Calle 13",
+        )
+        client.address = "Avenida 7"
+        client.save()
+
+        response = self.client.get(reverse("search"), {"q": "Avenida"})
+        self.assertEqual([c.name for c in response.context["clients"]], ["Juan Perez"])
+
+        client.delete()
+        response = self.client.get(reverse("search"), {"q": "Avenida"})
+        self.assertEqual(response.context["clients"], [])
+
+    def test_search_with_fts_operators_does_not_fail(self):
+        """Verifica que los caracteres especiales de FTS5 no provoquen errores."""
+        response = self.client.get(reverse("search"), {"q": 'amoxi" OR (*'})
+        self.assertEqual(response.status_code, 200)
+
+
+class ExportTest(TestCase):
+    """Pruebas para la exportación de entidades en CSV y NDJSON."""
+    def setUp(self):
+        Product.objects.create(name="Balanceado", type=product_type("Alimento"), price=100)
+        Product.objects.create(name="Collar", type=product_type("Accesorio"), price=150)
+
+    def test_export_products_as_csv(self):
+        """Verifica que la exportación CSV sea un stream con encabezado y filas."""
+        response = self.client.get(reverse("products_export", kwargs={"format": "csv"}))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = b"".join(response).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,type,price")
+        self.assertEqual(len(lines), 3)
+        self.assertIn("Balanceado,Alimento,100.0", lines[1])
+
+    def test_export_products_as_ndjson_with_filters(self):
+        """Verifica que NDJSON respete los filtros del repositorio."""
+        response = self.client.get(
+            reverse("products_export", kwargs={"format": "ndjson"}), {"type": "Accesorio"},
+        )
+
+        lines = b"".join(response).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["name"], "Collar")
+
+    def test_export_unknown_format_returns_404(self):
+        """Verifica que un formato desconocido devuelva 404."""
+        response = self.client.get(reverse("clients_export", kwargs={"format": "xls"}))
+        self.assertEqual(response.status_code, 404)
+
+
+class ImportTest(TestCase):
+    """Pruebas para la importación masiva desde CSV."""
+    def test_import_clients_creates_valid_rows_and_reports_errors(self):
+        """Verifica que se creen las filas válidas y se informen las inválidas por línea."""
+        content = (
+            "name,phone,email,address\n"
+            "Juan Perez,54221555232,juan@vetsoft.com,13 y 44\n"
+            "Maria Lopez,221000000,maria@vetsoft.com,\n"
+            "Ana Gomez,54221000001,ana@vetsoft.com,\n"
+        )
+        upload = SimpleUploadedFile("clientes.csv", content.encode(), content_type="text/csv")
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        report = response.context["report"]
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.errors, [(3, {"phone": "El teléfono debe comenzar con 54"})])
+        self.assertEqual(
+            sorted(Client.objects.values_list("name", flat=True)), ["Ana Gomez", "Juan Perez"],
+        )
+
+    def test_import_goes_through_the_single_writer(self):
+        """Verifica que cada bloque se inserte a través de run_write."""
+        content = "name,type,price\nCollar,Accesorio,10\nCorrea,Accesorio,12\nPipeta,Salud,8\n"
+        upload = SimpleUploadedFile("productos.csv", content.encode(), content_type="text/csv")
+
+        with mock.patch("app.imports.run_write", wraps=run_write) as write:
+            self.client.post(reverse("products_import"), {"file": upload})
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(Product.objects.count(), 3)
+
+    def test_import_of_a_file_that_is_not_utf8_reports_an_error(self):
+        """Verifica que un CSV en Latin-1 se informe como error en lugar de fallar con 500."""
+        content = "name,phone,email,address\nJuan Muñoz,54221555232,juan@vetsoft.com,\n"
+        upload = SimpleUploadedFile("clientes.csv", content.encode("latin-1"), content_type="text/csv")
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["report"].errors, [(2, {"file": ENCODING_ERROR})])
+        self.assertContains(response, "no está codificado en UTF-8")
+        self.assertEqual(Client.objects.count(), 0)
+
+    def test_import_without_file_shows_error(self):
+        """Verifica que se pida un archivo cuando no se envía ninguno."""
+        response = self.client.post(reverse("products_import"))
+        self.assertContains(response, "Por favor seleccione un archivo")
+
+    def test_import_products_command(self):
+        """Verifica el comando import_products en bloques pequeños."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,type,price\n")
+            for number in range(5):
+                file.write(f"Producto {number},Alimento,{number + 1}\n")
+            file.write("Sin precio,Alimento,\n")
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_products", file.name, batch_size=2, stdout=stdout, stderr=stderr)
+        os.remove(file.name)
+
+        self.assertEqual(Product.objects.count(), 5)
+        self.assertIn("5 filas importadas, 1 rechazadas", stdout.getvalue())
+        self.assertIn("Línea 7", stderr.getvalue())
+
+
+class DbDiagnosticsTest(TestCase):
+    """Pruebas para la vista de diagnóstico de la base de datos."""
+    def test_diagnostics_shows_configured_and_active_pragmas(self):
+        """Verifica que la vista informe los pragmas configurados y vigentes."""
+        response = self.client.get(reverse("db_diagnostics"))
+        data = response.json()
+
+        self.assertEqual(data["vendor"], "sqlite")
+        self.assertEqual(data["configured"]["journal_mode"], "WAL")
+        self.assertIn("synchronous", data["active"])
+
+
+class RequestTimingTest(TestCase):
+    """Pruebas para la medición de consultas y tiempos por solicitud."""
+    def test_response_has_server_timing_header(self):
+        """Verifica el header Server-Timing con consultas, vista y templates."""
+        Provider.objects.create(name="Proveedor", email="p@ejemplo.com")
+
+        response = self.client.get(reverse("provider_repo"))
+
+        header = response["Server-Timing"]
+        self.assertIn('desc="1 queries"', header)
+        for metric in ["db;dur=", "view;dur=", "tpl;dur=", "total;dur="]:
+            self.assertIn(metric, header)
+
+    def test_writes_structured_log_line(self):
+        """Verifica la línea de log JSON con el nombre de la URL."""
+        with self.assertLogs("app.requests", level="INFO") as logs:
+            self.client.get(reverse("home"))
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry["url_name"], "home")
+        self.assertEqual(entry["status"], 200)
+        self.assertEqual(entry["queries"], 2)
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled_middleware_adds_nothing(self):
+        """Verifica que con la medición desactivada no se agregue el header."""
+        response = self.client.get(reverse("home"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class MetricsTest(TestCase):
+    """Pruebas para el endpoint de métricas en formato Prometheus."""
+    def test_metrics_include_requests_by_url_name(self):
+        """Verifica que las solicitudes se cuenten por nombre de URL."""
+        self.client.get(reverse("vets_repo"))
+
+        response = self.client.get(reverse("metrics"))
+        content = response.content.decode()
+
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            'vetsoft_requests_total{method="GET",status="200",url_name="vets_repo"}',
+            content,
+        )
+        self.assertIn('vetsoft_request_latency_seconds_bucket{le="0.005",url_name="vets_repo"}', content)
+        self.assertIn('vetsoft_request_queries_count{url_name="vets_repo"}', content)
+
+    def test_metrics_include_model_row_counts(self):
+        """Verifica los conteos de filas por modelo."""
+        Medi.objects.create(name="Amoxicilina", description="Antibiótico", dose=5)
+
+        content = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('vetsoft_model_rows{model="medi"} 1.0', content)
+        self.assertIn('vetsoft_model_rows{model="client"} 0.0', content)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Pruebas de presupuesto de consultas y tiempo para cada ruta."""
+    def setUp(self):
+        for number in range(3):
+            Client.objects.create(
+                name="Juan Perez", phone=54221555230 + number,
+                email=f"juan{number}@vetsoft.com", address="13 y 44",
+            )
+            Product.objects.create(name=f"Producto {number}", type=product_type("Alimento"), price=100)
+            Vet.objects.create(name=f"Vet {number}", email=f"v{number}@vetsoft.com", phone="221")
+            Medi.objects.create(name=f"Medicina {number}", description="Analgésico", dose=2)
+            Provider.objects.create(name=f"Proveedor {number}", email=f"p{number}@ejemplo.com")
+
+    def test_every_route_has_a_budget(self):
+        """Verifica que cada ruta de app/urls.py tenga un presupuesto declarado."""
+        names = {pattern.name for pattern in urlpatterns}
+        self.assertEqual(names - set(QUERY_BUDGETS), set())
+
+    def test_read_routes_within_budget(self):
+        """Verifica las rutas de lectura contra su presupuesto."""
+        reads = [
+            ("home", {}, {}),
+            ("search", {}, {"q": "Juan"}),
+            ("db_diagnostics", {}, {}),
+            ("metrics", {}, {}),
+            ("clients_repo", {}, {"q": "Juan"}),
+            ("clients_form", {}, {}),
+            ("clients_edit", {"id": Client.objects.first().id}, {}),
+            ("clients_import", {}, {}),
+            ("vets_repo", {}, {}),
+            ("vets_form", {}, {}),
+            ("vets_edit", {"id": Vet.objects.first().id}, {}),
+            ("medi_repo", {}, {}),
+            ("medi_form", {}, {}),
+            ("medi_edit", {"id": Medi.objects.first().id}, {}),
+            ("products_repo", {}, {"type": "Alimento"}),
+            ("products_form", {}, {}),
+            ("products_edit", {"id": Product.objects.first().id}, {}),
+            ("products_import", {}, {}),
+            ("provider_repo", {}, {}),
+            ("provider_form", {}, {}),
+            ("provider_edit", {"id": Provider.objects.first().id}, {}),
+            ("autocomplete", {"entity": "clients"}, {"prefix": "ju"}),
+        ]
+        for format, url_name in enumerate(
+            ["clients_export", "vets_export", "medi_export", "products_export", "provider_export"],
+        ):
+            reads.append((url_name, {"format": ["csv", "ndjson"][format % 2]}, {}))
+
+        for url_name, kwargs, query in reads:
+            with self.subTest(url_name=url_name), self.assertWithinBudget(url_name):
+                response = self.client.get(reverse(url_name, kwargs=kwargs), query)
+                if response.streaming:
+                    b"".join(response)
+                self.assertEqual(response.status_code, 200)
+
+    def test_write_routes_within_budget(self):
+        """Verifica los POST de alta, edición y borrado contra su presupuesto."""
+        client = Client.objects.first()
+        writes = [
+            ("clients_form", {"name": "Ana Gomez", "phone": "54221000001", "email": "ana@vetsoft.com", "address": ""}),
+            (
+                "clients_form",
+                {"id": client.id, "name": "Juan Pérez", "phone": client.phone, "email": client.email, "address": "7 y 50"},
+            ),
+            ("clients_delete", {"client_id": client.id}),
+            ("products_form", {"name": "Collar", "type": "Accesorio", "price": "10"}),
+            ("products_form", {"id": Product.objects.first().id, "price": "20"}),
+            ("products_delete", {"product_id": Product.objects.first().id}),
+            ("vets_form", {"name": "Ana", "email": "ana@vetsoft.com", "phone": "221", "specialty": "Oncología"}),
+            ("vets_form", {"id": Vet.objects.first().id, "name": "Ana"}),
+            ("vets_delete", {"vet_id": Vet.objects.first().id}),
+            ("medi_form", {"name": "Meloxicam", "description": "Antiinflamatorio", "dose": "2"}),
+            ("medi_form", {"id": Medi.objects.first().id, "dose": "3"}),
+            ("medi_delete", {"medi_id": Medi.objects.first().id}),
+            ("provider_form", {"name": "Sur", "email": "sur@ejemplo.com", "address": "Calle 1"}),
+            ("provider_form", {"id": Provider.objects.first().id, "name": "Norte"}),
+            ("provider_delete", {"prov_id": Provider.objects.first().id}),
+        ]
+        for url_name, data in writes:
+            with self.subTest(url_name=url_name, data=data):
+                with self.assertWithinBudget(url_name) as log:
+                    response = self.client.post(reverse(url_name), data)
+                self.assertEqual(response.status_code, 302)
+                # Una edición sin cambios no escribe y no mediría el UPDATE
+                if "id" in data:
+                    self.assertTrue(any(sql.startswith("UPDATE") for sql, _ in log.queries))
+
+    def test_delete_of_missing_row_returns_404(self):
+        """Verifica que borrar una fila inexistente siga devolviendo 404."""
+        response = self.client.post(reverse("clients_delete"), {"client_id": 999})
+        self.assertEqual(response.status_code, 404)
+
+    def test_n_plus_one_detector_flags_repeated_queries(self):
+        """Verifica que el detector marque consultas repetidas por fila."""
+        with capture_queries() as log:
+            for client in Client.objects.all():
+                Client.objects.get(pk=client.pk)
+
+        self.assertEqual(len(log.n_plus_one()), 1)
+        self.assertEqual(log.duplicates(), [])
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTest(TestCase):
+    """Pruebas para la caché versionada de las páginas de repositorio."""
+    def setUp(self):
+        get_cache().clear()
+        Medi.objects.create(name="Amoxicilina", description="Antibiótico", dose=5)
+
+    def test_second_request_is_served_from_cache(self):
+        """Verifica que la segunda lectura no consulte la base."""
+        first = self.client.get(reverse("medi_repo"))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse("medi_repo"))
+
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(second["X-Page-Cache"], "hit")
+        self.assertContains(second, "Amoxicilina")
+
+    def test_save_and_delete_invalidate_cached_page(self):
+        """Verifica que guardar o borrar invalide la página cacheada."""
+        self.client.get(reverse("medi_repo"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            medi = Medi.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=2)
+        response = self.client.get(reverse("medi_repo"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Meloxicam")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            medi.delete()
+        response = self.client.get(reverse("medi_repo"))
+        self.assertNotContains(response, "Meloxicam")
+
+    def test_version_changes_only_after_commit(self):
+        """Verifica que la versión de la tabla suba al confirmar y no dentro de la transacción."""
+        self.client.get(reverse("medi_repo"))
+        before = get_version(Medi)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Medi.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=2)
+                self.assertEqual(get_version(Medi), before)
+                # Quien lee antes del commit sigue viendo la página vieja
+                response = self.client.get(reverse("medi_repo"))
+                self.assertEqual(response["X-Page-Cache"], "hit")
+
+        self.assertNotEqual(get_version(Medi), before)
+        response = self.client.get(reverse("medi_repo"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Meloxicam")
+
+    def test_rolled_back_write_keeps_the_version(self):
+        """Verifica que una escritura deshecha no invalide las páginas."""
+        before = get_version(Medi)
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Medi.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=2)
+                raise RuntimeError()
+
+        self.assertEqual(get_version(Medi), before)
+
+    def test_cached_page_uses_each_users_csrf_token(self):
+        """Verifica que la página cacheada lleve el token CSRF de quien la pide."""
+        self.client.get(reverse("medi_repo"))
+        response = self.client.get(reverse("medi_repo"))
+
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+
+    def test_other_tables_do_not_invalidate(self):
+        """Verifica que cambiar otra tabla no invalide la página."""
+        self.client.get(reverse("medi_repo"))
+        Provider.objects.create(name="Sur", email="sur@ejemplo.com")
+
+        response = self.client.get(reverse("medi_repo"))
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+
+class ConditionalGetTest(TestCase):
+    """Pruebas para las respuestas 304 con ETag en listados y formularios."""
+    def setUp(self):
+        self.provider = Provider.objects.create(name="Sur", email="sur@ejemplo.com")
+
+    def test_repository_answers_304_without_rendering(self):
+        """Verifica que un ETag vigente devuelva 304 sin consultas ni templates."""
+        etag = self.client.get(reverse("provider_repo"))["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("provider_repo"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, "provider/repository.html")
+
+    def test_write_changes_the_etag(self):
+        """Verifica que una escritura en la tabla cambie el ETag."""
+        etag = self.client.get(reverse("provider_repo"))["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.update_provider({"name": "Norte"})
+
+        response = self.client.get(reverse("provider_repo"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_edit_page_has_etag_and_last_modified(self):
+        """Verifica el ETag y Last-Modified de la página de edición."""
+        url = reverse("provider_edit", kwargs={"id": self.provider.id})
+        response = self.client.get(url)
+
+        self.assertTrue(response.has_header("Last-Modified"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_updated_at_changes_on_save(self):
+        """Verifica que updated_at se actualice al guardar."""
+        before = self.provider.updated_at
+        self.provider.update_provider({"name": "Norte"})
+
+        self.assertGreater(Provider.objects.get(pk=self.provider.pk).updated_at, before)
+
+
+class ApiTest(QueryBudgetMixin, TestCase):
+    """Pruebas para la API JSON de las entidades."""
+    def setUp(self):
+        for number in range(3):
+            Provider.objects.create(
+                name=f"Proveedor {number}", email=f"p{number}@ejemplo.com", address="Calle 1",
+            )
+
+    def test_list_with_sparse_fields(self):
+        """Verifica que ?fields= devuelva solo esos campos y el id."""
+        with self.assertWithinBudget("api_collection"):
+            response = self.client.get(
+                reverse("api_collection", kwargs={"entity": "providers"}), {"fields": "name"},
+            )
+
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data["results"]), 3)
+        self.assertEqual(set(data["results"][0]), {"id", "name"})
+        self.assertNotIn(b" ", response.content.split(b'"name"')[0])
+
+    def test_unknown_field_or_entity(self):
+        """Verifica los errores por campo o entidad desconocidos."""
+        response = self.client.get(
+            reverse("api_collection", kwargs={"entity": "providers"}), {"fields": "password"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse("api_collection", kwargs={"entity": "users"}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_pagination(self):
+        """Verifica que el cursor siguiente traiga la próxima página."""
+        url = reverse("api_collection", kwargs={"entity": "providers"})
+        first = self.client.get(url, {"page_size": 2}).json()
+        second = self.client.get(url, {"page_size": 2, "after": first["next"]}).json()
+
+        self.assertEqual(len(first["results"]), 2)
+        self.assertEqual([row["name"] for row in second["results"]], ["Proveedor 2"])
+        self.assertIsNone(second["next"])
+
+    def test_list_applies_repository_filters(self):
+        """Verifica que la API use los mismos filtros que el repositorio."""
+        response = self.client.get(
+            reverse("api_collection", kwargs={"entity": "providers"}), {"q": "Proveedor 1"},
+        )
+        self.assertEqual([row["name"] for row in response.json()["results"]], ["Proveedor 1"])
+
+    def test_create_validates_and_returns_201(self):
+        """Verifica el alta por POST y sus errores de validación."""
+        url = reverse("api_collection", kwargs={"entity": "products"})
+        with self.assertWithinBudget("api_collection"):
+            response = self.client.post(
+                url, {"name": "Collar", "type": "Accesorio", "price": 10}, content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["name"], "Collar")
+        self.assertTrue(Product.objects.filter(pk=response.json()["id"]).exists())
+
+        response = self.client.post(url, {"name": "Collar"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("price", response.json()["errors"])
+
+        response = self.client.post(url, "no es json", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_values_of_the_wrong_type(self):
+        """Verifica que un valor que no es texto (ni número donde se acepta) sea un 400 por campo."""
+        response = self.client.post(
+            reverse("api_collection", kwargs={"entity": "clients"}),
+            {"name": 5, "phone": 54221555232, "email": "c@vetsoft.com", "address": "13 y 44"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"name"})
+
+        response = self.client.post(
+            reverse("api_collection", kwargs={"entity": "products"}),
+            {"name": "Collar", "type": ["x"], "price": True},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"type", "price"})
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(ProductType.objects.exists())
+
+        provider = Provider.objects.first()
+        response = self.client.patch(
+            reverse("api_item", kwargs={"entity": "providers", "id": provider.id}),
+            {"address": None}, content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("address", response.json()["errors"])
+
+        response = self.client.post(
+            reverse("api_batch"),
+            {"operations": [{"op": "create", "entity": "products", "data": {
+                "name": "Collar", "type": ["x"], "price": 10,
+            }}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("type", response.json()["results"][0]["errors"])
+        self.assertFalse(ProductType.objects.exists())
+
+    def test_patch_updates_only_sent_fields(self):
+        """Verifica que PATCH conserve los campos no enviados."""
+        provider = Provider.objects.first()
+        url = reverse("api_item", kwargs={"entity": "providers", "id": provider.id})
+        with self.assertWithinBudget("api_item"):
+            response = self.client.patch(url, {"name": "Norte"}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        provider.refresh_from_db()
+        self.assertEqual(provider.name, "Norte")
+        self.assertEqual(provider.email, "p0@ejemplo.com")
+
+        response = self.client.patch(url, {"email": "no-es-un-email"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_and_delete_item(self):
+        """Verifica la lectura y el borrado de una fila."""
+        provider = Provider.objects.first()
+        url = reverse("api_item", kwargs={"entity": "providers", "id": provider.id})
+
+        with self.assertWithinBudget("api_item"):
+            response = self.client.get(url, {"fields": "email"})
+        self.assertEqual(response.json(), {"id": provider.id, "email": "p0@ejemplo.com"})
+
+        with self.assertWithinBudget("api_item"):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+
+
+class ApiBatchTest(QueryBudgetMixin, TestCase):
+    """Pruebas para el lote de operaciones de la API."""
+    def setUp(self):
+        self.product = Product.objects.create(name="Collar", type=product_type("Accesorio"), price=10)
+        self.provider = Provider.objects.create(name="Sur", email="sur@ejemplo.com")
+
+    def post_batch(self, operations):
+        return self.client.post(
+            reverse("api_batch"), {"operations": operations}, content_type="application/json",
+        )
+
+    def test_applies_operations_across_entities(self):
+        """Verifica altas, ediciones y borrados de varias entidades en un lote."""
+        operations = [
+            {"op": "create", "entity": "clients", "data": {
+                "name": f"Cliente {letter}", "phone": f"5422155523{number}",
+                "email": f"c{number}@vetsoft.com", "address": "13 y 44",
+            }}
+            for number, letter in enumerate("abcdefghij")
+        ]
+        operations += [
+            {"op": "update", "entity": "products", "id": self.product.id, "data": {"price": 25}},
+            {"op": "delete", "entity": "providers", "id": self.provider.id},
+        ]
+
+        with self.assertWithinBudget("api_batch"):
+            response = self.post_batch(operations)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([result["status"] for result in results], [201] * 10 + [200, 204])
+        self.assertEqual(Client.objects.count(), 10)
+        self.assertTrue(Client.objects.filter(pk=results[0]["id"], name="Cliente a").exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, 25)
+        self.assertEqual(self.product.name, "Collar")
+        self.assertFalse(Provider.objects.exists())
+
+    def test_invalid_operation_rolls_back_the_batch(self):
+        """Verifica que una operación inválida impida aplicar las demás."""
+        other = Product.objects.create(name="Correa", type=product_type("Accesorio"), price=20)
+        response = self.post_batch([
+            {"op": "update", "entity": "products", "id": self.product.id, "data": {"price": 25}},
+            {"op": "update", "entity": "products", "id": other.id, "data": {"price": -1}},
+            {"op": "delete", "entity": "providers", "id": 999},
+            {"op": "truncate", "entity": "providers"},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [200, 400, 404, 400])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, 10)
+        self.assertTrue(Provider.objects.exists())
+
+    def test_same_row_twice_is_rejected(self):
+        """Verifica que dos operaciones sobre la misma fila rechacen el lote."""
+        response = self.post_batch([
+            {"op": "update", "entity": "products", "id": self.product.id, "data": {"price": 25}},
+            {"op": "update", "entity": "products", "id": self.product.id, "data": {"price": 30}},
+            {"op": "delete", "entity": "products", "id": self.product.id},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        results = response.json()["results"]
+        self.assertEqual([result["status"] for result in results], [200, 400, 400])
+        self.assertIn("id", results[1]["errors"])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, 10)
+
+    def test_unchanged_rows_are_not_written(self):
+        """Verifica que el lote no escriba filas cuyos valores no cambiaron."""
+        with capture_queries() as log:
+            response = self.post_batch([
+                {"op": "update", "entity": "products", "id": self.product.id, "data": {"price": 10}},
+            ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(sql.startswith("UPDATE") for sql, _ in log.queries))
+
+    def test_rejects_malformed_body(self):
+        """Verifica los errores por cuerpo mal formado o método incorrecto."""
+        self.assertEqual(self.post_batch({"op": "create"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("api_batch")).status_code, 405)
+
+
+class AsyncViewsTest(TestCase):
+    """Pruebas para las vistas async usadas bajo ASGI."""
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_repository_reads_with_async_orm(self):
+        """Verifica que el repositorio async liste las filas."""
+        await Provider.objects.acreate(name="Sur", email="sur@ejemplo.com")
+
+        response = await async_views.provider_repository(self.factory.get("/proveedor/"))
+
+        self.assertContains(response, "Sur")
+
+    async def test_form_creates_and_updates(self):
+        """Verifica el alta y la edición desde el formulario async."""
+        request = self.factory.post(
+            "/productos/nuevo/", {"name": "Collar", "type": "Accesorio", "price": "10"},
+        )
+        response = await async_views.products_form(request)
+        self.assertEqual(response.status_code, 302)
+
+        product = await Product.objects.aget(name="Collar")
+        request = self.factory.post("/productos/nuevo/", {"id": product.id, "price": "-1"})
+        response = await async_views.products_form(request)
+        self.assertContains(response, "Por favor ingrese un precio mayor a cero")
+
+    async def test_delete_of_missing_row_raises_404(self):
+        """Verifica el borrado async y el 404 si la fila no existe."""
+        medi = await Medi.objects.acreate(name="Amoxicilina", description="Antibiótico", dose=5)
+
+        response = await async_views.medis_delete(self.factory.post("/", {"medi_id": medi.id}))
+        self.assertEqual(response.status_code, 302)
+        with self.assertRaises(Http404):
+            await async_views.medis_delete(self.factory.post("/", {"medi_id": medi.id}))
+
+    async def test_export_streams_with_an_async_iterator(self):
+        """Verifica que la exportación async no junte el archivo en memoria bajo ASGI."""
+        tipo = await ProductType.objects.acreate(name="Alimento")
+        await Product.objects.acreate(name="Balanceado", type=tipo, price=100)
+
+        response = await async_views.export(self.factory.get("/"), entity="products", format="csv")
+
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        lines = content.decode().splitlines()
+        self.assertEqual(lines[0], "id,name,type,price")
+        self.assertIn("Balanceado,Alimento,100.0", lines[1])
+
+    async def test_timing_middleware_stays_async(self):
+        """Verifica que el middleware de medición no pase las vistas async a un hilo."""
+        async def view(request):
+            return HttpResponse("ok")
+
+        middleware = RequestTimingMiddleware(view)
+        response = await middleware(self.factory.get("/"))
+
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    async def test_timing_middleware_counts_async_orm_queries(self):
+        """Verifica que se cuenten las consultas que el ORM async corre en otro hilo."""
+        async def view(request):
+            await Provider.objects.acount()
+            return HttpResponse("ok")
+
+        middleware = RequestTimingMiddleware(view)
+        response = await middleware(self.factory.get("/"))
+
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+
+class EditConflictTest(TestCase):
+    """Pruebas para los conflictos de edición en formularios y API."""
+    def setUp(self):
+        self.client_row = Client.objects.create(
+            name="Juan Perez", phone=54221555232, email="juan@vetsoft.com", address="13 y 44",
+        )
+
+    def edit(self, name, version):
+        return self.client.post(
+            reverse("clients_form"),
+            {
+                "id": self.client_row.id,
+                "version": version,
+                "name": name,
+                "phone": "54221555232",
+                "email": "juan@vetsoft.com",
+                "address": "13 y 44",
+            },
+        )
+
+    def test_edit_form_carries_the_version(self):
+        """Verifica que el formulario de edición lleve la versión de la fila."""
+        response = self.client.get(reverse("clients_edit", kwargs={"id": self.client_row.id}))
+        self.assertContains(response, 'value="1" name="version"')
+
+    def test_second_stale_edit_gets_409(self):
+        """Verifica que la segunda edición sobre la misma versión reciba un conflicto."""
+        self.assertEqual(self.edit("Ana Gomez", 1).status_code, 302)
+
+        response = self.edit("Maria Lopez", 1)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, "Otra persona modificó este registro", status_code=409)
+        self.assertEqual(Client.objects.get(pk=self.client_row.id).name, "Ana Gomez")
+
+    def test_api_put_with_stale_version_gets_409(self):
+        """Verifica el conflicto por versión en la API."""
+        url = reverse("api_item", kwargs={"entity": "clients", "id": self.client_row.id})
+        response = self.client.patch(url, {"name": "Ana Gomez", "version": 1}, content_type="application/json")
+        self.assertEqual(response.json()["version"], 2)
+
+        response = self.client.patch(url, {"name": "Maria Lopez", "version": 1}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+
+    def test_api_batch_with_stale_version_gets_409(self):
+        """Verifica que el lote rechace operaciones sobre versiones viejas."""
+        response = self.client.post(
+            reverse("api_batch"),
+            {"operations": [
+                {"op": "update", "entity": "clients", "id": self.client_row.id, "version": 5,
+                 "data": {"name": "Ana Gomez"}},
+            ]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Client.objects.get(pk=self.client_row.id).name, "Juan Perez")
+
+    def test_api_version_as_text_is_a_number_and_garbage_is_a_400(self):
+        """Verifica que "1" valga como versión 1 y que una versión no numérica sea un 400."""
+        url = reverse("api_item", kwargs={"entity": "clients", "id": self.client_row.id})
+
+        def update(version, name):
+            return self.client.post(
+                reverse("api_batch"),
+                {"operations": [{"op": "update", "entity": "clients", "id": self.client_row.id,
+                                 "version": version, "data": {"name": name}}]},
+                content_type="application/json",
+            )
+
+        self.assertEqual(update("1", "Ana Gomez").status_code, 200)
+        self.assertEqual(update("1", "Maria Lopez").status_code, 409)
+        response = update("uno", "Maria Lopez")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("version", response.json()["results"][0]["errors"])
+
+        response = self.client.patch(url, {"name": "Maria Lopez", "version": "abc"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("version", response.json()["errors"])
+        response = self.client.patch(url, {"name": "Maria Lopez", "version": "2"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Client.objects.get(pk=self.client_row.id).name, "Maria Lopez")
+
+
+class AutocompleteTest(QueryBudgetMixin, TestCase):
+    """Pruebas para el autocompletado de nombres desde el índice en memoria."""
+    def setUp(self):
+        reset_indexes()
+        for name in ("Juan Perez", "juana Diaz", "Julieta Gomez", "Pedro Ruiz"):
+            Client.objects.create(name=name, phone="54221555232", email="c@vetsoft.com")
+        Provider.objects.create(name="Juguetes SA", email="p@ejemplo.com")
+
+    def suggest(self, entity, **query):
+        response = self.client.get(reverse("autocomplete", kwargs={"entity": entity}), query)
+        return response, [result["name"] for result in response.json().get("results", [])]
+
+    def test_prefix_is_case_insensitive_and_sorted(self):
+        """Verifica que el prefijo no distinga mayúsculas y los nombres salgan ordenados."""
+        response, names = self.suggest("clients", prefix="JUAN")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(names, ["Juan Perez", "juana Diaz"])
+
+        _, names = self.suggest("clients", prefix="ju", limit=2)
+        self.assertEqual(names, ["Juan Perez", "juana Diaz"])
+
+        _, names = self.suggest("providers", prefix="ju")
+        self.assertEqual(names, ["Juguetes SA"])
+
+    def test_lookups_after_the_first_do_not_query(self):
+        """Verifica que el índice se arme una vez y luego no consulte la base."""
+        with self.assertWithinBudget("autocomplete"):
+            self.suggest("clients", prefix="j")
+        with self.assertNumQueries(0):
+            self.suggest("clients", prefix="p")
+
+    def test_signals_update_the_index_in_place(self):
+        """Verifica que altas, ediciones y borrados se apliquen sin rearmar el índice."""
+        self.suggest("clients", prefix="j")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client = Client.objects.create(name="Jorge Paz", phone="54221555232", email="j@vetsoft.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.filter(name="Pedro Ruiz").get().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            client.name = "Joaquin Paz"
+            client.save()
+
+        with self.assertNumQueries(0):
+            _, names = self.suggest("clients", prefix="j")
+            _, gone = self.suggest("clients", prefix="pedro")
+        self.assertEqual(names, ["Joaquin Paz", "Juan Perez", "juana Diaz", "Julieta Gomez"])
+        self.assertEqual(gone, [])
+
+    def test_bulk_writes_rebuild_the_index(self):
+        """Verifica que un cambio sin señales (bulk_create) invalide el índice."""
+        self.suggest("clients", prefix="j")
+        response = self.client.post(
+            reverse("api_batch"),
+            json.dumps({"operations": [
+                {"op": "create", "entity": "clients", "data": {
+                    "name": "Javier Sosa", "phone": "54221555232", "email": "js@vetsoft.com",
+                }},
+            ]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        _, names = self.suggest("clients", prefix="ja")
+        self.assertEqual(names, ["Javier Sosa"])
+
+    def test_rejects_unknown_entity_and_bad_limit(self):
+        """Verifica los errores por entidad sin autocompletado o límite inválido."""
+        response, _ = self.suggest("vets", prefix="a")
+        self.assertEqual(response.status_code, 404)
+        response, _ = self.suggest("clients", prefix="a", limit="mil")
+        self.assertEqual(response.status_code, 400)
+
+
+class FoldedSearchTest(QueryBudgetMixin, TestCase):
+    """Pruebas para la búsqueda y el orden sin acentos ni mayúsculas."""
+    def setUp(self):
+        reset_indexes()
+        for name in ("Núñez Ana", "Zoe Paz", "álvaro Ruiz"):
+            Client.objects.create(name=name, phone="54221555232", email="c@vetsoft.com")
+        Vet.objects.create(name="Émile", email="v@vetsoft.com", phone="221", specialty="Cardiología")
+        Vet.objects.create(name="Bruno", email="b@vetsoft.com", phone="221", specialty="Oncología")
+        Medi.objects.create(name="Ácido Fólico", description="Vitamina", dose=1)
+        Provider.objects.create(name="Distribuidora Peña", email="p@ejemplo.com")
+
+    def test_search_ignores_accents_and_case(self):
+        """Verifica que "nunez", "NUNEZ" y "Núñez" encuentren el mismo cliente."""
+        for q in ("nunez", "NUNEZ", "Núñez"):
+            with self.subTest(q=q), self.assertWithinBudget("clients_repo"):
+                response = self.client.get(reverse("clients_repo"), {"q": q})
+            self.assertEqual([c.name for c in response.context["clients"]], ["Núñez Ana"])
+
+        response = self.client.get(reverse("provider_repo"), {"q": "distribuidora pena"})
+        self.assertEqual(len(response.context["provider"]), 1)
+        response = self.client.get(reverse("medi_repo"), {"q": "acido"})
+        self.assertEqual(len(response.context["medis"]), 1)
+        response = self.client.get(reverse("vets_repo"), {"q": "emile"})
+        self.assertEqual([vet.name for vet in response.context["vets"]], ["Émile"])
+
+    def test_specialty_filter_ignores_accents(self):
+        """Verifica que ?specialty=cardiologia filtre por "Cardiología"."""
+        response = self.client.get(reverse("vets_repo"), {"specialty": "CARDIOLOGIA"})
+        self.assertEqual([vet.name for vet in response.context["vets"]], ["Émile"])
+
+    def test_sort_by_name_ignores_accents_across_pages(self):
+        """Verifica el orden alfabético sin acentos y su paginación por cursor."""
+        response = self.client.get(reverse("clients_repo"), {"sort": "name", "page_size": 2})
+        self.assertEqual([c.name for c in response.context["clients"]], ["álvaro Ruiz", "Núñez Ana"])
+
+        response = self.client.get(reverse("clients_repo") + response.context["page"].next_url)
+        self.assertEqual([c.name for c in response.context["clients"]], ["Zoe Paz"])
+
+    def test_autocomplete_ignores_accents(self):
+        """Verifica que el autocompletado encuentre nombres con acentos."""
+        response = self.client.get(
+            reverse("autocomplete", kwargs={"entity": "clients"}), {"prefix": "alv"},
+        )
+        self.assertEqual([r["name"] for r in response.json()["results"]], ["álvaro Ruiz"])
+
+
+class ClientMergeTest(QueryBudgetMixin, TestCase):
+    """Pruebas para la revisión y fusión de clientes duplicados."""
+    def setUp(self):
+        self.juan = Client.objects.create(
+            name="Juan Perez", phone=54221555232, email="juan@vetsoft.com", address="13 y 44",
+        )
+        self.twin = Client.objects.create(
+            name="Juan Peres", phone=54221555232, email="jperez@vetsoft.com", address="",
+        )
+        self.candidate = DuplicateCandidate.objects.create(
+            client=self.juan, other=self.twin, score=0.9, reasons="name,phone",
+        )
+
+    def merge(self, **data):
+        form = {
+            "action": "merge", "keep": self.juan.pk,
+            "name": "Juan Perez", "phone": "54221555232",
+            "email": "jperez@vetsoft.com", "address": "13 y 44",
+            f"version_{self.juan.pk}": self.juan.version,
+            f"version_{self.twin.pk}": self.twin.version,
+        }
+        form.update(data)
+        return self.client.post(reverse("clients_merge", kwargs={"id": self.candidate.pk}), form)
+
+    def test_list_and_merge_pages_within_budget(self):
+        """Verifica la lista de pares y la página de fusión contra su presupuesto."""
+        with self.assertWithinBudget("clients_duplicates"):
+            response = self.client.get(reverse("clients_duplicates"))
+        self.assertContains(response, "Juan Peres")
+
+        with self.assertWithinBudget("clients_merge"):
+            response = self.client.get(reverse("clients_merge", kwargs={"id": self.candidate.pk}))
+        self.assertContains(response, "jperez@vetsoft.com")
+
+    def test_merge_updates_the_kept_client_and_deletes_the_other(self):
+        """Verifica que la fusión use los valores elegidos y borre el duplicado."""
+        with self.assertWithinBudget("clients_merge"):
+            response = self.merge()
+
+        self.assertRedirects(response, reverse("clients_duplicates"))
+        kept = Client.objects.get()
+        self.assertEqual(kept.pk, self.juan.pk)
+        self.assertEqual(kept.email, "jperez@vetsoft.com")
+        self.assertEqual(kept.version, 2)
+        self.assertFalse(DuplicateCandidate.objects.exists())
+
+    def test_invalid_values_are_not_merged(self):
+        """Verifica que los datos inválidos se rechacen sin borrar al duplicado."""
+        response = self.merge(email="sin-arroba")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Client.objects.count(), 2)
+
+    def test_stale_duplicate_gets_409(self):
+        """Verifica que no se fusione si el duplicado cambió desde que se mostró."""
+        Client.objects.get(pk=self.twin.pk).update_client({"address": "Calle 7"})
+
+        response = self.merge()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Client.objects.count(), 2)
+        self.assertEqual(Client.objects.get(pk=self.juan.pk).email, "juan@vetsoft.com")
+
+    def test_dismiss_keeps_both_clients(self):
+        """Verifica que descartar el par no modifique a los clientes."""
+        response = self.merge(action="dismiss")
+
+        self.assertRedirects(response, reverse("clients_duplicates"))
+        self.assertEqual(Client.objects.count(), 2)
+        self.assertFalse(DuplicateCandidate.objects.exists())
+
+
+class DashboardTest(QueryBudgetMixin, TestCase):
+    """Pruebas para el tablero de conteos del inicio."""
+
+    def test_home_shows_counts_within_budget(self):
+        """Verifica que el inicio muestre los totales, especialidades y tipos dentro del presupuesto."""
+        Product.objects.create(name="Collar", type=product_type("Accesorio"), price=10)
+        Product.objects.create(name="Correa", type=product_type("Accesorio"), price=20)
+        Vet.objects.create(
+            name="Ana", email="ana@vetsoft.com", phone="221",
+            specialty=Vet.VetSpecialties.ONCOLOGIA,
+        )
+
+        with self.assertWithinBudget("home"):
+            response = self.client.get(reverse("home"))
+
+        self.assertContains(response, '<span class="badge text-bg-secondary fs-6" data-testid="count-product">2</span>', html=True)
+        self.assertContains(response, '<span class="badge text-bg-secondary fs-6" data-testid="count-vet">1</span>', html=True)
+        self.assertContains(response, "Accesorio")
+
+    def test_batch_and_import_update_the_counts(self):
+        """Verifica que los lotes de la API y la importación CSV mantengan los conteos."""
+        provider = Provider.objects.create(name="Sur", email="sur@ejemplo.com")
+        self.client.post(reverse("api_batch"), {"operations": [
+            {"op": "create", "entity": "products", "data": {"name": "Collar", "type": "Accesorio", "price": 10}},
+            {"op": "delete", "entity": "providers", "id": provider.id},
+        ]}, content_type="application/json")
+
+        content = "name,phone,email,address\nJuan Perez,54221555232,juan@vetsoft.com,13 y 44\n"
+        upload = SimpleUploadedFile("clientes.csv", content.encode(), content_type="text/csv")
+        self.client.post(reverse("clients_import"), {"file": upload})
+
+        counts = dashboard()
+        self.assertEqual(counts["totals"], {"client": 1, "product": 1, "vet": 0, "medi": 0, "provider": 0})
+        self.assertEqual(Product.objects.get().type.name, "Accesorio")
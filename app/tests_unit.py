@@ -1,7 +1,39 @@
-from django.forms import ValidationError
-from django.test import TestCase
+import threading
+import time
+from io import StringIO
+from unittest import mock
 
-from app.models import Client, Medi, Product, Provider, Vet, validate_client
+from django.core.management import call_command
+from django.db import connection
+from django.forms import ValidationError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+
+from app.cache import get_version
+from app.counters import batched_counts, dashboard, reconcile, record_created
+from app.db import active_pragmas, pragma_statements
+from app.dedup import candidate_pairs, email_key, find_duplicates, phone_key, phonetic_key
+from app.models import (
+    Client,
+    DuplicateCandidate,
+    Medi,
+    Product,
+    ProductType,
+    Provider,
+    SummaryCounter,
+    Vet,
+    validate_client,
+    validate_vet,
+)
+from app.search import ranked_search, rebuild_index
+from app.text import fold
+from app.tracking import ConflictError
+from app.writer import SingleWriter, WriteQueueFull, WriteTimeout, run_write
+
+
+def product_type(name):
+    return ProductType.objects.get_or_create(name=name)[0]
 
 
 class ClientModelTest(TestCase):
@@ -203,6 +235,40 @@ class ClientModelTest(TestCase):
         errors = validate_client(data)
         self.assertEqual(errors, {"phone": "El teléfono debe ser numérico"})
 
+class ChoiceCodeFieldTest(TestCase):
+    """Pruebas para la especialidad guardada como código entero."""
+
+    def test_stores_code_and_reads_the_option(self):
+        """Verifica que la base guarde el código y Python vea el texto de la opción."""
+        vet = Vet.objects.create(
+            name="Ana", email="ana@vetsoft.com", phone="221",
+            specialty=Vet.VetSpecialties.MEDICINA_INTERNA_PEQUENOS_ANIMALES,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT specialty FROM app_vet WHERE id = %s", [vet.pk])
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+        vet = Vet.objects.get(pk=vet.pk)
+        self.assertEqual(vet.specialty, "Medicina interna de pequeños animales")
+        self.assertEqual(vet.get_specialty_display(), "Medicina interna de pequeños animales")
+        self.assertEqual(
+            list(Vet.objects.filter(specialty=Vet.VetSpecialties.MEDICINA_INTERNA_PEQUENOS_ANIMALES)
+                 .values_list("specialty", flat=True)),
+            ["Medicina interna de pequeños animales"],
+        )
+
+    def test_rejects_values_outside_the_choices(self):
+        """Verifica que una especialidad que no es una opción no se valide ni se guarde."""
+        errors = validate_vet({
+            "name": "Ana", "email": "ana@vetsoft.com", "phone": "221", "specialty": "Dermatología",
+        })
+        self.assertIn("specialty", errors)
+
+        with self.assertRaises(ValueError):
+            Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone="221", specialty="Dermatología")
+
+
 class MedicineModelTest(TestCase):
     """Pruebas para el modelo Medi (Medicine)."""
     def test_can_create_and_get_medicine(self):
@@ -263,6 +329,44 @@ class MedicineModelTest(TestCase):
         medicine_updated = Medi.objects.get(pk=1)
         self.assertEqual(medicine_updated.dose, 5, "La dosis no debe cambiar si se proporciona un valor de dosis inválido")
 
+class ProductTypeTest(TestCase):
+    """Pruebas para la tabla de tipos de producto."""
+
+    def test_ids_for_reuses_existing_and_creates_missing(self):
+        """Verifica que ids_for devuelva los ids existentes y cree los que faltan."""
+        alimento = product_type("Alimento")
+
+        ids = ProductType.objects.ids_for(["Alimento", "Juguete", "Juguete"])
+
+        self.assertEqual(ids["Alimento"], alimento.pk)
+        self.assertEqual(ids["Juguete"], ProductType.objects.get(name="Juguete").pk)
+        self.assertEqual(ProductType.objects.count(), 2)
+
+    def test_products_share_the_type_row(self):
+        """Verifica que los productos del mismo tipo referencien una sola fila."""
+        Product.save_product({"name": "Collar", "type": "Accesorio", "price": 10})
+        Product.save_product({"name": "Correa", "type": "Accesorio", "price": 20})
+
+        product = Product.objects.get(name="Collar")
+        product.update_product({"type": "Juguete", "price": 10})
+
+        self.assertEqual(ProductType.objects.count(), 2)
+        self.assertEqual(Product.objects.get(name="Correa").type.name, "Accesorio")
+        self.assertEqual(Product.objects.get(name="Collar").type.name, "Juguete")
+
+    def test_rejected_update_creates_no_type(self):
+        """Verifica que una edición rechazada o en conflicto no deje tipos huérfanos."""
+        Product.save_product({"name": "Collar", "type": "Accesorio", "price": 10})
+        product = Product.objects.get(name="Collar")
+
+        saved, _ = product.update_product({"type": "Juguete", "price": "-1"})
+        self.assertFalse(saved)
+        with self.assertRaises(ConflictError):
+            product.update_product({"type": "Juguete", "price": 10, "version": product.version + 1})
+
+        self.assertFalse(ProductType.objects.filter(name="Juguete").exists())
+
+
 class VetModelTest(TestCase):
     """Pruebas para el modelo Vet."""
 
@@ -338,7 +442,7 @@ class ProductModelTest(TestCase):
         self.assertEqual(len(products), 1)
 
         self.assertEqual(products[0].name, "Producto 1")
-        self.assertEqual(products[0].type, "Alimento")
+        self.assertEqual(products[0].type.name, "Alimento")
         self.assertEqual(products[0].price, 100.0)
 
     def test_can_update_product(self):
@@ -441,3 +545,458 @@ class ProviderModelTest(TestCase):
         self.assertEqual(providers[0].name, "Proveedor Ejemplo")
         self.assertEqual(providers[0].email, "proveedor@ejemplo.com")
         self.assertEqual(providers[0].address, "13 y 32")
+
+
+class SearchIndexTest(TestCase):
+    """Pruebas para la reconstrucción del índice de texto completo."""
+
+    def test_rebuild_index_by_chunks(self):
+        """Verifica que la reconstrucción por bloques deje el índice completo."""
+        for number in range(5):
+            Medi.objects.create(name=f"Medicina {number}", description="Analgésico", dose=1)
+
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM app_medi_fts")
+
+        chunks = list(rebuild_index(Medi, chunk_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(ranked_search(Medi, "analgesico")), 5)
+
+
+class SqlitePragmasTest(TestCase):
+    """Pruebas para la configuración de pragmas de SQLite."""
+
+    def test_pragma_statements_skip_empty_values(self):
+        """Verifica que los pragmas vacíos se omitan y se respete el orden."""
+        statements = pragma_statements(
+            {"synchronous": "NORMAL", "journal_mode": "WAL", "mmap_size": ""},
+        )
+
+        self.assertEqual(
+            statements, ["PRAGMA journal_mode = WAL", "PRAGMA synchronous = NORMAL"],
+        )
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        """Verifica que la conexión de Django tenga los pragmas configurados."""
+        pragmas = active_pragmas()
+
+        self.assertEqual(pragmas["busy_timeout"], 5000)
+        self.assertEqual(pragmas["temp_store"], 2)  # 2 = MEMORY
+
+
+class SeedDataCommandTest(TestCase):
+    """Pruebas para la carga de datos sintéticos."""
+
+    def test_seed_is_deterministic(self):
+        """Verifica que la misma semilla genere los mismos datos."""
+        call_command("seed_data", scale="1k", stdout=StringIO())
+        first = list(Vet.objects.order_by("id").values_list("name", "specialty")[:50])
+
+        call_command("seed_data", scale="1k", clear=True, stdout=StringIO())
+        second = list(Vet.objects.order_by("id").values_list("name", "specialty")[:50])
+
+        self.assertEqual(Client.objects.count(), 1000)
+        self.assertEqual(first, second)
+        self.assertEqual(validate_client(Client.objects.values()[0]), {})
+        # --clear borra sin señales: los contadores quedan igual de bien
+        self.assertEqual(reconcile(), [])
+
+
+@override_settings(WRITE_QUEUE_ENABLED=True)
+class SingleWriterTest(TransactionTestCase):
+    """Pruebas para el escritor único con commits agrupados."""
+
+    def test_concurrent_writers_have_no_lock_errors(self):
+        """Verifica que N escritores concurrentes guarden todo sin errores de lock."""
+        writers, writes = 8, 25
+        errors = []
+
+        def write(worker):
+            for number in range(writes):
+                try:
+                    saved, _ = run_write(
+                        Client.save_client,
+                        {
+                            "name": "Juan Perez",
+                            "phone": f"54221{worker:03d}{number:03d}",
+                            "email": f"juan{worker}.{number}@vetsoft.com",
+                            "address": "13 y 44",
+                        },
+                    )
+                    if not saved:
+                        errors.append("no guardado")
+                except Exception as error:
+                    errors.append(str(error))
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Client.objects.count(), writers * writes)
+
+    def test_failed_write_does_not_undo_the_batch(self):
+        """Verifica que el error de una escritura no deshaga las demás del lote."""
+        writer = SingleWriter()
+
+        def fail():
+            Provider.objects.create(name="Norte", email="norte@ejemplo.com")
+            raise ValueError("falla")
+
+        with self.assertRaises(ValueError):
+            writer.submit(fail)
+        writer.submit(Provider.objects.create, name="Sur", email="sur@ejemplo.com")
+
+        self.assertEqual(list(Provider.objects.values_list("name", flat=True)), ["Sur"])
+
+    @override_settings(WRITE_QUEUE_SIZE=1, WRITE_QUEUE_TIMEOUT=0.05, WRITE_BATCH_SIZE=1)
+    def test_full_queue_applies_backpressure(self):
+        """Verifica que con la cola llena se rechace la escritura."""
+        writer = SingleWriter()
+        release = threading.Event()
+        blocked = threading.Thread(target=writer.submit, args=(release.wait,))
+        blocked.start()
+        while not writer.queue.empty():
+            time.sleep(0.01)
+        queued = threading.Thread(target=writer.submit, args=(lambda: None,))
+        queued.start()
+        while not writer.queue.full():
+            time.sleep(0.01)
+
+        with self.assertRaises(WriteQueueFull):
+            writer.submit(lambda: None)
+
+        release.set()
+        blocked.join()
+        queued.join()
+
+    @override_settings(WRITE_RESULT_TIMEOUT=0.05, WRITE_BATCH_SIZE=1)
+    def test_slow_write_times_out_and_is_dropped(self):
+        """Verifica que una escritura que no llega a ejecutarse a tiempo se descarte."""
+        writer = SingleWriter()
+        started, release = threading.Event(), threading.Event()
+        outcomes = []
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        def submit_blocking():
+            # Esta escritura también supera el tiempo: el error se guarda para revisarlo
+            try:
+                writer.submit(block)
+            except WriteTimeout as error:
+                outcomes.append(error)
+
+        blocked = threading.Thread(target=submit_blocking)
+        blocked.start()
+        started.wait(5)
+
+        with self.assertRaises(WriteTimeout):
+            writer.submit(Provider.objects.create, name="Norte", email="norte@ejemplo.com")
+
+        # La escritura en curso también deja de esperarse; recién después termina
+        blocked.join()
+        release.set()
+        self.assertEqual(len(outcomes), 1)
+        writer.submit(Provider.objects.create, name="Sur", email="sur@ejemplo.com")
+        self.assertEqual(list(Provider.objects.values_list("name", flat=True)), ["Sur"])
+
+    def test_writer_survives_a_failing_connection_check(self):
+        """Verifica que un error antes del lote llegue a la solicitud sin matar el hilo."""
+        writer = SingleWriter()
+
+        with mock.patch("app.writer.close_old_connections", side_effect=RuntimeError("conexión")):
+            with self.assertRaises(RuntimeError):
+                writer.submit(lambda: None)
+
+        writer.submit(Provider.objects.create, name="Sur", email="sur@ejemplo.com")
+        self.assertTrue(writer.thread.is_alive())
+        self.assertTrue(Provider.objects.exists())
+
+
+
+class ChangeTrackingTest(TestCase):
+    """Pruebas para las ediciones que escriben solo los campos cambiados."""
+
+    def setUp(self):
+        Product.objects.create(name="Collar", type=product_type("Accesorio"), price=10)
+        self.product = Product.objects.get(name="Collar")
+
+    def writes(self, result):
+        value = REGISTRY.get_sample_value(
+            "vetsoft_update_writes_total", {"model": "product", "result": result},
+        )
+        return value or 0
+
+    def test_update_without_changes_skips_the_write(self):
+        """Verifica que una edición sin cambios no ejecute ninguna consulta."""
+        skipped = self.writes("skipped")
+
+        with self.assertNumQueries(0):
+            saved, errors = self.product.update_product({"name": "Collar", "price": "10"})
+
+        self.assertTrue(saved)
+        self.assertIsNone(errors)
+        self.assertEqual(self.writes("skipped"), skipped + 1)
+
+    def test_update_writes_only_changed_columns(self):
+        """Verifica que el UPDATE incluya solo el campo cambiado y updated_at."""
+        partial = self.writes("partial")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.product.update_product({"price": "25"})
+
+        updates = [query["sql"] for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        sql = updates[0]
+        self.assertIn('"price"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"name"', sql)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).price, 25)
+        self.assertEqual(self.writes("partial"), partial + 1)
+
+        with self.assertNumQueries(0):
+            self.product.update_product({"price": "25"})
+
+    def test_instance_not_loaded_from_db_saves_every_column(self):
+        """Verifica que una instancia nueva se guarde completa."""
+        provider = Provider()
+        provider.update_provider({"name": "Sur", "email": "sur@ejemplo.com", "address": "Calle 1"})
+
+        self.assertTrue(Provider.objects.filter(name="Sur").exists())
+
+
+class OptimisticConcurrencyTest(TestCase):
+    """Pruebas para las ediciones condicionadas a la versión de la fila."""
+
+    def setUp(self):
+        Provider.objects.create(name="Sur", email="sur@ejemplo.com")
+
+    def test_update_increments_version(self):
+        """Verifica que cada edición incremente la versión."""
+        provider = Provider.objects.get(name="Sur")
+        provider.update_provider({"name": "Norte", "version": "1"})
+
+        self.assertEqual(Provider.objects.get(pk=provider.pk).version, 2)
+
+    def test_stale_version_raises_conflict(self):
+        """Verifica que una edición sobre una versión vieja no pise los datos."""
+        first = Provider.objects.get(name="Sur")
+        second = Provider.objects.get(name="Sur")
+
+        first.update_provider({"name": "Norte", "version": first.version})
+        with self.assertRaises(ConflictError):
+            second.update_provider({"name": "Este", "version": second.version})
+
+        self.assertEqual(Provider.objects.get(pk=first.pk).name, "Norte")
+        self.assertEqual(second.version, 1)
+
+    def test_conflict_does_not_break_the_transaction(self):
+        """Verifica que después de un conflicto se pueda seguir consultando."""
+        provider = Provider.objects.get(name="Sur")
+        with self.assertRaises(ConflictError):
+            provider.update_provider({"name": "Norte", "version": "7"})
+
+        self.assertEqual(Provider.objects.get(pk=provider.pk).name, "Sur")
+
+
+class FoldedNameTest(TestCase):
+    """Pruebas para los nombres normalizados sin acentos ni mayúsculas."""
+
+    def test_fold_removes_accents_case_and_extra_spaces(self):
+        """Verifica que fold iguale las distintas formas de escribir un nombre."""
+        self.assertEqual(fold("  Núñez   PÉREZ "), "nunez perez")
+        self.assertEqual(fold("NUNEZ"), fold("nunez"))
+        self.assertEqual(fold("Cardiología"), "cardiologia")
+        self.assertEqual(fold(None), "")
+
+    def test_fold_merges_enye_into_n(self):
+        """Verifica que la ñ se pliegue a n: misma clave y orden entre las palabras con n."""
+        self.assertEqual(fold("Peña"), fold("Pena"))
+        self.assertEqual(fold("ÑANDÚ"), "nandu")
+        self.assertEqual(sorted(["Nora", "Ñandú", "Nadia"], key=fold), ["Nadia", "Ñandú", "Nora"])
+
+    def test_client_accepts_accented_names(self):
+        """Verifica que un cliente pueda llamarse con acentos y ñ."""
+        errors = validate_client(
+            {"name": "José Núñez", "phone": "54221555232", "email": "jn@vetsoft.com"},
+        )
+        self.assertNotIn("name", errors)
+
+    def test_save_keeps_the_folded_name_in_sync(self):
+        """Verifica que name_folded se calcule al crear y al editar solo el nombre."""
+        client = Client.objects.create(
+            name="Ana Núñez", phone="54221555232", email="a@vetsoft.com",
+        )
+        self.assertEqual(Client.objects.get(pk=client.pk).name_folded, "ana nunez")
+
+        client = Client.objects.get(pk=client.pk)
+        client.update_client({"name": "Ána María"})
+        self.assertEqual(Client.objects.get(pk=client.pk).name_folded, "ana maria")
+
+    def test_bulk_writes_fill_the_folded_name(self):
+        """Verifica que bulk_create y bulk_update completen name_folded."""
+        Medi.objects.bulk_create([
+            Medi(name="Ibuprofeno Fórte", description="x", dose=1),
+            Medi(name="ÁCIDO", description="x", dose=1),
+        ])
+        self.assertEqual(
+            sorted(Medi.objects.values_list("name_folded", flat=True)),
+            ["acido", "ibuprofeno forte"],
+        )
+
+        medis = list(Medi.objects.all())
+        for medi in medis:
+            medi.name = medi.name + " Ñ"
+        Medi.objects.bulk_update(medis, ["name"])
+        self.assertEqual(
+            sorted(Medi.objects.values_list("name_folded", flat=True)),
+            ["acido n", "ibuprofeno forte n"],
+        )
+
+
+class DuplicateDetectionTest(TestCase):
+    """Pruebas para la detección de clientes duplicados por claves de bloqueo."""
+
+    def create(self, name, phone, email):
+        return Client.objects.create(name=name, phone=phone, email=email, address="13 y 44")
+
+    def test_blocking_keys_normalize_spelling(self):
+        """Verifica que las claves igualen grafías, prefijos y etiquetas distintas."""
+        self.assertEqual(phonetic_key("Juan Carlos Pérez"), phonetic_key("perez juan"))
+        self.assertEqual(phonetic_key("Jhon Vazquez"), phonetic_key("Jon Basques"))
+        self.assertNotEqual(phonetic_key("Juan Perez"), phonetic_key("Juan Gomez"))
+        self.assertEqual(phone_key(54221555232), phone_key("(221) 555-232"))
+        self.assertEqual(phone_key("123"), "")
+        self.assertEqual(email_key("Juan.Perez+turnos@vetsoft.com"), "juanperez")
+
+    def test_oversized_blocks_are_skipped(self):
+        """Verifica que una clave compartida por demasiados clientes no genere pares."""
+        blocks = {("email", "info"): list(range(10)), ("phone", "5551234"): [1, 2]}
+        self.assertEqual(list(candidate_pairs(blocks, max_block_size=5)), [(1, 2)])
+
+    def test_finds_duplicates_across_chunks(self):
+        """Verifica que se detecten los duplicados aunque caigan en bloques distintos."""
+        juan = self.create("Juan Perez", 54221555232, "juan.perez@vetsoft.com")
+        self.create("Ana Gomez", 54221000001, "ana@vetsoft.com")
+        twin = self.create("Juan Peres", 54221555232, "juanperez@vetsoft.com")
+        self.create("Juan Perez", 54229999999, "otro@vetsoft.com")
+
+        found = [candidate for chunk in find_duplicates(chunk_size=2) for candidate in chunk]
+
+        pairs = {(candidate.client_id, candidate.other_id): candidate for candidate in found}
+        self.assertIn((juan.pk, twin.pk), pairs)
+        self.assertEqual(pairs[(juan.pk, twin.pk)].reasons, "name,phone,email")
+        self.assertEqual(len(pairs), 1)
+
+    def test_clients_deleted_during_the_pass_are_skipped(self):
+        """Verifica que un cliente borrado después de armar los bloques no rompa la pasada."""
+        juan = self.create("Juan Perez", 54221555232, "juan@vetsoft.com")
+        twin = self.create("Juan Perez", 54221555232, "jp@vetsoft.com")
+        other = self.create("Juan Perez", 54221555232, "jperez@vetsoft.com")
+
+        chunks = find_duplicates(chunk_size=1)
+        first = next(chunks)
+        other.delete()
+        found = first + [candidate for chunk in chunks for candidate in chunk]
+
+        pairs = {(candidate.client_id, candidate.other_id) for candidate in found}
+        self.assertEqual(pairs, {(juan.pk, twin.pk)})
+
+    def test_command_replaces_previous_candidates(self):
+        """Verifica que el comando guarde los pares encontrados en una pasada nueva."""
+        self.create("Juan Perez", 54221555232, "juan@vetsoft.com")
+        self.create("Juan Perez", 54221555232, "jp@vetsoft.com")
+        out = StringIO()
+
+        call_command("find_duplicate_clients", "--chunk-size", "1", stdout=out)
+        call_command("find_duplicate_clients", stdout=out)
+
+        self.assertEqual(DuplicateCandidate.objects.count(), 1)
+        self.assertIn("1 pares", out.getvalue())
+
+
+class SummaryCounterTest(TestCase):
+    """Pruebas para los contadores del tablero mantenidos por señales."""
+
+    def vet(self, name, specialty):
+        return Vet.objects.create(
+            name=name, email=f"{name.lower()}@vetsoft.com", phone="2214444444", specialty=specialty,
+        )
+
+    def test_counts_follow_creates_regroups_and_deletes(self):
+        """Verifica que altas, cambios de especialidad y borrados ajusten total y grupos."""
+        ana = self.vet("Ana", Vet.VetSpecialties.CARDIOLOGIA)
+        self.vet("Luis", Vet.VetSpecialties.CARDIOLOGIA)
+        self.vet("Pedro", Vet.VetSpecialties.NUTRICION)
+
+        ana.specialty = Vet.VetSpecialties.ONCOLOGIA
+        ana.save()
+        Vet.objects.filter(specialty=Vet.VetSpecialties.NUTRICION).delete()
+
+        counts = dashboard()
+        self.assertEqual(counts["totals"]["vet"], 2)
+        self.assertEqual(counts["groups"]["vet"], [("Cardiología", 1), ("Oncología", 1)])
+        self.assertEqual(reconcile(), [])
+
+    def test_batched_counts_writes_once_per_entity(self):
+        """Verifica que un bloque de escrituras aplique los contadores con un UPDATE."""
+        Client.objects.create(name="Ana", phone=54221000000, email="a@vetsoft.com", address="")
+        clients = [
+            Client(name=f"Cliente {letter}", phone=54221000001, email="c@vetsoft.com", address="")
+            for letter in "abcde"
+        ]
+        Client.objects.bulk_create(clients)
+        record_created(Client, clients)
+        self.assertEqual(dashboard()["totals"]["client"], 6)
+
+        with CaptureQueriesContext(connection) as queries, batched_counts():
+            Client.objects.all().delete()
+
+        counter_writes = [query for query in queries if "app_summarycounter" in query["sql"]]
+        self.assertEqual(len(counter_writes), 1)
+        self.assertEqual(dashboard()["totals"]["client"], 0)
+
+    def test_failed_block_discards_pending_counts(self):
+        """Verifica que un bloque que falla no aplique los cambios acumulados."""
+        Client.objects.create(name="Ana", phone=54221000000, email="a@vetsoft.com", address="")
+
+        with self.assertRaises(RuntimeError), batched_counts():
+            Client.objects.all().delete()
+            raise RuntimeError()
+
+        self.assertEqual(dashboard()["totals"]["client"], 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        """Verifica que reconcile_counters corrija los contadores desviados y lo informe."""
+        Vet.objects.create(
+            name="Pedro", email="pedro@vetsoft.com", phone="2214444444",
+            specialty=Vet.VetSpecialties.CARDIOLOGIA,
+        )
+        SummaryCounter.objects.filter(entity="vet").update(count=7)
+        out = StringIO()
+
+        call_command("reconcile_counters", stdout=out)
+
+        self.assertIn("vet", out.getvalue())
+        self.assertEqual(dashboard()["totals"]["vet"], 1)
+        self.assertEqual(reconcile(), [])
+
+    def test_reconcile_bumps_the_version_of_corrected_models(self):
+        """Verifica que reconcile invalide las páginas de los modelos corregidos y no las demás."""
+        Vet.objects.create(
+            name="Pedro", email="pedro@vetsoft.com", phone="2214444444",
+            specialty=Vet.VetSpecialties.CARDIOLOGIA,
+        )
+        SummaryCounter.objects.filter(entity="vet", group="").update(count=7)
+        vet_version, client_version = get_version(Vet), get_version(Client)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reconcile()
+
+        self.assertNotEqual(get_version(Vet), vet_version)
+        self.assertEqual(get_version(Client), client_version)
@@ -0,0 +1,80 @@
+"""
+Nombres normalizados para buscar y ordenar sin distinguir acentos ni mayúsculas.
+
+Client, Provider, Vet y Medi guardan junto al nombre una columna name_folded
+indexada con el nombre sin acentos, en casefold y con los espacios colapsados
+("  Núñez " -> "nunez"). Las búsquedas por prefijo y el orden alfabético usan
+esa columna, así son rangos y recorridos del índice en lugar de aplicar
+LOWER() o una función de Python a cada fila.
+
+La columna se mantiene desde Python al guardar: save() y los bulk_create /
+bulk_update del manager la recalculan, y la migración 0009 completó las filas
+existentes por bloques.
+
+Diferencia con el orden del español: ahí la ñ es una letra aparte que va
+después de la n ("Nuñez" < "Nuño" < "Ñandú"). Acá la ñ se pliega a n como
+cualquier letra acentuada, porque la búsqueda tiene que encontrar "Núñez" con
+"nunez" (escrito desde un teclado sin ñ). Como consecuencia "Peña" y "Pena"
+tienen la misma clave y el orden por nombre ubica "Ñandú" entre las palabras
+con n ("Nadia" < "Ñandú" < "Nora"), no después de todas ellas.
+"""
+
+import unicodedata
+
+from django.db import models
+
+
+def fold(value):
+    """
+    Normaliza un texto para compararlo sin acentos ni mayúsculas.
+
+    La ñ se convierte en n, igual que las vocales acentuadas, para que "nunez"
+    encuentre a "Núñez" (ver en el docstring del módulo la diferencia con el
+    orden del español).
+
+    Args:
+        value (str): El texto a normalizar; None se trata como vacío.
+
+    Returns:
+        str: El texto sin marcas diacríticas, en casefold y con los espacios colapsados.
+    """
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+class FoldedNameQuerySet(models.QuerySet):
+    """QuerySet que completa name_folded en las escrituras masivas."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create que calcula name_folded de cada instancia antes de insertar."""
+        objs = list(objs)
+        for obj in objs:
+            obj.fold_name()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """bulk_update que escribe también name_folded si se actualiza name."""
+        objs = list(objs)
+        fields = list(fields)
+        if "name" in fields and "name_folded" not in fields:
+            for obj in objs:
+                obj.fold_name()
+            fields.append("name_folded")
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class FoldedNameMixin:
+    """Mantiene name_folded a partir de name en cada save()."""
+
+    def fold_name(self):
+        """Recalcula name_folded desde el nombre actual."""
+        self.name_folded = fold(self.name)
+
+    def save(self, *args, **kwargs):
+        """Guarda la instancia con name_folded al día."""
+        self.fold_name()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = [*update_fields, "name_folded"]
+        super().save(*args, **kwargs)
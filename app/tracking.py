@@ -0,0 +1,173 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from prometheus_client import Counter
+
+UPDATE_WRITES = Counter(
+    "vetsoft_update_writes_total",
+    "Ediciones por modelo según se escribieron completas, solo los campos "
+    "cambiados o se evitaron por no haber cambios",
+    ["model", "result"],
+)
+
+CONFLICT_MESSAGE = (
+    "Otra persona modificó este registro mientras usted lo editaba. "
+    "Recargue la página para ver los cambios antes de guardar."
+)
+
+
+class ConflictError(Exception):
+    """La fila cambió desde que se leyó: la edición parte de una versión vieja."""
+
+
+def parse_version(value):
+    """
+    La versión que vio quien edita, como entero.
+
+    Acepta el número o su texto ("3"), como llega de un formulario o de JSON.
+
+    Args:
+        value: El valor enviado; None o "" significa que no se envió.
+
+    Returns:
+        int: La versión, o None si no se envió.
+
+    Raises:
+        ValueError: Si el valor no es un entero ni el texto de uno.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{value!r} no es una versión")
+    return int(value)
+
+
+class ChangeTrackingMixin:
+    """Registra los valores leídos de la base para escribir solo lo que cambió.
+
+    Las instancias cargadas desde la base guardan una copia de sus columnas;
+    save_changes compara contra esa copia y hace save(update_fields=[...]) con
+    los campos modificados, o no escribe nada si no cambió ninguno.
+
+    Cada modelo tiene además una columna version (control de concurrencia
+    optimista): el UPDATE solo se aplica si la versión en la base sigue siendo
+    la que vio quien edita (UPDATE ... WHERE id = %s AND version = %s) y la
+    incrementa; si otra edición ganó antes se lanza ConflictError. No se toma
+    ningún lock entre que se muestra el formulario y se guarda.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Crea la instancia desde una fila y guarda sus valores originales."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _tracked_fields(self):
+        return [
+            field
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and not getattr(field, "auto_now", False)
+            and field.name != "version"
+        ]
+
+    def _snapshot(self):
+        values = {}
+        for field in self._tracked_fields():
+            if field.attname in self.__dict__:
+                try:
+                    values[field.attname] = field.to_python(self.__dict__[field.attname])
+                except ValidationError:
+                    values[field.attname] = self.__dict__[field.attname]
+        return values
+
+    def changed_fields(self):
+        """
+        Campos cuyo valor difiere del leído de la base.
+
+        Los valores se comparan normalizados con to_python, así "3" y 3 se
+        consideran iguales en un IntegerField.
+
+        Returns:
+            list: Los nombres de los campos cambiados, o None si la instancia
+            no se cargó desde la base y no hay contra qué comparar.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None or self._state.adding:
+            return None
+
+        current = self._snapshot()
+        return [
+            field.name
+            for field in self._tracked_fields()
+            if field.attname in current
+            and (field.attname not in loaded or current[field.attname] != loaded[field.attname])
+        ]
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, "_expected_version", None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update,
+        )
+        if not updated:
+            raise ConflictError()
+        return updated
+
+    def save_changes(self, expected_version=None):
+        """
+        Guarda solo los campos modificados desde que se leyó la instancia.
+
+        Args:
+            expected_version (int, optional): La versión que vio quien edita
+                (el campo oculto del formulario); por defecto la leída.
+
+        Returns:
+            bool: False si no había cambios y no se escribió nada.
+
+        Raises:
+            ConflictError: Si la fila ya no está en la versión esperada.
+        """
+        label = self._meta.model_name
+        changed = self.changed_fields()
+
+        if changed is None:
+            self.save()
+            UPDATE_WRITES.labels(label, "full").inc()
+            self._loaded_values = self._snapshot()
+            return True
+
+        if not changed:
+            UPDATE_WRITES.labels(label, "skipped").inc()
+            return False
+
+        try:
+            expected = parse_version(expected_version)
+        except ValueError:
+            raise ConflictError() from None
+        if expected is None:
+            expected = self.version
+
+        auto_now = [
+            field.name
+            for field in self._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        self._expected_version = expected
+        self.version = expected + 1
+        try:
+            # El savepoint evita que un conflicto invalide la transacción de quien llama
+            with transaction.atomic(using=self._state.db):
+                self.save(update_fields=changed + ["version"] + auto_now)
+        except ConflictError:
+            self.version = self._loaded_values.get("version", expected)
+            raise
+        finally:
+            self._expected_version = None
+
+        UPDATE_WRITES.labels(label, "partial").inc()
+        self._loaded_values = self._snapshot()
+        self._loaded_values["version"] = self.version
+        return True
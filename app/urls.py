@@ -1,33 +1,53 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import api, async_views, views
+
+# Vistas de repositorio, formulario, borrado y exportación: async bajo ASGI (ver app/async_views.py)
+pages = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path("", view=views.home, name="home"),
+    path("buscar/", view=views.search, name="search"),
+    path("diagnostico/db/", view=views.db_diagnostics, name="db_diagnostics"),
+    path("metrics", view=views.metrics, name="metrics"),
+    path("api/batch/", view=api.batch, name="api_batch"),
+    path("api/<str:entity>/", view=api.collection, name="api_collection"),
+    path("api/<str:entity>/<int:id>/", view=api.item, name="api_item"),
+    path("autocomplete/<str:entity>/", view=api.autocomplete, name="autocomplete"),
     
-    path("clientes/", view=views.clients_repository, name="clients_repo"),
-    path("clientes/nuevo/", view=views.clients_form, name="clients_form"),
-    path("clientes/editar/<int:id>/", view=views.clients_form, name="clients_edit"),
-    path("clientes/eliminar/", view=views.clients_delete, name="clients_delete"),
+    path("clientes/", view=pages.clients_repository, name="clients_repo"),
+    path("clientes/nuevo/", view=pages.clients_form, name="clients_form"),
+    path("clientes/editar/<int:id>/", view=pages.clients_form, name="clients_edit"),
+    path("clientes/eliminar/", view=pages.clients_delete, name="clients_delete"),
+    path("clientes/importar/", view=views.import_file, kwargs={"entity": "clients", "title": "clientes"}, name="clients_import"),
+    path("clientes/export.<str:format>", view=pages.export, kwargs={"entity": "clients"}, name="clients_export"),
+    path("clientes/duplicados/", view=views.clients_duplicates, name="clients_duplicates"),
+    path("clientes/duplicados/<int:id>/", view=views.clients_merge, name="clients_merge"),
     
-    path("veterinarios/", view=views.vets_repository, name="vets_repo"),
-    path("veterinarios/nuevo/", view=views.vets_form, name="vets_form"),
-    path("veterinarios/editar/<int:id>/", view=views.vets_form, name="vets_edit"),
-    path("veterinarios/eliminar/", view=views.vets_delete, name="vets_delete"),
+    path("veterinarios/", view=pages.vets_repository, name="vets_repo"),
+    path("veterinarios/nuevo/", view=pages.vets_form, name="vets_form"),
+    path("veterinarios/editar/<int:id>/", view=pages.vets_form, name="vets_edit"),
+    path("veterinarios/eliminar/", view=pages.vets_delete, name="vets_delete"),
+    path("veterinarios/export.<str:format>", view=pages.export, kwargs={"entity": "vets"}, name="vets_export"),
      
-    path("medicina/", view=views.medis_repository, name="medi_repo"),
-    path("medicina/nuevo/", view=views.medis_form, name="medi_form"),
-    path("medicina/editar/<int:id>/", view=views.medis_form, name="medi_edit"),
-    path("medicina/eliminar/", view=views.medis_delete, name="medi_delete"),  
+    path("medicina/", view=pages.medis_repository, name="medi_repo"),
+    path("medicina/nuevo/", view=pages.medis_form, name="medi_form"),
+    path("medicina/editar/<int:id>/", view=pages.medis_form, name="medi_edit"),
+    path("medicina/eliminar/", view=pages.medis_delete, name="medi_delete"),  
+    path("medicina/export.<str:format>", view=pages.export, kwargs={"entity": "medis"}, name="medi_export"),
 
-    path("productos/", view=views.products_repository, name="products_repo"),
-    path("productos/nuevo/", view=views.products_form, name="products_form"),
-    path("productos/editar/<int:id>/", view=views.products_form, name="products_edit"),
-    path("productos/eliminar/", view=views.products_delete, name="products_delete"),
+    path("productos/", view=pages.products_repository, name="products_repo"),
+    path("productos/nuevo/", view=pages.products_form, name="products_form"),
+    path("productos/editar/<int:id>/", view=pages.products_form, name="products_edit"),
+    path("productos/eliminar/", view=pages.products_delete, name="products_delete"),
+    path("productos/importar/", view=views.import_file, kwargs={"entity": "products", "title": "productos"}, name="products_import"),
+    path("productos/export.<str:format>", view=pages.export, kwargs={"entity": "products"}, name="products_export"),
 
-    path("proveedor/", view=views.provider_repository, name="provider_repo"), 
-    path("proveedor/nuevo/", view=views.provider_form, name="provider_form"),
-    path("proveedor/editar/<int:id>/", view=views.provider_form, name="provider_edit"),
-    path("proveedor/eliminar/", view=views.provider_delete, name="provider_delete"),
+    path("proveedor/", view=pages.provider_repository, name="provider_repo"), 
+    path("proveedor/nuevo/", view=pages.provider_form, name="provider_form"),
+    path("proveedor/editar/<int:id>/", view=pages.provider_form, name="provider_edit"),
+    path("proveedor/eliminar/", view=pages.provider_delete, name="provider_delete"),
+    path("proveedor/export.<str:format>", view=pages.export, kwargs={"entity": "providers"}, name="provider_export"),
 
 ]
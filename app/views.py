@@ -1,21 +1,160 @@
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render, reverse
+from django.views.decorators.http import condition
+
+from .cache import cached_page
+from .conditional import set_last_modified, table_etag
+from .counters import choices_with_counts, dashboard
+from .db import active_pragmas
+from .dedup import MERGE_FIELDS, merge_clients
+from .exports import CONTENT_TYPES, STREAMERS
+from .facets import product_type_facets
+from .filters import (
+    filter_clients,
+    filter_medis,
+    filter_products,
+    filter_providers,
+    filter_vets,
+    repository_ordering,
+)
+from .imports import IMPORT_COLUMNS, import_uploaded_file
+from .metrics import render_metrics
+from .models import Client, DuplicateCandidate, Medi, Product, Provider, Vet
+from .pagination import paginate
+from .search import ranked_search
+from .tracking import CONFLICT_MESSAGE, ConflictError
+from .writer import run_write
+
+
+@cached_page(Client, Product, Vet, Medi, Provider)
+def home(request):
+    """
+    Renderiza la página principal con el tablero de cantidades.
 
-from .models import Client, Medi, Product, Provider, Vet
+    Las cantidades salen de los contadores mantenidos por señales (ver
+    app/counters.py): una consulta de pocas filas sin importar el tamaño de
+    las tablas. Los productos por tipo son las facetas cacheadas de
+    app/facets.py.
 
+    Args:
+        request (HttpRequest): La solicitud HTTP.
 
-def home(request):
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+    """
+    return render(
+        request, "home.html", {"counts": dashboard(), "product_types": product_type_facets()},
+    )
+
+
+def db_diagnostics(request):
     """
-    Renderiza la página principal.
+    Muestra la configuración de SQLite vigente en la conexión actual.
 
     Args:
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada.
+        JsonResponse: Los pragmas configurados y los valores activos.
+    """
+    return JsonResponse(
+        {
+            "vendor": connection.vendor,
+            "configured": settings.SQLITE_PRAGMAS,
+            "active": active_pragmas(),
+        },
+    )
+
+
+def metrics(request):
+    """
+    Expone las métricas de la aplicación en formato de texto de Prometheus.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: Las métricas de solicitudes, latencias, consultas y filas.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404("Las métricas están desactivadas")
+
+    content, content_type = render_metrics()
+    return HttpResponse(content, content_type=content_type)
+
+
+def search(request):
+    """
+    Busca medicinas y clientes por texto completo ordenados por relevancia.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP con el texto a buscar en ?q=.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y los resultados.
+    """
+    q = request.GET.get("q", "").strip()
+    medis = ranked_search(Medi, q) if q else []
+    clients = ranked_search(Client, q) if q else []
+
+    return render(
+        request, "search/results.html", {"q": q, "medis": medis, "clients": clients},
+    )
+
+
+def export(request, entity, format):
+    """
+    Exporta todas las filas de una entidad en CSV o NDJSON como un stream.
+
+    La respuesta se arma a medida que se leen bloques de la base, así la memoria
+    se mantiene constante y el primer byte sale antes de terminar la consulta.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP, con los filtros del repositorio.
+        entity (str): La entidad a exportar (clients, products, vets, medis, providers).
+        format (str): El formato de salida, "csv" o "ndjson".
+
+    Returns:
+        StreamingHttpResponse: La respuesta con el archivo exportado.
     """
-    return render(request, "home.html")
+    if format not in STREAMERS:
+        raise Http404("Formato de exportación no soportado")
 
+    response = StreamingHttpResponse(
+        STREAMERS[format](entity, request.GET), content_type=CONTENT_TYPES[format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{entity}.{format}"'
+    return response
 
+
+def import_file(request, entity, title):
+    """
+    Maneja el formulario de importación masiva desde un archivo CSV.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        entity (str): La entidad a importar (clients o products).
+        title (str): El nombre de la entidad para mostrar en la página.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla y el reporte por fila.
+    """
+    context = {"title": title, "columns": IMPORT_COLUMNS[entity]}
+
+    if request.method == "POST":
+        uploaded_file = request.FILES.get("file")
+        if uploaded_file is None:
+            context["errors"] = {"file": "Por favor seleccione un archivo"}
+        else:
+            context["report"] = import_uploaded_file(entity, uploaded_file)
+
+    return render(request, "imports/form.html", context)
+
+
+@condition(etag_func=table_etag(Client))
+@cached_page(Client)
 def clients_repository(request):
     """
     Renderiza la página del repositorio de clientes.
@@ -24,12 +163,16 @@ def clients_repository(request):
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada y los clientes.
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de clientes.
     """
-    clients = Client.objects.all()
-    return render(request, "clients/repository.html", {"clients": clients})
+    clients = filter_clients(Client.objects.all(), request.GET)
+    page = paginate(clients, request, repository_ordering(request.GET))
+    return render(
+        request, "clients/repository.html", {"clients": page.items, "page": page},
+    )
 
 
+@condition(etag_func=table_etag(Client))
 def clients_form(request, id=None):
     """
     Maneja el formulario de clientes para agregar o actualizar un cliente.
@@ -47,23 +190,28 @@ def clients_form(request, id=None):
         saved = True
 
         if client_id == "":
-            saved, errors = Client.save_client(request.POST)
+            saved, errors = run_write(Client.save_client, request.POST)
         else:
             client = get_object_or_404(Client, pk=client_id)
-            saved, errors = client.update_client(request.POST)
+            try:
+                saved, errors = run_write(client.update_client, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
 
         if saved:
             return redirect(reverse("clients_repo"))
 
         return render(
             request, "clients/form.html", {"errors": errors, "client": request.POST},
+            status=409 if "version" in errors else 200,
         )
 
     client = None
     if id is not None:
         client = get_object_or_404(Client, pk=id)
 
-    return render(request, "clients/form.html", {"client": client})
+    response = render(request, "clients/form.html", {"client": client})
+    return set_last_modified(response, client)
 
 
 def clients_delete(request):
@@ -77,12 +225,88 @@ def clients_delete(request):
         HttpResponse: La respuesta HTTP que redirige al repositorio de clientes.
     """
     client_id = request.POST.get("client_id")
-    client = get_object_or_404(Client, pk=int(client_id))
-    client.delete()
+    # Sin get previo: el delete() del queryset hace un SELECT de la fila (para las
+    # señales y las relaciones) y el DELETE; si no borró nada es porque no existía
+    deleted, _ = run_write(Client.objects.filter(pk=int(client_id)).delete)
+    if not deleted:
+        raise Http404("No existe el cliente")
 
     return redirect(reverse("clients_repo"))
 
 
+def clients_duplicates(request):
+    """
+    Renderiza la lista de pares de clientes probablemente duplicados.
+
+    Los pares los detecta el comando find_duplicate_clients.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con una página de pares candidatos.
+    """
+    candidates = DuplicateCandidate.objects.select_related("client", "other")
+    page = paginate(candidates, request)
+    return render(
+        request, "clients/duplicates.html", {"candidates": page.items, "page": page},
+    )
+
+
+def clients_merge(request, id):
+    """
+    Muestra y aplica la fusión de un par de clientes duplicados.
+
+    Se elige qué cliente queda y, campo por campo, qué valor conservar; el
+    cliente que queda se actualiza con Client.update_client y el otro se borra.
+    También se puede descartar el par si no son la misma persona.
+
+    Args:
+        request (HttpRequest): La solicitud HTTP.
+        id (int): El ID del par candidato.
+
+    Returns:
+        HttpResponse: La respuesta HTTP con la plantilla renderizada o la redirección a la lista.
+    """
+    candidate = get_object_or_404(
+        DuplicateCandidate.objects.select_related("client", "other"), pk=id,
+    )
+    errors = {}
+
+    if request.method == "POST":
+        if request.POST.get("action") == "dismiss":
+            run_write(DuplicateCandidate.objects.filter(pk=id).delete)
+            return redirect(reverse("clients_duplicates"))
+
+        kept, removed = candidate.client, candidate.other
+        if request.POST.get("keep") == str(removed.pk):
+            kept, removed = removed, kept
+
+        data = {field: request.POST.get(field, "") for field, _ in MERGE_FIELDS}
+        data["version"] = request.POST.get(f"version_{kept.pk}")
+        try:
+            saved, errors = run_write(
+                merge_clients, kept, removed, data, request.POST.get(f"version_{removed.pk}"),
+            )
+        except ConflictError:
+            saved, errors = False, {"version": CONFLICT_MESSAGE}
+
+        if saved:
+            return redirect(reverse("clients_duplicates"))
+
+    fields = [
+        (field, label, getattr(candidate.client, field), getattr(candidate.other, field))
+        for field, label in MERGE_FIELDS
+    ]
+    return render(
+        request, "clients/merge.html",
+        {"candidate": candidate, "fields": fields, "errors": errors},
+        status=409 if "version" in errors else 200,
+    )
+
+
+@condition(etag_func=table_etag(Product))
+@cached_page(Product)
 def products_repository(request):
     """
     Renderiza la página del repositorio de productos.
@@ -91,12 +315,18 @@ def products_repository(request):
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada y los productos.
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de productos.
     """
-    products = Product.objects.all()
-    return render(request, "products/repository.html", {"products": products})
+    products = filter_products(Product.objects.select_related("type"), request.GET)
+    page = paginate(products, request)
+    return render(
+        request,
+        "products/repository.html",
+        {"products": page.items, "page": page, "type_facets": product_type_facets()},
+    )
 
 
+@condition(etag_func=table_etag(Product))
 def products_form(request, id=None):
     """
     Maneja el formulario de productos para agregar o actualizar un producto.
@@ -114,23 +344,28 @@ def products_form(request, id=None):
         saved = True
 
         if product_id == "":
-            saved, errors = Product.save_product(request.POST)
+            saved, errors = run_write(Product.save_product, request.POST)
         else:
             product = get_object_or_404(Product, pk=product_id)
-            saved, errors = product.update_product(request.POST)
+            try:
+                saved, errors = run_write(product.update_product, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
 
         if saved:
             return redirect(reverse("products_repo"))
 
         return render(
             request, "products/form.html", {"errors": errors, "product": request.POST},
+            status=409 if "version" in errors else 200,
         )
 
     product = None
     if id is not None:
-        product = get_object_or_404(Product, pk=id)
+        product = get_object_or_404(Product.objects.select_related("type"), pk=id)
 
-    return render(request, "products/form.html", {"product": product})
+    response = render(request, "products/form.html", {"product": product})
+    return set_last_modified(response, product)
 
 
 def products_delete(request):
@@ -144,12 +379,17 @@ def products_delete(request):
         HttpResponse: La respuesta HTTP que redirige al repositorio de productos.
     """
     product_id = request.POST.get("product_id")
-    product = get_object_or_404(Product, pk=int(product_id))
-    product.delete()
+    # Sin get previo: el delete() del queryset hace un SELECT de la fila (para las
+    # señales y las relaciones) y el DELETE; si no borró nada es porque no existía
+    deleted, _ = run_write(Product.objects.filter(pk=int(product_id)).delete)
+    if not deleted:
+        raise Http404("No existe el producto")
 
     return redirect(reverse("products_repo"))
 
 
+@condition(etag_func=table_etag(Vet))
+@cached_page(Vet)
 def vets_repository(request):
     """
     Renderiza la página del repositorio de veterinarios.
@@ -158,12 +398,18 @@ def vets_repository(request):
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada y los veterinarios.
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de veterinarios.
     """
-    vets = Vet.objects.all()
-    return render(request, "vets/repository.html", {"vets": vets})
+    vets = filter_vets(Vet.objects.all(), request.GET)
+    page = paginate(vets, request, repository_ordering(request.GET))
+    return render(
+        request,
+        "vets/repository.html",
+        {"vets": page.items, "page": page, "specialties": choices_with_counts(Vet)},
+    )
 
 
+@condition(etag_func=table_etag(Vet))
 def vets_form(request, id=None):
     """
     Maneja el formulario de veterinarios para agregar o actualizar un veterinario.
@@ -182,23 +428,28 @@ def vets_form(request, id=None):
         saved = True
 
         if vet_id == "":
-            saved, errors = Vet.save_vet(request.POST)
+            saved, errors = run_write(Vet.save_vet, request.POST)
         else:
             vet = get_object_or_404(Vet, pk=vet_id)
-            vet.update_vet(request.POST)
+            try:
+                run_write(vet.update_vet, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
 
         if saved:
             return redirect(reverse("vets_repo"))
 
         return render(
             request, "vets/form.html", {"errors": errors, "vet": request.POST, "specialties" : specialties},
+            status=409 if "version" in errors else 200,
         )
 
     vet = None
     if id is not None:
         vet = get_object_or_404(Vet, pk=id)
 
-    return render(request, "vets/form.html", {"vet": vet, "specialties": specialties})
+    response = render(request, "vets/form.html", {"vet": vet, "specialties": specialties})
+    return set_last_modified(response, vet)
 
 
 def vets_delete(request):
@@ -212,13 +463,18 @@ def vets_delete(request):
         HttpResponse: La respuesta HTTP que redirige al repositorio de veterinarios.
     """
     vet_id = request.POST.get("vet_id")
-    vet = get_object_or_404(Vet, pk=int(vet_id))
-    vet.delete()
+    # Sin get previo: el delete() del queryset hace un SELECT de la fila (para las
+    # señales y las relaciones) y el DELETE; si no borró nada es porque no existía
+    deleted, _ = run_write(Vet.objects.filter(pk=int(vet_id)).delete)
+    if not deleted:
+        raise Http404("No existe el veterinario")
 
     return redirect(reverse("vets_repo"))
 
 
 # Medicinas
+@condition(etag_func=table_etag(Medi))
+@cached_page(Medi)
 def medis_repository(request):
     """
     Renderiza la página del repositorio de medicinas.
@@ -227,12 +483,17 @@ def medis_repository(request):
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada y las medicinas.
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de medicinas.
     """
-    medis = Medi.objects.all()
-    return render(request, "medicine/repository.html", {"medis": medis})
+    page = paginate(
+        filter_medis(Medi.objects.all(), request.GET), request, repository_ordering(request.GET),
+    )
+    return render(
+        request, "medicine/repository.html", {"medis": page.items, "page": page},
+    )
 
 
+@condition(etag_func=table_etag(Medi))
 def medis_form(request, id=None):
     """
     Maneja el formulario de medicinas para agregar o actualizar una medicina.
@@ -250,23 +511,28 @@ def medis_form(request, id=None):
         saved = True
 
         if medi_id == "":
-            saved, errors = Medi.save_medi(request.POST)
+            saved, errors = run_write(Medi.save_medi, request.POST)
         else:
             medi = get_object_or_404(Medi, pk=medi_id)
-            medi.update_medi(request.POST)
+            try:
+                run_write(medi.update_medi, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
 
         if saved:
             return redirect(reverse("medi_repo"))
 
         return render(
             request, "medicine/form.html", {"errors": errors, "medi": request.POST},
+            status=409 if "version" in errors else 200,
         )
 
     medi = None
     if id is not None:
         medi = get_object_or_404(Medi, pk=id)
 
-    return render(request, "medicine/form.html", {"medi": medi})
+    response = render(request, "medicine/form.html", {"medi": medi})
+    return set_last_modified(response, medi)
 
 
 def medis_delete(request):
@@ -280,12 +546,17 @@ def medis_delete(request):
         HttpResponse: La respuesta HTTP que redirige al repositorio de medicinas.
     """
     medi_id = request.POST.get("medi_id")
-    medi = get_object_or_404(Medi, pk=int(medi_id))
-    medi.delete()
+    # Sin get previo: el delete() del queryset hace un SELECT de la fila (para las
+    # señales y las relaciones) y el DELETE; si no borró nada es porque no existía
+    deleted, _ = run_write(Medi.objects.filter(pk=int(medi_id)).delete)
+    if not deleted:
+        raise Http404("No existe la medicina")
 
     return redirect(reverse("medi_repo"))
 
 
+@condition(etag_func=table_etag(Provider))
+@cached_page(Provider)
 def provider_repository(request):
     """
     Renderiza la página del repositorio de proveedores.
@@ -294,12 +565,16 @@ def provider_repository(request):
         request (HttpRequest): La solicitud HTTP.
 
     Returns:
-        HttpResponse: La respuesta HTTP con la plantilla renderizada y los proveedores.
+        HttpResponse: La respuesta HTTP con la plantilla renderizada y una página de proveedores.
     """
-    provider = Provider.objects.all()
-    return render(request, "provider/repository.html", {"provider": provider})
+    provider = filter_providers(Provider.objects.all(), request.GET)
+    page = paginate(provider, request, repository_ordering(request.GET))
+    return render(
+        request, "provider/repository.html", {"provider": page.items, "page": page},
+    )
 
 
+@condition(etag_func=table_etag(Provider))
 def provider_form(request, id=None):
     """
     Maneja el formulario de proveedores para agregar o actualizar un proveedor.
@@ -317,23 +592,28 @@ def provider_form(request, id=None):
         saved = True
 
         if provider_id == "":
-            saved, errors = Provider.save_provider(request.POST)
+            saved, errors = run_write(Provider.save_provider, request.POST)
         else:
             provider = get_object_or_404(Provider, pk=provider_id)
-            provider.update_provider(request.POST)
+            try:
+                run_write(provider.update_provider, request.POST)
+            except ConflictError:
+                saved, errors = False, {"version": CONFLICT_MESSAGE}
 
         if saved:
             return redirect(reverse("provider_repo"))
 
         return render(
             request, "provider/form.html", {"errors": errors, "provider": request.POST},
+            status=409 if "version" in errors else 200,
         )
 
     provider = None
     if id is not None:
         provider = get_object_or_404(Provider, pk=id)
 
-    return render(request, "provider/form.html", {"provider": provider})
+    response = render(request, "provider/form.html", {"provider": provider})
+    return set_last_modified(response, provider)
 
 
 def provider_delete(request):
@@ -347,7 +627,10 @@ def provider_delete(request):
         HttpResponse: La respuesta HTTP que redirige al repositorio de proveedores.
     """
     provider_id = request.POST.get("prov_id")
-    provider = get_object_or_404(Provider, pk=int(provider_id))
-    provider.delete()
+    # Sin get previo: el delete() del queryset hace un SELECT de la fila (para las
+    # señales y las relaciones) y el DELETE; si no borró nada es porque no existía
+    deleted, _ = run_write(Provider.objects.filter(pk=int(provider_id)).delete)
+    if not deleted:
+        raise Http404("No existe el proveedor")
 
     return redirect(reverse("provider_repo"))
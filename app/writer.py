@@ -0,0 +1,222 @@
+"""
+Escritor único: serializa las escrituras de un proceso en un solo hilo.
+
+SQLite admite un solo escritor a la vez. Cuando varias solicitudes guardan al
+mismo tiempo, cada una abre su propia transacción y compite por el lock de la
+base hasta que alguna recibe "database is locked". Con WRITE_QUEUE_ENABLED las
+vistas encolan sus escrituras (save_*, update_*, borrados) y un hilo escritor
+por proceso las aplica en lotes cortos: toma la primera, espera hasta
+WRITE_BATCH_WAIT_MS por más (hasta WRITE_BATCH_SIZE) y las confirma todas en
+una sola transacción, con un savepoint por escritura para que el error de una
+no deshaga las demás.
+
+La cola es acotada (WRITE_QUEUE_SIZE): si está llena la solicitud espera hasta
+WRITE_QUEUE_TIMEOUT segundos y luego recibe 503 con Retry-After. Lo mismo si
+su escritura no termina dentro de WRITE_RESULT_TIMEOUT segundos. Con
+WRITE_LOCK_FILE cada lote además toma un lock de archivo, así los workers de
+gunicorn escriben de a uno sin depender de busy_timeout.
+"""
+
+import fcntl
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from prometheus_client import Counter, Histogram
+
+WRITE_BATCHES = Histogram(
+    "vetsoft_write_batch_size",
+    "Escrituras confirmadas en cada lote del escritor único",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+WRITE_QUEUE_REJECTED = Counter(
+    "vetsoft_write_queue_rejected_total",
+    "Escrituras rechazadas por tener la cola llena",
+)
+WRITE_TIMEOUTS = Counter(
+    "vetsoft_write_timeouts_total",
+    "Escrituras cuyo resultado no llegó dentro de WRITE_RESULT_TIMEOUT",
+)
+
+
+class WriteQueueFull(Exception):
+    """La cola de escrituras siguió llena durante WRITE_QUEUE_TIMEOUT segundos."""
+
+
+class WriteTimeout(Exception):
+    """La escritura no terminó dentro de WRITE_RESULT_TIMEOUT segundos.
+
+    Si todavía estaba en la cola se descarta sin aplicarse; si el escritor ya
+    la había empezado puede terminar confirmándose igual.
+    """
+
+
+class SingleWriter:
+    """Cola acotada de escrituras y el hilo que las aplica en lotes.
+
+    Attributes:
+        pid (int): El proceso dueño del hilo; después de un fork se crea otro.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.queue = queue.Queue(maxsize=settings.WRITE_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run, name="single-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, function, *args, **kwargs):
+        """Encola function(*args, **kwargs) y espera su resultado."""
+        future = Future()
+        try:
+            self.queue.put(
+                (future, function, args, kwargs), timeout=settings.WRITE_QUEUE_TIMEOUT,
+            )
+        except queue.Full:
+            WRITE_QUEUE_REJECTED.inc()
+            raise WriteQueueFull() from None
+
+        try:
+            return future.result(timeout=settings.WRITE_RESULT_TIMEOUT)
+        except FutureTimeoutError:
+            # Si sigue en la cola se cancela y el escritor la saltea
+            future.cancel()
+            WRITE_TIMEOUTS.inc()
+            raise WriteTimeout() from None
+
+    def next_batch(self):
+        """La próxima escritura más las que lleguen dentro de la ventana del lote."""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + settings.WRITE_BATCH_WAIT_MS / 1000
+        while len(batch) < settings.WRITE_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(
+                    self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait(),
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        """Bucle del hilo escritor: aplica un lote por transacción."""
+        while True:
+            batch = self.next_batch()
+            try:
+                # Dentro del try: si falla (por ejemplo al cerrar una conexión
+                # rota) el lote recibe el error y el hilo sigue vivo
+                close_old_connections()
+                self.commit(batch)
+            except Exception as error:
+                # Falló el COMMIT (o no se llegó a empezar): no quedó guardada
+                # ninguna escritura del lote
+                for future, *_ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            WRITE_BATCHES.observe(len(batch))
+
+    def commit(self, batch):
+        """Aplica el lote en una transacción y entrega el resultado de cada escritura."""
+        results = []
+        with file_lock(), transaction.atomic():
+            for future, function, args, kwargs in batch:
+                # Una escritura cancelada por WRITE_RESULT_TIMEOUT no se aplica
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with transaction.atomic():
+                        results.append((future, True, function(*args, **kwargs)))
+                except Exception as error:
+                    results.append((future, False, error))
+
+        # Los resultados se entregan recién confirmado el lote
+        for future, ok, value in results:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+@contextmanager
+def file_lock():
+    """Lock de archivo entre procesos si WRITE_LOCK_FILE está configurado."""
+    if not settings.WRITE_LOCK_FILE:
+        yield
+        return
+
+    with open(settings.WRITE_LOCK_FILE, "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """El escritor del proceso actual, creado en la primera escritura."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = SingleWriter()
+        return _writer
+
+
+def run_write(function, *args, **kwargs):
+    """
+    Ejecuta una escritura a través del escritor único del proceso.
+
+    Con WRITE_QUEUE_ENABLED=False, o si ya se está dentro del hilo escritor, la
+    escritura se ejecuta directamente.
+
+    Args:
+        function (callable): La escritura, por ejemplo Client.save_client.
+
+    Returns:
+        El valor que devuelve function; sus excepciones se propagan igual.
+
+    Raises:
+        WriteQueueFull: Si la cola sigue llena después de WRITE_QUEUE_TIMEOUT.
+        WriteTimeout: Si la escritura no terminó dentro de WRITE_RESULT_TIMEOUT.
+    """
+    if not settings.WRITE_QUEUE_ENABLED or threading.current_thread().name == "single-writer":
+        return function(*args, **kwargs)
+    return get_writer().submit(function, *args, **kwargs)
+
+
+async def arun_write(function, *args, **kwargs):
+    """
+    Versión para vistas async de run_write.
+
+    Con la cola activa la espera del resultado ocupa un hilo cualquiera del
+    pool (no el hilo compartido de sync_to_async), así una escritura encolada
+    no frena las lecturas de las demás solicitudes.
+    """
+    if not settings.WRITE_QUEUE_ENABLED:
+        return await sync_to_async(function)(*args, **kwargs)
+    return await sync_to_async(get_writer().submit, thread_sensitive=False)(
+        function, *args, **kwargs,
+    )
+
+
+class WriteQueueMiddleware(MiddlewareMixin):
+    """Responde 503 con Retry-After cuando la cola está llena o la escritura tarda demasiado."""
+
+    def process_exception(self, request, exception):
+        """Convierte WriteQueueFull y WriteTimeout en un 503 para que el cliente reintente."""
+        if isinstance(exception, (WriteQueueFull, WriteTimeout)):
+            response = HttpResponse("Demasiadas escrituras en curso, reintente", status=503)
+            response["Retry-After"] = "1"
+            return response
+        return None
@@ -0,0 +1,166 @@
+"""
+Compara las vistas síncronas bajo WSGI con las vistas async bajo ASGI.
+
+Levanta gunicorn con un solo worker en cada modo (wsgi con vistas síncronas y
+asgi con ASYNC_VIEWS=True) sobre la base configurada y, mientras varios
+clientes lentos mantienen conexiones abiertas enviando los headers de a un
+byte, mide throughput y latencias de solicitudes normales a una ruta.
+
+Uso:
+    python manage.py seed_data --scale 1k
+    python -m benchmarks.async_views --slow-clients 50 --concurrency 16 --seconds 10
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.loadtest import percentile
+
+MODES = {
+    "wsgi": {"SERVER_MODE": "wsgi", "ASYNC_VIEWS": "False"},
+    "asgi": {"SERVER_MODE": "asgi", "ASYNC_VIEWS": "True"},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, threads):
+    """Levanta gunicorn en el modo pedido y espera a que responda."""
+    env = dict(
+        os.environ,
+        **MODES[mode],
+        BIND=f"127.0.0.1:{port}",
+        WEB_CONCURRENCY="1",
+        GUNICORN_THREADS=str(threads),
+        PAGE_CACHE_ENABLED="False",
+        REQUEST_LOG_LEVEL="WARNING",
+    )
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    server = subprocess.Popen(
+        ["gunicorn", "--config", "gunicorn.conf.py"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    sys.exit(f"El servidor {mode} no respondió")
+
+
+def slow_client(port, path, stop):
+    """Envía una solicitud de a un byte por segundo hasta que termina la prueba."""
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nX-Slow: {'x' * 64}\r\n\r\n"
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            for byte in request.encode()[:-2]:
+                if stop.wait(1):
+                    return
+                sock.send(bytes([byte]))
+    except OSError:
+        return
+
+
+def measure(port, path, concurrency, seconds):
+    """Solicitudes normales con concurrency hilos durante seconds segundos."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    url = f"http://127.0.0.1:{port}{path}"
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                    failed = response.status >= 400
+            except (OSError, urllib.error.HTTPError):
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors += failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+    }
+
+
+def run(mode, args):
+    port = free_port()
+    server = start_server(mode, port, args.threads)
+    stop = threading.Event()
+    slow = [
+        threading.Thread(target=slow_client, args=(port, args.path, stop), daemon=True)
+        for _ in range(args.slow_clients)
+    ]
+    try:
+        for thread in slow:
+            thread.start()
+        time.sleep(1)
+        result = measure(port, args.path, args.concurrency, args.seconds)
+    finally:
+        stop.set()
+        server.terminate()
+        server.wait()
+    return {"mode": mode, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/proveedor/")
+    parser.add_argument("--slow-clients", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=4, help="Hilos del worker WSGI.")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON.")
+    args = parser.parse_args()
+
+    results = [run(mode, args) for mode in MODES]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'modo':<8}{'req':>8}{'err':>6}{'rps':>10}{'p50':>10}{'p95':>10}")
+    for entry in results:
+        print(
+            f"{entry['mode']:<8}{entry['requests']:>8}{entry['errors']:>6}"
+            f"{entry['throughput_rps']:>10}{entry['p50_ms']!s:>10}{entry['p95_ms']!s:>10}",
+        )
+
+
+if __name__ == "__main__":
+    main()
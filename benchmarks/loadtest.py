@@ -0,0 +1,573 @@
+"""
+Prueba de carga sobre todas las rutas de app/urls.py.
+
+Recorre cada ruta (listados, formularios, creación, edición, borrado,
+importaciones, fusiones de duplicados, exportaciones, etc.) con varios clientes concurrentes contra un servidor local
+ya levantado y reporta throughput y latencias p50/p95/p99 por escenario. Los
+resultados se guardan en JSON para compararlos con una ejecución anterior.
+
+Uso:
+    python manage.py seed_data --scale 100k
+    python manage.py find_duplicate_clients
+    SERVER_MODE=wsgi gunicorn --config gunicorn.conf.py &
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 \\
+        --concurrency 8 --requests 200 --output resultados.json \\
+        --baseline base.json
+
+La base configurada (DBNAME) debe ser la misma que usa el servidor: de ahí se
+toman los ids para las rutas de edición, fusión y borrado. Las fusiones borran
+clientes sembrados, así que conviene correrla sobre una base descartable.
+"""
+
+import argparse
+import http.cookiejar
+import io
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vetsoft.settings")
+django.setup()
+
+from django.urls import get_resolver, reverse  # noqa: E402
+
+from app.dedup import MERGE_FIELDS  # noqa: E402
+from app.models import (  # noqa: E402
+    Client,
+    DuplicateCandidate,
+    Medi,
+    Product,
+    Provider,
+    Vet,
+)
+
+BENCH_MARKER = "Benchmark"
+
+
+class Scenario:
+    """Una solicitud a medir sobre una ruta con nombre.
+
+    Attributes:
+        name (str): Nombre del escenario en el reporte.
+        url_name (str): Nombre de la ruta en app/urls.py.
+        method (str): GET o POST.
+        json (bool): Si el POST se envía como JSON en lugar de formulario.
+        files (dict | callable): Archivos del POST como {campo: (nombre, contenido)}.
+    """
+
+    def __init__(
+        self, name, url_name, method="GET", kwargs=None, query=None, data=None, json=False, files=None,
+    ):
+        self.name = name
+        self.json = json
+        self.url_name = url_name
+        self.method = method
+        self.kwargs = kwargs or {}
+        self.query = query or {}
+        self.data = data
+        self.files = files
+
+    def url(self, base_url):
+        """URL absoluta del escenario."""
+        path = reverse(self.url_name, kwargs=self.kwargs)
+        if self.query:
+            path += "?" + urllib.parse.urlencode(self.query)
+        return base_url.rstrip("/") + path
+
+    def body(self):
+        """Datos del formulario para un POST (pueden variar en cada solicitud)."""
+        return self.data() if callable(self.data) else self.data
+
+    def uploads(self):
+        """Archivos a subir en un POST multipart (pueden variar en cada solicitud)."""
+        return self.files() if callable(self.files) else self.files
+
+    def next_request(self, base_url):
+        """URL y datos de la próxima solicitud."""
+        return self.url(base_url), self.body()
+
+
+class MergeScenario(Scenario):
+    """Fusiona en cada solicitud un par distinto de clientes duplicados.
+
+    Cada fusión borra un cliente y sus pares candidatos, así que se toman pares
+    sin clientes en común; cuando se acaban las solicitudes reciben 404.
+    """
+
+    def __init__(self, name, limit):
+        super().__init__(name, "clients_merge", "POST")
+        fields = [field for field, _ in MERGE_FIELDS]
+        clients = {}
+        pairs = []
+        candidates = DuplicateCandidate.objects.order_by("id").values_list("id", "client_id", "other_id")
+        for pk, client_id, other_id in candidates.iterator():
+            if client_id in clients or other_id in clients:
+                continue
+            clients[client_id] = clients[other_id] = None
+            pairs.append((pk, client_id, other_id))
+            if len(pairs) >= limit:
+                break
+        for row in Client.objects.filter(pk__in=clients).values("id", "version", *fields):
+            clients[row["id"]] = row
+
+        def merges():
+            for pk, client_id, other_id in pairs:
+                kept, removed = clients[client_id], clients[other_id]
+                data = {field: kept[field] for field in fields}
+                data.update({
+                    "keep": client_id,
+                    f"version_{client_id}": kept["version"],
+                    f"version_{other_id}": removed["version"],
+                })
+                yield {"id": pk}, data
+
+        self.pending = merges()
+        self.lock = threading.Lock()
+
+    def next_request(self, base_url):
+        """URL y datos de la fusión del próximo par."""
+        with self.lock:
+            kwargs, data = next(self.pending, ({"id": 0}, {}))
+        return base_url.rstrip("/") + reverse(self.url_name, kwargs=kwargs), data
+
+
+def _first_id(model):
+    return model.objects.order_by("id").values_list("id", flat=True).first()
+
+
+# Filas que se turnan los escenarios de edición: dos ediciones simultáneas de la
+# misma fila chocan por la versión y una recibe 409
+UPDATE_ROWS = 100
+
+
+def _first_ids(model):
+    return list(model.objects.order_by("id").values_list("id", flat=True)[:UPDATE_ROWS])
+
+
+def _unique():
+    return uuid.uuid4().hex[:8]
+
+
+def _letters():
+    # Los nombres de cliente solo admiten letras y espacios
+    return "".join(chr(ord("a") + int(c, 16) % 26) for c in _unique())
+
+
+# Número de solicitud de los escenarios de edición: cada POST cambia algún valor,
+# si repitieran los datos guardados no se escribiría nada (ver app/tracking.py)
+_iterations = itertools.count(1)
+
+
+def _iteration():
+    return next(_iterations)
+
+
+def _edit(rows, values):
+    """Edición de la fila que le toca a esta solicitud con values(número de solicitud)."""
+    iteration = _iteration()
+    return {"id": rows[iteration % len(rows)], **values(iteration)}
+
+
+def _csv_upload(header, row, rows=20):
+    """Un CSV de rows filas nuevas para los escenarios de importación."""
+    lines = [header] + [row() for _ in range(rows)]
+    return {"file": (f"bench{_unique()}.csv", ("\n".join(lines) + "\n").encode())}
+
+
+def build_scenarios():
+    """Arma los escenarios de lectura y de escritura para cada ruta."""
+    ids = {
+        "client": _first_id(Client),
+        "product": _first_id(Product),
+        "vet": _first_id(Vet),
+        "medi": _first_id(Medi),
+        "provider": _first_id(Provider),
+    }
+    missing = [name for name, pk in ids.items() if pk is None]
+    if missing:
+        sys.exit(f"Faltan datos para {', '.join(missing)}: ejecute manage.py seed_data")
+    ids["duplicate"] = _first_id(DuplicateCandidate)
+    if ids["duplicate"] is None:
+        sys.exit("No hay pares de clientes duplicados: ejecute manage.py find_duplicate_clients")
+
+    reads = [
+        Scenario("home", "home"),
+        Scenario("search", "search", query={"q": "antibiotico"}),
+        Scenario("db_diagnostics", "db_diagnostics"),
+        Scenario("metrics", "metrics"),
+        Scenario("api_collection", "api_collection", kwargs={"entity": "clients"}, query={"fields": "name,email"}),
+        Scenario("api_item", "api_item", kwargs={"entity": "products", "id": ids["product"]}),
+        Scenario("autocomplete", "autocomplete", kwargs={"entity": "clients"}, query={"prefix": "ju"}),
+        Scenario("clients_repo", "clients_repo"),
+        Scenario("clients_repo:search", "clients_repo", query={"q": "Juan"}),
+        Scenario("clients_form", "clients_form"),
+        Scenario("clients_edit", "clients_edit", kwargs={"id": ids["client"]}),
+        Scenario("clients_import", "clients_import"),
+        Scenario("clients_export", "clients_export", kwargs={"format": "csv"}, query={"q": "Juan P"}),
+        Scenario("clients_duplicates", "clients_duplicates"),
+        Scenario("clients_merge", "clients_merge", kwargs={"id": ids["duplicate"]}),
+        Scenario("vets_repo", "vets_repo"),
+        Scenario("vets_form", "vets_form"),
+        Scenario("vets_edit", "vets_edit", kwargs={"id": ids["vet"]}),
+        Scenario("vets_export", "vets_export", kwargs={"format": "ndjson"}, query={"specialty": "Oncología"}),
+        Scenario("medi_repo", "medi_repo"),
+        Scenario("medi_form", "medi_form"),
+        Scenario("medi_edit", "medi_edit", kwargs={"id": ids["medi"]}),
+        Scenario("medi_export", "medi_export", kwargs={"format": "csv"}),
+        Scenario("products_repo", "products_repo"),
+        Scenario("products_repo:filter", "products_repo", query={"type": "Alimento", "max_price": "1000"}),
+        Scenario("products_form", "products_form"),
+        Scenario("products_edit", "products_edit", kwargs={"id": ids["product"]}),
+        Scenario("products_import", "products_import"),
+        Scenario("products_export", "products_export", kwargs={"format": "csv"}, query={"type": "Juguete", "max_price": "200"}),
+        Scenario("provider_repo", "provider_repo"),
+        Scenario("provider_form", "provider_form"),
+        Scenario("provider_edit", "provider_edit", kwargs={"id": ids["provider"]}),
+        Scenario("provider_export", "provider_export", kwargs={"format": "csv"}, query={"q": "Proveedor Sosa 1"}),
+    ]
+
+    creates = [
+        Scenario("clients_form:create", "clients_form", "POST", data=lambda: {
+            "name": f"{BENCH_MARKER} {_letters()}", "phone": "54221555232",
+            "email": f"bench{_unique()}@vetsoft.com", "address": "13 y 44",
+        }),
+        Scenario("vets_form:create", "vets_form", "POST", data=lambda: {
+            "name": f"{BENCH_MARKER} {_unique()}", "phone": "2215551234",
+            "email": f"bench{_unique()}@vetsoft.com", "specialty": "Cardiología",
+        }),
+        Scenario("medi_form:create", "medi_form", "POST", data=lambda: {
+            "name": f"{BENCH_MARKER} {_unique()}", "description": "analgesico", "dose": "3",
+        }),
+        Scenario("products_form:create", "products_form", "POST", data=lambda: {
+            "name": f"{BENCH_MARKER} {_unique()}", "type": "Alimento", "price": "1500",
+        }),
+        Scenario("provider_form:create", "provider_form", "POST", data=lambda: {
+            "name": f"{BENCH_MARKER} {_unique()}", "email": f"bench{_unique()}@vetsoft.com",
+            "address": "Calle 7",
+        }),
+    ]
+
+    creates += [
+        Scenario("clients_import:upload", "clients_import", "POST", files=lambda: _csv_upload(
+            "name,phone,email,address",
+            lambda: f"{BENCH_MARKER} {_letters()},54221555232,bench{_unique()}@vetsoft.com,13 y 44",
+        )),
+        Scenario("products_import:upload", "products_import", "POST", files=lambda: _csv_upload(
+            "name,type,price", lambda: f"{BENCH_MARKER} {_unique()},Alimento,1500",
+        )),
+    ]
+
+    rows = {
+        "client": _first_ids(Client),
+        "product": _first_ids(Product),
+        "vet": _first_ids(Vet),
+        "medi": _first_ids(Medi),
+        "provider": _first_ids(Provider),
+    }
+    updates = [
+        Scenario("clients_form:update", "clients_form", "POST", data=lambda: _edit(
+            rows["client"], lambda n: {"address": f"Calle {n}"},
+        )),
+        Scenario("vets_form:update", "vets_form", "POST", data=lambda: _edit(
+            rows["vet"], lambda n: {"name": f"Ana Gomez {n}", "specialty": "Neurología"},
+        )),
+        Scenario("medi_form:update", "medi_form", "POST", data=lambda: _edit(
+            rows["medi"], lambda n: {"dose": str(n % 10 + 1)},
+        )),
+        Scenario("products_form:update", "products_form", "POST", data=lambda: _edit(
+            rows["product"], lambda n: {"price": str(900 + n)},
+        )),
+        Scenario("provider_form:update", "provider_form", "POST", data=lambda: _edit(
+            rows["provider"], lambda n: {"address": f"Calle {n}"},
+        )),
+    ]
+
+    # Un lote de la API reemplaza varios POST de formulario en una sola transacción
+    def batch_operations():
+        iteration = _iteration()
+
+        def row(name):
+            return rows[name][iteration % len(rows[name])]
+
+        return {"operations": [
+            {"op": "update", "entity": "products", "id": row("product"), "data": {"price": 900 + iteration}},
+            {"op": "update", "entity": "medis", "id": row("medi"), "data": {"dose": iteration % 10 + 1}},
+            {"op": "update", "entity": "providers", "id": row("provider"), "data": {"address": f"Calle {iteration}"}},
+        ]}
+
+    updates.append(Scenario("api_batch:update", "api_batch", "POST", json=True, data=batch_operations))
+
+    return reads, creates, updates
+
+
+def build_delete_scenarios():
+    """Escenarios de borrado sobre las filas creadas por los escenarios de alta."""
+    targets = [
+        ("clients_delete", Client, "client_id"),
+        ("vets_delete", Vet, "vet_id"),
+        ("medi_delete", Medi, "medi_id"),
+        ("products_delete", Product, "product_id"),
+        ("provider_delete", Provider, "prov_id"),
+    ]
+    scenarios = []
+    for url_name, model, field in targets:
+        pending = iter(
+            list(
+                model.objects.filter(name__startswith=BENCH_MARKER)
+                .values_list("id", flat=True),
+            ),
+        )
+        lock = threading.Lock()
+
+        def next_id(pending=pending, lock=lock, field=field):
+            with lock:
+                return {field: next(pending, 0)}
+
+        scenarios.append(Scenario(url_name, url_name, "POST", data=next_id))
+
+    return scenarios
+
+
+class HttpSession:
+    """Cliente HTTP con cookies y token CSRF, uno por hilo."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect(),
+        )
+        # Cualquier formulario entrega la cookie csrftoken
+        self.request("GET", self.base_url.rstrip("/") + reverse("clients_form"))
+
+    @property
+    def csrf_token(self):
+        """Valor actual de la cookie csrftoken."""
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, method, url, data=None, json_body=False, files=None):
+        """Hace la solicitud, consume el cuerpo completo y devuelve el status."""
+        body = None
+        headers = {}
+        if method == "POST" and json_body:
+            body = json.dumps(data).encode()
+            headers = {"Content-Type": "application/json"}
+        elif method == "POST" and files:
+            boundary = uuid.uuid4().hex
+            body = _multipart(data or {}, files, boundary)
+            headers = {
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "X-CSRFToken": self.csrf_token,
+                "Referer": self.base_url,
+            }
+        elif method == "POST":
+            body = urllib.parse.urlencode(data or {}).encode()
+            headers = {"X-CSRFToken": self.csrf_token, "Referer": self.base_url}
+
+        request = urllib.request.Request(url, data=body, method=method, headers=headers)
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                while response.read(io.DEFAULT_BUFFER_SIZE * 16):
+                    pass
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+def _multipart(data, files, boundary):
+    parts = []
+    for name, value in data.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode(),
+        )
+    for name, (filename, content) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: text/csv\r\n\r\n".encode() + content + b"\r\n",
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Los POST exitosos redirigen al listado; se mide solo el POST
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(scenario, base_url, sessions, requests, concurrency):
+    """Ejecuta requests solicitudes del escenario repartidas en concurrency hilos."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(count):
+        nonlocal errors
+        session = sessions.get()
+        try:
+            for _ in range(count):
+                url, body = scenario.next_request(base_url)
+                files = scenario.uploads()
+                start = time.perf_counter()
+                status = session.request(scenario.method, url, body, scenario.json, files)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    if status >= 400:
+                        errors += 1
+        finally:
+            sessions.put(session)
+
+    shares = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, [share for share in shares if share]))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": scenario.name,
+        "url_name": scenario.url_name,
+        "method": scenario.method,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def uncovered_routes(scenarios):
+    """Nombres de rutas de app/urls.py sin ningún escenario."""
+    covered = {scenario.url_name for scenario in scenarios}
+    names = {
+        pattern.name
+        for pattern in get_resolver().url_patterns
+        if getattr(pattern, "name", None)
+    }
+    return sorted(names - covered)
+
+
+def compare(results, baseline, max_regression):
+    """Compara p95 y throughput contra una ejecución anterior."""
+    previous = {entry["scenario"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["scenario"])
+        if old is None or not old["p95_ms"]:
+            continue
+        change = (entry["p95_ms"] - old["p95_ms"]) / old["p95_ms"]
+        entry["p95_change"] = round(change, 3)
+        if change > max_regression:
+            regressions.append(entry["scenario"])
+    return regressions
+
+
+def print_table(results):
+    header = f"{'escenario':<26}{'req':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'Δp95':>8}"
+    print(header)
+    print("-" * len(header))
+    for entry in results:
+        change = entry.get("p95_change")
+        change = f"{change:+.0%}" if change is not None else ""
+        print(
+            f"{entry['scenario']:<26}{entry['requests']:>6}{entry['errors']:>5}"
+            f"{entry['throughput_rps']:>9}{entry['p50_ms']:>9}{entry['p95_ms']:>9}"
+            f"{entry['p99_ms']:>9}{change:>8}",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Solicitudes por escenario.")
+    parser.add_argument("--output", help="Guarda los resultados en este archivo JSON.")
+    parser.add_argument("--baseline", help="Resultados JSON anteriores para comparar.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Aumento de p95 tolerado respecto de la base (0.2 = 20%%).",
+    )
+    parser.add_argument("--only", help="Ejecuta solo los escenarios que contienen este texto.")
+    args = parser.parse_args()
+
+    sessions = queue.Queue()
+    for _ in range(args.concurrency):
+        sessions.put(HttpSession(args.base_url))
+
+    reads, creates, updates = build_scenarios()
+
+    def selected(scenarios):
+        return [s for s in scenarios if not args.only or args.only in s.name]
+
+    results = []
+    for scenario in selected(reads + creates + updates):
+        results.append(
+            run_scenario(scenario, args.base_url, sessions, args.requests, args.concurrency),
+        )
+
+    # Las fusiones y los borrados consumen filas: se arman recién ahora
+    merges = [MergeScenario("clients_merge:merge", args.requests)]
+    deletes = build_delete_scenarios()
+    for scenario in selected(merges + deletes):
+        results.append(
+            run_scenario(scenario, args.base_url, sessions, args.requests, args.concurrency),
+        )
+
+    missing = uncovered_routes(reads + creates + updates + merges + deletes)
+    if missing:
+        print(f"Rutas sin escenario: {', '.join(missing)}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.max_regression)
+
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "base_url": args.base_url,
+                    "concurrency": args.concurrency,
+                    "requests": args.requests,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if regressions:
+        print(f"Regresiones de p95: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compara el rendimiento concurrente de SQLite con y sin los pragmas de app/db.py.
+
+Lanza procesos lectores y escritores (como los workers de gunicorn) contra una
+base temporal con el esquema de app_client y cuenta operaciones por segundo y
+errores "database is locked" para cada perfil.
+
+Uso:
+    python -m benchmarks.sqlite_pragmas --readers 4 --writers 4 --seconds 5
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from app.db import pragma_statements
+
+# Los mismos valores por defecto que SQLITE_PRAGMAS en vetsoft/settings.py
+TUNED_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "cache_size": "-20000",
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+
+PROFILES = {
+    "default": {},
+    "tuned": TUNED_PRAGMAS,
+}
+
+SEED_ROWS = 20000
+
+
+def connect(path, pragmas):
+    # isolation_level=None: las transacciones se manejan explícitamente como
+    # hace Django en autocommit, y timeout=5 es el valor por defecto de Django.
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+    for statement in pragma_statements(pragmas):
+        connection.execute(statement)
+    return connection
+
+
+def create_database(path, pragmas):
+    connection = connect(path, pragmas)
+    connection.execute(
+        "CREATE TABLE app_client (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "name VARCHAR(100), phone BIGINT, email VARCHAR(254), address VARCHAR(100))",
+    )
+    connection.execute("CREATE INDEX app_client_name ON app_client (name)")
+    connection.execute("BEGIN")
+    connection.executemany(
+        "INSERT INTO app_client (name, phone, email, address) VALUES (?, ?, ?, ?)",
+        (
+            (f"Cliente {i}", 54221000000 + i, f"c{i}@vetsoft.com", f"Calle {i}")
+            for i in range(SEED_ROWS)
+        ),
+    )
+    connection.execute("COMMIT")
+    connection.close()
+
+
+def reader(path, pragmas, deadline, results):
+    connection = connect(path, pragmas)
+    operations = errors = 0
+    last_id = 0
+    while time.monotonic() < deadline:
+        try:
+            rows = connection.execute(
+                "SELECT id, name, phone, email, address FROM app_client "
+                "WHERE id > ? ORDER BY id LIMIT 50",
+                (last_id,),
+            ).fetchall()
+            last_id = rows[-1][0] if rows else 0
+            operations += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    results.put(("read", operations, errors))
+
+
+def writer(path, pragmas, deadline, results):
+    connection = connect(path, pragmas)
+    operations = errors = 0
+    while time.monotonic() < deadline:
+        try:
+            connection.execute("BEGIN")
+            connection.execute(
+                "INSERT INTO app_client (name, phone, email, address) "
+                "VALUES ('Nuevo', 54221999999, 'n@vetsoft.com', '')",
+            )
+            connection.execute("COMMIT")
+            operations += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+    results.put(("write", operations, errors))
+
+
+def run_profile(name, readers, writers, seconds):
+    """Ejecuta el escenario concurrente con un perfil de pragmas."""
+    pragmas = PROFILES[name]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        create_database(path, pragmas)
+
+        results = multiprocessing.Queue()
+        deadline = time.monotonic() + seconds
+        processes = [
+            multiprocessing.Process(target=reader, args=(path, pragmas, deadline, results))
+            for _ in range(readers)
+        ] + [
+            multiprocessing.Process(target=writer, args=(path, pragmas, deadline, results))
+            for _ in range(writers)
+        ]
+        for process in processes:
+            process.start()
+
+        totals = {"read": [0, 0], "write": [0, 0]}
+        for _ in processes:
+            kind, operations, errors = results.get()
+            totals[kind][0] += operations
+            totals[kind][1] += errors
+        for process in processes:
+            process.join()
+
+    return {
+        "profile": name,
+        "reads_per_second": round(totals["read"][0] / seconds, 1),
+        "writes_per_second": round(totals["write"][0] / seconds, 1),
+        "read_errors": totals["read"][1],
+        "write_errors": totals["write"][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--output", help="Guarda los resultados en este archivo JSON.")
+    args = parser.parse_args()
+
+    results = [
+        run_profile(name, args.readers, args.writers, args.seconds) for name in PROFILES
+    ]
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,5 +6,20 @@ until python manage.py migrate 2>&1; do
   sleep 2
 done
 
-# Iniciamos la aplicación
-exec python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# Directorio compartido por los workers para las métricas de Prometheus
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+# Iniciamos la aplicación según SERVER_MODE:
+#   wsgi      -> gunicorn con vetsoft.wsgi (producción)
+#   asgi      -> gunicorn con workers de uvicorn y vetsoft.asgi (producción)
+#   runserver -> servidor de desarrollo de Django con autoreload
+case "${SERVER_MODE:-runserver}" in
+  wsgi|asgi)
+    exec gunicorn --config gunicorn.conf.py
+    ;;
+  *)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+esac
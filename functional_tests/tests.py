@@ -5,7 +5,7 @@ from playwright.sync_api import sync_playwright, expect, Browser
 
 from django.urls import reverse
 
-from app.models import Client, Product, Vet, Provider, Medi
+from app.models import Client, Product, ProductType, Vet, Provider, Medi
 
 os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
 playwright = sync_playwright().start()
@@ -431,13 +431,13 @@ class ProductsRepoTestCase(PlaywrightTestCase):
     def test_should_show_products_data(self):
         Product.objects.create(
             name="Producto A",
-            type="Tipo A",
+            type=ProductType.objects.get_or_create(name="Tipo A")[0],
             price=100.0,
         )
 
         Product.objects.create(
             name="Producto B",
-            type="Tipo B",
+            type=ProductType.objects.get_or_create(name="Tipo B")[0],
             price=200.0,
         )
 
@@ -446,11 +446,11 @@ class ProductsRepoTestCase(PlaywrightTestCase):
         expect(self.page.get_by_text("No existen productos")).not_to_be_visible()
 
         expect(self.page.get_by_text("Producto A")).to_be_visible()
-        expect(self.page.get_by_text("Tipo A")).to_be_visible()
+        expect(self.page.get_by_role("cell", name="Tipo A")).to_be_visible()
         expect(self.page.get_by_text("100.0")).to_be_visible()
 
         expect(self.page.get_by_text("Producto B")).to_be_visible()
-        expect(self.page.get_by_text("Tipo B")).to_be_visible()
+        expect(self.page.get_by_role("cell", name="Tipo B")).to_be_visible()
         expect(self.page.get_by_text("200.0")).to_be_visible()
 
     def test_should_show_add_product_action(self):
@@ -464,7 +464,7 @@ class ProductsRepoTestCase(PlaywrightTestCase):
     def test_should_show_product_edit_action(self):
         product = Product.objects.create(
             name="Producto A",
-            type="Tipo A",
+            type=ProductType.objects.get_or_create(name="Tipo A")[0],
             price=100.0,
         )
 
@@ -478,7 +478,7 @@ class ProductsRepoTestCase(PlaywrightTestCase):
     def test_should_show_product_delete_action(self):
         product = Product.objects.create(
             name="Producto A",
-            type="Tipo A",
+            type=ProductType.objects.get_or_create(name="Tipo A")[0],
             price=100.0,
         )
 
@@ -498,7 +498,7 @@ class ProductsRepoTestCase(PlaywrightTestCase):
     def test_should_can_be_able_to_delete_a_product(self):
         Product.objects.create(
             name="Producto A",
-            type="Tipo A",
+            type=ProductType.objects.get_or_create(name="Tipo A")[0],
             price=100.0,
         )
 
@@ -532,7 +532,7 @@ class ProductCreateEditTestCase(PlaywrightTestCase):
         self.page.get_by_role("button", name="Guardar").click()
 
         expect(self.page.get_by_text("Producto A")).to_be_visible()
-        expect(self.page.get_by_text("Tipo A")).to_be_visible()
+        expect(self.page.get_by_role("cell", name="Tipo A")).to_be_visible()
         expect(self.page.get_by_text("100.0")).to_be_visible()
 
     def test_should_view_errors_if_form_is_invalid(self):
@@ -567,7 +567,7 @@ class ProductCreateEditTestCase(PlaywrightTestCase):
     def test_should_be_able_to_edit_a_product(self):
         product = Product.objects.create(
             name="Producto A",
-            type="Tipo A",
+            type=ProductType.objects.get_or_create(name="Tipo A")[0],
             price=100.0,
         )
 
@@ -581,11 +581,11 @@ class ProductCreateEditTestCase(PlaywrightTestCase):
         self.page.get_by_role("button", name="Guardar").click()
 
         expect(self.page.get_by_text("Producto A")).not_to_be_visible()
-        expect(self.page.get_by_text("Tipo A")).not_to_be_visible()
+        expect(self.page.get_by_role("cell", name="Tipo A")).not_to_be_visible()
         expect(self.page.get_by_text("100.0")).not_to_be_visible()
 
         expect(self.page.get_by_text("Producto B")).to_be_visible()
-        expect(self.page.get_by_text("Tipo B")).to_be_visible()
+        expect(self.page.get_by_role("cell", name="Tipo B")).to_be_visible()
         expect(self.page.get_by_text("200.0")).to_be_visible()
 
         edit_action = self.page.get_by_role("link", name="Editar")
@@ -0,0 +1,80 @@
+"""
+Configuración de gunicorn para servir vetsoft en producción.
+
+Se lee desde variables de entorno (ver env-example). SERVER_MODE=wsgi usa
+vetsoft.wsgi con workers sync/gthread; SERVER_MODE=asgi usa vetsoft.asgi con
+workers de uvicorn.
+
+Despliegue de código nuevo sin cortar conexiones: con preload_app (por
+defecto) el master ya tiene importada la aplicación, así que kill -HUP solo
+reinicia los workers con el código viejo. Para cargar el código nuevo se
+levanta un master nuevo y se retira el viejo:
+
+    kill -USR2 <pid del master>     # arranca un master nuevo con sus workers
+    kill -WINCH <pid del master>    # el viejo cierra sus workers ordenadamente
+    kill -QUIT <pid del master>     # y termina cuando el nuevo ya atiende
+
+Con GUNICORN_PRELOAD=False cada worker importa la aplicación al arrancar y
+basta con kill -HUP <pid del master>.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+server_mode = os.getenv("SERVER_MODE", "wsgi")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+
+# Los settings los leen para elegir una caché compartida entre workers y
+# rechazar locmem si hay más de uno (ver CACHES en vetsoft/settings.py)
+os.environ.setdefault("SERVER_MODE", server_mode)
+os.environ["GUNICORN_WORKERS"] = str(workers)
+
+if server_mode == "asgi":
+    wsgi_app = "vetsoft.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "vetsoft.wsgi:application"
+    worker_class = "gthread" if threads > 1 else "sync"
+
+# La aplicación se importa una vez en el master antes del fork, así los workers
+# comparten esas páginas de memoria copy-on-write y arrancan ya calientes. A
+# cambio kill -HUP no carga código nuevo (ver el docstring del módulo).
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Reinicia cada worker después de N solicitudes para acotar fugas de memoria
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+# Métricas de Prometheus compartidas entre workers (ver app/metrics.py)
+prometheus_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    if not prometheus_multiproc_dir:
+        return
+    # Tras kill -USR2 el master nuevo hereda los sockets por GUNICORN_FD y el
+    # viejo sigue atendiendo: sus archivos todavía están en uso, no se borran
+    if "GUNICORN_FD" not in os.environ:
+        # Los archivos de una ejecución anterior sumarían valores viejos
+        shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
+    os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if prometheus_multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -11,8 +11,11 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+import sys
+import tempfile
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -48,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.middleware.RequestTimingMiddleware",
+    "app.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,6 +60,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "app.writer.WriteQueueMiddleware",
 ]
 
 ROOT_URLCONF = "vetsoft.urls"
@@ -89,6 +95,62 @@ DATABASES = {
     },
 }
 
+# Pragmas de SQLite aplicados en cada conexión (ver app/db.py).
+# Un valor vacío deja el valor por defecto de SQLite.
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+# Caché de páginas de los repositorios (ver app/cache.py).
+# locmem es propia de cada proceso: con varios workers de gunicorn las versiones
+# y los ETag quedarían desfasados entre ellos. Bajo gunicorn/uvicorn
+# (SERVER_MODE wsgi o asgi) el valor por defecto es "file", compartido entre
+# workers, y locmem con más de un worker se rechaza al arrancar.
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+
+SERVER_MODE = os.getenv("SERVER_MODE", "runserver")
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file" if SERVER_MODE in ("wsgi", "asgi") else "locmem")
+
+# gunicorn.conf.py exporta la cantidad de workers que va a levantar
+if CACHE_BACKEND == "locmem" and int(os.getenv("GUNICORN_WORKERS", "1")) > 1:
+    raise ImproperlyConfigured(
+        "CACHE_BACKEND=locmem no se comparte entre los workers de gunicorn: "
+        "usar file, redis o memcached, o WEB_CONCURRENCY=1",
+    )
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "vetsoft-cache") if CACHE_BACKEND == "file" else "",
+        ),
+    },
+}
+
+PAGE_CACHE_ALIAS = "default"
+
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "300"))
+
+# Las pruebas verifican el render de cada página, así que ahí queda desactivada
+TESTING = sys.argv[1:2] == ["test"]
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", str(not TESTING)) == "True"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -130,3 +192,62 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Medición por solicitud: header Server-Timing y log JSON en "app.requests"
+
+REQUEST_TIMING_ENABLED = os.getenv("REQUEST_TIMING_ENABLED", "True") == "True"
+
+# Métricas en formato Prometheus en /metrics
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+
+# Una línea INFO por solicitud es mucho volumen en producción: el log JSON de
+# "app.requests" se activa con REQUEST_LOG_LEVEL=INFO
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "app.requests": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
+
+# Cantidad de filas por página en los repositorios (paginación por cursor)
+
+REPOSITORY_PAGE_SIZE = int(os.getenv("REPOSITORY_PAGE_SIZE", "50"))
+
+
+# Vistas async de repositorios y formularios (app/async_views.py); por defecto
+# solo bajo ASGI, donde evitan ocupar un hilo por solicitud
+
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", str(SERVER_MODE == "asgi")) == "True"
+
+
+# Escritor único por proceso con commits agrupados (ver app/writer.py). En las
+# pruebas queda desactivado: el hilo escritor no ve la transacción de cada test
+
+WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", str(not TESTING)) == "True"
+
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "1000"))
+
+WRITE_QUEUE_TIMEOUT = float(os.getenv("WRITE_QUEUE_TIMEOUT", "5"))
+
+# Espera máxima por el resultado de una escritura encolada antes de responder 503
+# (por debajo del timeout de los workers de gunicorn)
+
+WRITE_RESULT_TIMEOUT = float(os.getenv("WRITE_RESULT_TIMEOUT", "20"))
+
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "100"))
+
+WRITE_BATCH_WAIT_MS = float(os.getenv("WRITE_BATCH_WAIT_MS", "2"))
+
+WRITE_LOCK_FILE = os.getenv("WRITE_LOCK_FILE", "")